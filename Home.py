@@ -1,4 +1,6 @@
 import streamlit as st
+from utils import tracing
+from utils.grading_service import cancel_session_job
 
 
 st.set_page_config(
@@ -8,6 +10,9 @@ st.set_page_config(
     layout="wide",
 )
 
+trace = tracing.begin_rerun("home", st.session_state)
+cancel_session_job(st.session_state)
+
 st.title("Python FastSkilling 1.0")
 
 st.markdown(
@@ -24,4 +29,6 @@ st.markdown(
 
     Let's get started on your Python journey!
     """
-)
\ No newline at end of file
+)
+
+tracing.end_rerun(trace, st.session_state)
@@ -0,0 +1,101 @@
+"""Helpers for driving the pages headlessly with Streamlit's AppTest.
+
+The browser components (``code_editor`` and ``streamlit_local_storage``) have no
+frontend under AppTest, so :func:`install_fakes` swaps them for in-memory
+versions that keep their state in the session, one store per simulated learner.
+"""
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+HOME_PAGE = os.path.join(ROOT_DIR, "Home.py")
+LECTURE_PAGE = os.path.join(ROOT_DIR, "pages", "1_Lecture.py")
+PRACTICE_PAGE = os.path.join(ROOT_DIR, "pages", "2_Practice.py")
+
+EDITOR_TEXT_KEY = "_harness_editor_text"
+LOCAL_STORAGE_KEY = "_harness_local_storage"
+DEFAULT_TIMEOUT = 30
+# Grading runs in the background; the page shows it in a polling fragment, which
+# AppTest does not run on its own, so the harness reruns until the job is done.
+GRADING_POLL_INTERVAL = 0.01
+# Submissions for the "Reverse list" scenario.
+CORRECT_SOLUTION = "def reverse_list(lst):\n    return lst[::-1]\n"
+WRONG_SOLUTION = "def reverse_list(lst):\n    return lst\n"
+
+
+class FakeLocalStorage:
+    def getItem(self, key):
+        return st.session_state.setdefault(LOCAL_STORAGE_KEY, {}).get(key)
+
+    def getAll(self):
+        return st.session_state.setdefault(LOCAL_STORAGE_KEY, {})
+
+    def setItem(self, item_key, value, key=None):
+        st.session_state.setdefault(LOCAL_STORAGE_KEY, {})[item_key] = value
+
+
+def fake_code_editor(code, **kwargs):
+    # The real component keeps returning the last submitted text on every rerun.
+    return {"text": st.session_state.get(EDITOR_TEXT_KEY, ""), "type": "submit" if EDITOR_TEXT_KEY in st.session_state else ""}
+
+
+def install_fakes():
+    import code_editor
+    import streamlit_local_storage
+
+    code_editor.code_editor = fake_code_editor
+    streamlit_local_storage.LocalStorage = FakeLocalStorage
+
+
+def new_app(page, timeout=DEFAULT_TIMEOUT):
+    install_fakes()
+    return AppTest.from_file(page, default_timeout=timeout)
+
+
+def open_page(page):
+    at = new_app(page)
+    at.run()
+    return at
+
+
+def practice_on(scenario_title):
+    """Open the practice page on a scenario, as picked from the sidebar."""
+    at = open_page(PRACTICE_PAGE)
+    at.button(key=f"{scenario_title}_sidebar").click().run()
+    return at
+
+
+def grading_job(at):
+    from utils.grading_service import JOB_KEY
+
+    try:
+        return at.session_state[JOB_KEY]
+    except KeyError:
+        return None
+
+
+def wait_for_grading(at, timeout=DEFAULT_TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while (job := grading_job(at)) is not None and not job.done:
+        if time.monotonic() > deadline:
+            raise TimeoutError("grading did not finish in time")
+        time.sleep(GRADING_POLL_INTERVAL)
+    # One more run renders the finished result, as the polling fragment would.
+    return at.run()
+
+
+def submit_code(at, code):
+    at.session_state[EDITOR_TEXT_KEY] = code
+    at.run()
+    return wait_for_grading(at)
+
+
+def sidebar_button(at, label):
+    return next(button for button in at.sidebar.button if button.label == label)
@@ -0,0 +1,120 @@
+"""Cold start profile: what a fresh process pays before a page can render.
+
+    python -m benchmarks.import_profile               # every page, top 10 imports each
+    python -m benchmarks.import_profile --top 25 --bundle build/content.bundle
+
+Each page's top-level imports are run in a fresh interpreter under
+``python -X importtime``, which reports the cumulative import time of every
+module; the total is roughly the time to first paint minus Streamlit itself.
+Boot to ready (the lecture catalog and the scenario registry with every scenario
+resolved) is timed the same way, from the content directories and, given
+``--bundle``, from a prebuilt content bundle (see ``python -m utils.bundle``).
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = {
+    "home": os.path.join(ROOT_DIR, "Home.py"),
+    "lecture": os.path.join(ROOT_DIR, "pages", "1_Lecture.py"),
+    "practice": os.path.join(ROOT_DIR, "pages", "2_Practice.py"),
+    "feedback": os.path.join(ROOT_DIR, "pages", "3_Feedback.py"),
+    "performance": os.path.join(ROOT_DIR, "pages", "4_Performance.py"),
+}
+BOOT_SCRIPT = """
+import time
+started = time.perf_counter()
+from utils.lectures import get_catalog
+from utils.scenarios import registry
+catalog = get_catalog()
+for scenario in registry:
+    scenario.test_cases
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def page_imports(path):
+    """Return the modules a page imports at its top level, in order."""
+    with open(path, 'r') as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def _run(code, env=None):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR, env={**os.environ, "PYTHONPATH": ROOT_DIR, **(env or {})},
+        capture_output=True, text=True,
+    )
+
+
+def profile_imports(modules):
+    """Import ``modules`` in a fresh interpreter; returns (total ms, {module: cumulative ms}, errors)."""
+    # One statement per module, so a missing optional package does not hide the rest.
+    completed = _run("\n".join(
+        f"try:\n    import {module}\nexcept ImportError as e:\n    print(e)" for module in modules
+    ))
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, fields = line.partition(":")
+        _, total, name = (field.strip() for field in fields.split("|"))
+        cumulative[name] = int(total) / 1000
+    top_level = [cumulative[module] for module in modules if module in cumulative]
+    errors = completed.stdout.strip().splitlines()
+    if completed.returncode:
+        errors.append(completed.stderr.strip().splitlines()[-1])
+    return sum(top_level), cumulative, errors
+
+
+def time_boot(repeats, bundle=None):
+    """Median milliseconds from a fresh interpreter to all content being loaded."""
+    from utils.bundle import BUNDLE_ENV
+
+    timings = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", BOOT_SCRIPT],
+            cwd=ROOT_DIR, env={**os.environ, "PYTHONPATH": ROOT_DIR, BUNDLE_ENV: bundle or ""},
+            capture_output=True, text=True, check=True,
+        )
+        timings.append(float(completed.stdout.strip()))
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile imports and content loading of a cold start.")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list per page")
+    parser.add_argument("--repeats", type=int, default=5, help="cold boots to time per configuration")
+    parser.add_argument("--bundle", help="also time booting from this content bundle")
+    args = parser.parse_args(argv)
+
+    for page, path in PAGES.items():
+        modules = page_imports(path)
+        total, cumulative, errors = profile_imports(modules)
+        print(f"{page:12} {total:8.1f}ms  imports {', '.join(modules)}")
+        for error in errors:
+            print(f"             not measured: {error}")
+        for name, ms in sorted(cumulative.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"             {ms:8.1f}ms  {name}")
+
+    print(f"boot from files   {time_boot(args.repeats):8.1f}ms")
+    if args.bundle:
+        print(f"boot from bundle  {time_boot(args.repeats, os.path.abspath(args.bundle)):8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""Concurrent-session load test: how many learners can one app process serve?
+
+    python -m benchmarks.load_test                               # 1, 2, 4, 8 and 16 sessions, 30s each
+    python -m benchmarks.load_test --sessions 8 --duration 60    # a single level
+    python -m benchmarks.load_test --workers 2 --mix reader=1,solver=3,pathological=1 --output load.json
+
+Every simulated learner is a thread driving its own AppTest sessions through a
+scripted journey, back to back with no think time unless ``--think-time`` is
+given. All sessions share the process, and with it the grading pool, the caches
+and the lecture catalog, like the learners connected to one replica. Each level
+reports throughput, rerun latency percentiles per step and the resident memory
+of the process over time; the saturation point is the first level that adds
+sessions without adding throughput.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.harness import CORRECT_SOLUTION, LECTURE_PAGE, WRONG_SOLUTION, new_app, practice_on, submit_code
+from utils.grading_service import GRADING_WORKERS_ENV
+from utils.memory import current_rss_bytes
+from utils.tracing import percentile
+
+DEFAULT_SESSIONS = (1, 2, 4, 8, 16)
+DEFAULT_DURATION = 30.0
+DEFAULT_MIX = "reader=2,solver=2,pathological=1"
+RSS_SAMPLE_INTERVAL = 1.0
+# A level is saturated when it adds sessions but less than this much throughput.
+SATURATION_GAIN = 1.1
+
+PATHOLOGICAL_SOLUTIONS = (
+    "def reverse_list(lst):\n    while True:\n        pass\n",
+    "def reverse_list(lst):\n    return [0] * 10**10\n",
+    "def reverse_list(lst):\n    return 'x' * 10**7\n",
+)
+
+
+class Session:
+    """One simulated learner; ``unique`` submissions carry a comment that defeats the grading cache."""
+
+    def __init__(self, number, rng):
+        self.number = number
+        self.rng = rng
+        self.submissions = 0
+
+    def code(self, source, unique):
+        self.submissions += 1
+        return f"{source}# session {self.number} run {self.submissions}\n" if unique else source
+
+    def read_lectures(self):
+        at = new_app(LECTURE_PAGE)
+        yield "lecture.open", at.run
+        for _ in range(self.rng.randint(1, 3)):
+            yield "lecture.next", lambda: at.button(key="next_lecture").click().run()
+        if any(button.key == "show_more_sections" for button in at.button):
+            yield "lecture.show_more", lambda: at.button(key="show_more_sections").click().run()
+        yield "lecture.search", lambda: at.text_input(key="lecture_search").input("decorator").run()
+        yield "lecture.mark_complete", lambda: at.checkbox(key="toggle_lecture").check().run()
+
+    def solve(self):
+        at = practice_on("Reverse list")
+        yield "practice.submit_wrong", lambda: submit_code(at, self.code(WRONG_SOLUTION, unique=self.rng.random() < 0.5))
+        yield "practice.submit_correct", lambda: submit_code(at, self.code(CORRECT_SOLUTION, unique=self.rng.random() < 0.5))
+        yield "practice.switch_scenario", lambda: at.button(key="Add two numbers_sidebar").click().run()
+
+    def misbehave(self):
+        at = practice_on("Reverse list")
+        source = self.rng.choice(PATHOLOGICAL_SOLUTIONS)
+        yield "practice.submit_pathological", lambda: submit_code(at, self.code(source, unique=True))
+
+
+JOURNEYS = {
+    "reader": Session.read_lectures,
+    "solver": Session.solve,
+    "pathological": Session.misbehave,
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in JOURNEYS:
+            raise ValueError(f"unknown journey '{name}', expected one of {sorted(JOURNEYS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _run_session(number, mix, deadline, think_time, seed, samples):
+    rng = random.Random(seed * 1000 + number)
+    session = Session(number, rng)
+    names, weights = list(mix), list(mix.values())
+    while time.monotonic() < deadline:
+        journey = JOURNEYS[rng.choices(names, weights)[0]]
+        try:
+            for step, action in journey(session):
+                started = time.perf_counter()
+                error = None
+                try:
+                    action()
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                samples.append((time.monotonic(), step, (time.perf_counter() - started) * 1000, error))
+                if error is not None or time.monotonic() >= deadline:
+                    break
+                if think_time:
+                    time.sleep(rng.uniform(0, 2 * think_time))
+        except Exception as e:
+            # Setting up a journey failed, e.g. a page raised on its first run.
+            samples.append((time.monotonic(), "journey.setup", 0.0, f"{type(e).__name__}: {e}"))
+
+
+def _latency(values):
+    return {
+        "count": len(values),
+        "p50_ms": round(statistics.median(values), 2),
+        "p99_ms": round(percentile(values, 0.99), 2),
+        "max_ms": round(max(values), 2),
+    }
+
+
+def run_level(sessions, duration, mix, think_time=0.0, seed=0):
+    samples = []
+    rss = []
+    started = time.monotonic()
+    deadline = started + duration
+    stop = threading.Event()
+
+    def sample_rss():
+        while not stop.is_set():
+            rss.append((round(time.monotonic() - started, 1), current_rss_bytes()))
+            stop.wait(RSS_SAMPLE_INTERVAL)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        for number in range(sessions):
+            executor.submit(_run_session, number, mix, deadline, think_time, seed, samples)
+    elapsed = time.monotonic() - started
+    stop.set()
+    sampler.join()
+
+    succeeded = [latency for _, _, latency, error in samples if error is None]
+    steps = {}
+    for _, step, latency, error in samples:
+        if error is None:
+            steps.setdefault(step, []).append(latency)
+    errors = {}
+    for _, step, _, error in samples:
+        if error is not None:
+            errors.setdefault(step, []).append(error)
+    return {
+        "sessions": sessions,
+        "elapsed_s": round(elapsed, 2),
+        "steps": len(samples),
+        "throughput_per_s": round(len(succeeded) / elapsed, 2),
+        "latency": _latency(succeeded) if succeeded else None,
+        "by_step": {step: _latency(values) for step, values in sorted(steps.items())},
+        "errors": {step: {"count": len(messages), "example": messages[0]} for step, messages in errors.items()},
+        "rss_mib": [(offset, round(size / 2**20, 1)) for offset, size in rss],
+        "rss_growth_mib": round((rss[-1][1] - rss[0][1]) / 2**20, 1) if rss else 0.0,
+    }
+
+
+def saturation_point(levels):
+    """Return the last session count that still raised throughput noticeably, or None."""
+    for previous, level in zip(levels, levels[1:]):
+        if level["throughput_per_s"] < previous["throughput_per_s"] * SATURATION_GAIN:
+            return previous["sessions"]
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive concurrent simulated sessions against the pages.")
+    parser.add_argument("--sessions", default=",".join(map(str, DEFAULT_SESSIONS)),
+                        help="comma separated concurrency levels to run one after another")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds per level")
+    parser.add_argument("--workers", type=int, help="grading pool size (default: one per CPU)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="journey weights, e.g. reader=2,solver=2,pathological=1")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between steps in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the full report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    if args.workers:
+        # Read when the pool is first created, which happens on the first practice run.
+        os.environ[GRADING_WORKERS_ENV] = str(args.workers)
+    mix = parse_mix(args.mix)
+    levels = []
+    for sessions in (int(value) for value in args.sessions.split(",")):
+        level = run_level(sessions, args.duration, mix, args.think_time, args.seed)
+        levels.append(level)
+        latency = level["latency"] or {"p50_ms": 0.0, "p99_ms": 0.0}
+        error_count = sum(error["count"] for error in level["errors"].values())
+        print(f"{sessions:4} sessions  {level['throughput_per_s']:8.2f} steps/s  p50 {latency['p50_ms']:9.2f}ms  "
+              f"p99 {latency['p99_ms']:9.2f}ms  errors {error_count:4}  RSS +{level['rss_growth_mib']}MiB")
+        for step, stats in level["by_step"].items():
+            print(f"      {step:30} n {stats['count']:5}  p50 {stats['p50_ms']:9.2f}ms  p99 {stats['p99_ms']:9.2f}ms")
+        for step, error in level["errors"].items():
+            print(f"      ERROR {step}: {error['count']}x {error['example']}")
+
+    saturated_at = saturation_point(levels)
+    workers = args.workers or os.cpu_count()
+    if saturated_at is None:
+        print(f"No saturation within {levels[-1]['sessions']} sessions with {workers} grading workers.")
+    else:
+        print(f"Throughput stops growing beyond {saturated_at} sessions with {workers} grading workers.")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"workers": workers, "mix": mix, "saturated_at": saturated_at, "levels": levels}, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
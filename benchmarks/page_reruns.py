@@ -0,0 +1,164 @@
+"""Rerun latency benchmarks for the pages, driven headlessly through AppTest.
+
+    python -m benchmarks.page_reruns                    # compare against baseline.json
+    python -m benchmarks.page_reruns --update-baseline  # record a new baseline
+    python -m benchmarks.page_reruns --only lecture     # run a subset
+
+Every widget click reruns the whole script, so the time of one rerun is what a
+learner waits for. Each interaction is prepared on a fresh app (untimed) and then
+the interaction itself is timed. Allocations are measured in a separate pass with
+tracemalloc so tracing does not skew the timings. The run fails when an
+interaction's p95 regresses beyond the tolerance over the stored baseline, and
+when there is no baseline to compare with: a check that cannot fail is no check.
+"""
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.harness import (
+    CORRECT_SOLUTION, HOME_PAGE, LECTURE_PAGE, PRACTICE_PAGE, WRONG_SOLUTION, open_page, practice_on,
+    sidebar_button, submit_code,
+)
+from utils.tracing import percentile
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+# Regressions smaller than this are treated as noise regardless of the tolerance.
+NOISE_FLOOR_MS = 5.0
+
+_unique = itertools.count()
+
+
+def _fresh_code(code):
+    # A unique trailing comment defeats the grading cache so the worker pool is measured.
+    return f"{code}# run {next(_unique)}\n"
+
+
+INTERACTIONS = {
+    "home.open": (lambda: None, lambda _: open_page(HOME_PAGE)),
+    "lecture.open": (lambda: None, lambda _: open_page(LECTURE_PAGE)),
+    "lecture.next": (lambda: open_page(LECTURE_PAGE), lambda at: at.button(key="next_lecture").click().run()),
+    "lecture.mark_complete": (lambda: open_page(LECTURE_PAGE), lambda at: at.checkbox(key="toggle_lecture").check().run()),
+    "lecture.sidebar_jump": (
+        lambda: open_page(LECTURE_PAGE),
+        lambda at: at.button(key="012_Context_Managers_in_Python.md").click().run(),
+    ),
+    "lecture.sidebar_next_page": (
+        lambda: open_page(LECTURE_PAGE),
+        lambda at: at.button(key="lecture_list_next_page").click().run(),
+    ),
+    "practice.open": (lambda: None, lambda _: open_page(PRACTICE_PAGE)),
+    "practice.switch_scenario": (
+        lambda: open_page(PRACTICE_PAGE),
+        lambda at: at.button(key="Reverse list_sidebar").click().run(),
+    ),
+    "practice.filter_difficulty": (
+        lambda: open_page(PRACTICE_PAGE),
+        lambda at: sidebar_button(at, "Medium").click().run(),
+    ),
+    "practice.submit_correct": (
+        lambda: practice_on("Reverse list"),
+        lambda at: submit_code(at, _fresh_code(CORRECT_SOLUTION)),
+    ),
+    "practice.submit_failing": (
+        lambda: practice_on("Reverse list"),
+        lambda at: submit_code(at, _fresh_code(WRONG_SOLUTION)),
+    ),
+    "practice.submit_cached": (
+        lambda: submit_code(practice_on("Reverse list"), CORRECT_SOLUTION),
+        lambda at: at.run(),
+    ),
+}
+
+
+def measure(name, samples, warmup):
+    setup, step = INTERACTIONS[name]
+    timings = []
+    for i in range(warmup + samples):
+        state = setup()
+        started = time.perf_counter()
+        step(state)
+        elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            timings.append(elapsed)
+
+    state = setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    step(state)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "min_ms": round(min(timings), 2),
+        "alloc_blocks": allocated,
+        "alloc_peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            regressions.append(f"{name}: not in the baseline; run with --update-baseline to record it")
+            continue
+        limit = max(reference["p95_ms"] * (1 + tolerance), reference["p95_ms"] + NOISE_FLOOR_MS)
+        if result["p95_ms"] > limit:
+            regressions.append(f"{name}: p95 {result['p95_ms']}ms > {limit:.1f}ms (baseline {reference['p95_ms']}ms)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page rerun latency with AppTest.")
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", help="run only interactions whose name contains this text")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative p95 regression")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        # Checked before measuring, which takes minutes.
+        parser.error(f"no baseline at {args.baseline}; run with --update-baseline to record one")
+
+    results = {}
+    for name in INTERACTIONS:
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(name, args.samples, args.warmup)
+        result = results[name]
+        print(f"{name:30} p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+              f"allocs {result['alloc_blocks']:8}  peak {result['alloc_peak_kib']:9.1f}KiB")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
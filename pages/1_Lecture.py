@@ -1,6 +1,11 @@
 import streamlit as st
-import os
-from streamlit_local_storage import LocalStorage
+import streamlit.components.v1 as components
+from utils.lectures import get_catalog, heading_anchor
+from utils.search import get_search_index
+from utils.progress import get_progress
+from utils.grading_service import cancel_session_job
+from utils.paging import paginate
+from utils import tracing
 
 st.set_page_config(
     page_title="Python | Lectures",
@@ -11,98 +16,187 @@ st.set_page_config(
 
 PROGRESS_KEY = 'lecture_progress'
 FINISHED_KEY = 'lecture_finished'
-def LocalStorageManager():
-    return LocalStorage()
-localS = LocalStorageManager()
-
-
-
-def __get_lecture_id(lecture_name):
-    return lecture_name[4:-3]
-
-script_dir = os.path.dirname(os.path.abspath(__file__))
-materials_dir = os.path.join(script_dir, '..','materials')
-lecture_list = sorted(os.listdir(materials_dir))
-
-st.session_state[PROGRESS_KEY] = localS.getItem(PROGRESS_KEY) or lecture_list[0]
-st.session_state[FINISHED_KEY] = localS.getItem(FINISHED_KEY) or []
+ANCHOR_KEY = 'lecture_anchor'
+VISIBLE_KEY = 'lecture_visible_sections'
+SECTIONS_READ_KEY = 'lecture_sections_read'
+# Sections rendered when a lecture opens, and how many more each "show more" adds.
+EAGER_SECTIONS = 3
+SECTIONS_PER_STEP = 5
+trace = tracing.begin_rerun("lecture", st.session_state)
+# A submission still being graded on the practice page is no longer of interest.
+cancel_session_job(st.session_state)
+with tracing.span("storage.progress"):
+    progress = get_progress()
+
+if "practice_scenario_id" in st.session_state:
+    st.switch_page("pages/2_Practice.py")
+
+with tracing.span("lecture.catalog"):
+    catalog = get_catalog()
+
+with tracing.span("storage.get"):
+    st.session_state[PROGRESS_KEY] = progress.get(PROGRESS_KEY) or catalog.first.id
+    st.session_state[FINISHED_KEY] = progress.get(FINISHED_KEY) or []
+    st.session_state[SECTIONS_READ_KEY] = progress.get(SECTIONS_READ_KEY) or {}
 
 def get_current_lecture():
-    stored_progress = st.session_state[PROGRESS_KEY] or []
-    if stored_progress:
-        return next((lec for lec in lecture_list if __get_lecture_id(lec) == stored_progress), lecture_list[0])
+    return catalog.get(st.session_state[PROGRESS_KEY], catalog.first)
 
-def update_progress(lecture_name):
-    lecture_id = __get_lecture_id(lecture_name)
-    localS.setItem(PROGRESS_KEY, lecture_id)
+def update_progress(lecture_id):
+    progress.set(PROGRESS_KEY, lecture_id)
     st.session_state[PROGRESS_KEY] = lecture_id
 
-def toggle_lecture_done(lecture_name):
+def toggle_lecture_done(lecture_id):
     finished = st.session_state[FINISHED_KEY] or []
-    lecture_id = __get_lecture_id(lecture_name)
     if lecture_id in finished:
         finished.remove(lecture_id)
     else:
         finished.append(lecture_id)
-    localS.setItem(FINISHED_KEY, finished)
+    progress.set(FINISHED_KEY, finished)
     st.session_state[FINISHED_KEY] = finished
 
 def is_any_lecture_done():
     return bool(st.session_state[FINISHED_KEY] or [])
 
-def is_lecture_done(lecture_name):
-    return __get_lecture_id(lecture_name) in (st.session_state[FINISHED_KEY] or [])
-
-def is_first_lecture():
-    return get_current_lecture() == lecture_list[0]
-
-def is_last_lecture():
-    return get_current_lecture() == lecture_list[-1]
-
-current_lecture = get_current_lecture().split('.')[0].split('_', maxsplit=2)[1]
-
-with open(os.path.join(materials_dir, get_current_lecture()), 'r') as f:
-    content = f.read()
-    col1, col2 = st.columns(2)
-
-    st.checkbox("Mark complete", key="toggle_lecture", value=is_lecture_done(get_current_lecture()), on_change=lambda: toggle_lecture_done(get_current_lecture()))
-    with col1:
-        st.button(
-            "Previous Lecture",
-            type='secondary',
-            icon="◀️",
-            use_container_width=True,
-            key="previous_lecture",
-            disabled=is_first_lecture(),
-            on_click=lambda: update_progress(lecture_list[(lecture_list.index(get_current_lecture()) - 1) % len(lecture_list)])
-        )
-    with col2:
-        st.button(
-            "Next Lecture",
-            type='secondary',
-            icon="▶️",
-            use_container_width=True,
-            key="next_lecture",
-            disabled=is_last_lecture(),
-            on_click=lambda: update_progress(lecture_list[(lecture_list.index(get_current_lecture()) + 1) % len(lecture_list)])
+def is_lecture_done(lecture_id):
+    return lecture_id in (st.session_state[FINISHED_KEY] or [])
+
+current_lecture = get_current_lecture()
+
+col1, col2 = st.columns(2)
+
+st.checkbox("Mark complete", key="toggle_lecture", value=is_lecture_done(current_lecture.id), on_change=lambda: toggle_lecture_done(current_lecture.id))
+with col1:
+    st.button(
+        "Previous Lecture",
+        type='secondary',
+        icon="◀️",
+        use_container_width=True,
+        key="previous_lecture",
+        disabled=current_lecture.previous_id is None,
+        on_click=lambda: update_progress(current_lecture.previous_id)
+    )
+with col2:
+    st.button(
+        "Next Lecture",
+        type='secondary',
+        icon="▶️",
+        use_container_width=True,
+        key="next_lecture",
+        disabled=current_lecture.next_id is None,
+        on_click=lambda: update_progress(current_lecture.next_id)
+    )
+def visible_sections(lecture):
+    return st.session_state.setdefault(VISIBLE_KEY, {}).get(lecture.id, EAGER_SECTIONS)
+
+def show_sections(lecture, count):
+    st.session_state.setdefault(VISIBLE_KEY, {})[lecture.id] = count
+
+def toggle_section_read(lecture_id, anchor):
+    sections_read = dict(st.session_state[SECTIONS_READ_KEY])
+    read = set(sections_read.get(lecture_id, []))
+    read.symmetric_difference_update({anchor})
+    sections_read[lecture_id] = sorted(read)
+    progress.set(SECTIONS_READ_KEY, sections_read)
+    st.session_state[SECTIONS_READ_KEY] = sections_read
+
+@st.fragment
+@tracing.fragment_run("lecture.content", st.session_state)
+def lecture_content(lecture):
+    """Table of contents and the sections revealed so far; the rest is not sent until asked for."""
+    sections = lecture.sections
+    anchor = st.session_state.pop(ANCHOR_KEY, None)
+    target = next((index for index, section in enumerate(sections) if section.anchor == anchor), None)
+    if target is not None and target >= visible_sections(lecture):
+        show_sections(lecture, target + 1)
+    visible = visible_sections(lecture)
+    read = set(st.session_state[SECTIONS_READ_KEY].get(lecture.id, []))
+
+    with st.expander("Contents"):
+        for index, section in enumerate(sections):
+            st.button(
+                f"{"✅ " if section.anchor in read else ""}{"· " * max(section.level - 1, 0)}{section.heading}",
+                type="tertiary",
+                key=f"toc_{lecture.id}_{index}",
+                on_click=lambda a=section.anchor: st.session_state.update({ANCHOR_KEY: a}),
+            )
+
+    with tracing.span("render.lecture", lecture=lecture.id, sections=min(visible, len(sections))):
+        for index, section in enumerate(sections[:visible]):
+            if section.anchor != heading_anchor(section.heading):
+                # Streamlit gives a repeated heading the same id as the first one;
+                # the section's own anchor is what the contents and search jump to.
+                st.markdown(f'<div id="{section.anchor}"></div>', unsafe_allow_html=True)
+            st.markdown(section.body)
+            if section.level:
+                st.checkbox("Mark section as read", key=f"section_read_{lecture.id}_{index}", value=section.anchor in read,
+                            on_change=toggle_section_read, args=(lecture.id, section.anchor))
+
+    remaining = len(sections) - visible
+    if remaining > 0:
+        more_col, all_col = st.columns(2)
+        more_col.button(f"Show {min(SECTIONS_PER_STEP, remaining)} more sections", use_container_width=True, key="show_more_sections",
+                        on_click=show_sections, args=(lecture, visible + SECTIONS_PER_STEP))
+        all_col.button(f"Show all {remaining} remaining sections", use_container_width=True, key="show_all_sections",
+                       on_click=show_sections, args=(lecture, len(sections)))
+
+    if anchor:
+        components.html(
+            f"<script>window.parent.document.getElementById({anchor!r})?.scrollIntoView();</script>",
+            height=0,
         )
-    st.markdown(content)
-    
 
-def switch_lecture(lecture_name):
-    update_progress(lecture_name)
+lecture_content(current_lecture)
+
+
+def switch_lecture(lecture_id, anchor=None):
+    update_progress(lecture_id)
+    st.session_state[ANCHOR_KEY] = anchor
+
+def open_scenario(scenario_id):
+    st.session_state["practice_scenario_id"] = scenario_id
+
+def render_search_results(query):
+    with tracing.span("search.query"):
+        search_results = get_search_index().search(query)
+    for i, search_result in enumerate(search_results):
+        document = search_result.document
+        if document.kind == "lecture":
+            label = f"📖 {document.title} › {document.heading}"
+            open_result = lambda d=document: switch_lecture(d.ref, d.anchor)
+        else:
+            label = f"🧩 Practice: {document.title}"
+            open_result = lambda d=document: open_scenario(d.ref)
+        if st.button(label, help=search_result.snippet, use_container_width=True, key=f"search_result_{i}"):
+            # Search results live in the sidebar fragment but change the whole page.
+            open_result()
+            st.rerun()
+
+@st.fragment
+@tracing.fragment_run("lecture.sidebar", st.session_state)
+def lecture_sidebar():
+    """Search and lecture list; typing a query or paging reruns only this fragment."""
+    if st.button("Reset Progress", disabled=not is_any_lecture_done()):
+        progress.set(FINISHED_KEY, [])
+        st.session_state[FINISHED_KEY] = []
+        st.rerun()
+    search_query = st.text_input("Search", placeholder="Search lectures and practice", key="lecture_search")
+    if search_query.strip():
+        render_search_results(search_query)
+    st.title(f"Lectures ({len(catalog)} / {len(st.session_state[FINISHED_KEY])} completed)")
+    with tracing.span("render.sidebar"):
+        for lecture in paginate(catalog.lectures, "lecture_list", current_lecture.index):
+            if st.button(
+                lecture.name,
+                use_container_width=True,
+                type='primary' if lecture.id == current_lecture.id else 'secondary',
+                icon="✅" if is_lecture_done(lecture.id) else "▶️",
+                key=lecture.filename,
+            ):
+                switch_lecture(lecture.id)
+                st.rerun()
 
 with st.sidebar:
-    st.button("Reset Progress", on_click=lambda: localS.setItem(FINISHED_KEY, []), disabled=not is_any_lecture_done())
-    st.title(f"Lectures ({len(lecture_list)} / {len(localS.getItem(FINISHED_KEY) or [])} completed)")
-    for lecture in lecture_list:
-        lecture_name = lecture.split('.')[0].split('_', maxsplit=1)[1].replace('_', ' ')
-        is_done = is_lecture_done(lecture)
-        st.button(
-            lecture_name,
-            use_container_width=True,
-            type='primary' if lecture == get_current_lecture() else 'secondary',
-            icon="✅" if is_done else "▶️",
-            key=lecture,
-            on_click=lambda lec=lecture: switch_lecture(lec)
-        )
\ No newline at end of file
+    lecture_sidebar()
+
+tracing.end_rerun(trace, st.session_state)
@@ -1,12 +1,13 @@
 import streamlit as st
 from code_editor import code_editor
-import ast
-import builtins
 
-from streamlit_local_storage import LocalStorage
-from utils.scenarios import generated_scenarios
-import io
-import sys
+from utils.progress import get_progress
+from utils.scenarios import registry
+from utils.grader import preview
+from utils.grading_service import JOB_KEY, cancel_session_job, submit
+from utils.memory import format_bytes
+from utils.paging import paginate
+from utils import tracing
 import json
 
 st.set_page_config(
@@ -17,20 +18,38 @@ st.set_page_config(
 
 
 FINISHED_KEY = 'practice_finished'
-def LocalStorageManager():
-    return LocalStorage()
-localS = LocalStorageManager()
+MAX_TEST_CASE_CHARS = 2000
+# Seconds between refreshes of the results while a submission is being graded.
+POLL_INTERVAL = 0.25
+OUTPUT_LABELS = {
+    "code": "Output of your code:",
+    "setup": "Test setup output:",
+    "checks": "Output during the additional checks:",
+}
+trace = tracing.begin_rerun("practice", st.session_state)
+with tracing.span("storage.progress"):
+    progress = get_progress()
 current_filter = st.session_state.get("practice_filter", {})
 
 
-st.session_state[FINISHED_KEY] = localS.getItem(FINISHED_KEY) or {}
+with tracing.span("storage.get", key=FINISHED_KEY):
+    st.session_state[FINISHED_KEY] = progress.get(FINISHED_KEY) or {}
 
-scenarios = list(filter(lambda f: f["difficulty"] == current_filter["difficulty"] if "difficulty" in current_filter else True, sorted(generated_scenarios, key=lambda x: x["difficulty"])))
+scenarios = registry.filter(difficulty=current_filter.get("difficulty"))
+
+requested_id = st.session_state.pop("practice_scenario_id", None)
+if requested_id in registry.by_id:
+    st.session_state['current_scenario_id'] = requested_id
+if st.session_state.get('current_scenario_id') not in registry.by_id:
+    st.session_state['current_scenario_id'] = scenarios[0].id
+
+current_scenario = registry.get(st.session_state['current_scenario_id'])
+if st.session_state.get(JOB_KEY) is not None and st.session_state[JOB_KEY].scenario_id != current_scenario.id:
+    cancel_session_job(st.session_state)
 
 def get_current_code():
-    finished_code = st.session_state.get(FINISHED_KEY, {}).get(st.session_state['current_scenario']['title'])
-    return finished_code or st.session_state['current_scenario'].get('initial_code', "")
-st.session_state.setdefault('current_scenario', scenarios[0])
+    finished_code = st.session_state.get(FINISHED_KEY, {}).get(current_scenario.title)
+    return finished_code or current_scenario.initial_code
 st.session_state.setdefault('current_code',get_current_code())
 
 def is_scenario_finished(scenario_title):
@@ -39,8 +58,6 @@ def is_scenario_finished(scenario_title):
 def save_current_code(code):
     st.session_state["current_code"] = code
 
-current_scenario = st.session_state['current_scenario']
-
 def translate_difficulty(difficulty):
     if difficulty == 1:
         return "Easy"
@@ -50,9 +67,6 @@ def translate_difficulty(difficulty):
         return "Hard"
     else:
         return "Unknown"
-st.sidebar.button("Reset Progress",
-                  on_click=lambda: localS.setItem(FINISHED_KEY, {}), 
-                  disabled=not bool(st.session_state[FINISHED_KEY]))
 
 def update_filter(p_filter, difficulty):
     if "difficulty" in p_filter and p_filter["difficulty"] == difficulty:
@@ -61,135 +75,155 @@ def update_filter(p_filter, difficulty):
         p_filter = {"difficulty": difficulty}
     st.session_state.update(practice_filter=p_filter)
 
-side_col1, side_col2, side_col3 = st.sidebar.columns(3)
-with side_col1:
-    st.button(f"{"✅" if current_filter.get("difficulty") == 1 else ""}Easy", use_container_width=True, on_click=lambda: update_filter(current_filter, 1))
-with side_col2:
-    st.button(f"{"✅" if current_filter.get("difficulty") == 2 else ""}Medium", use_container_width=True, on_click=lambda: update_filter(current_filter, 2))
-with side_col3:
-    st.button(f"{"✅" if current_filter.get("difficulty") == 3 else ""}Hard", use_container_width=True, on_click=lambda: update_filter(current_filter, 3))
 
-st.sidebar.write("## Scenarios")
-for scenario in scenarios: 
-    st.sidebar.button(f"{"✅ " if is_scenario_finished(scenario["title"]) else ""}{translate_difficulty(scenario["difficulty"])} - {scenario["title"]}", 
-                      key=f"{scenario["title"]}_sidebar", use_container_width=True, on_click=lambda s=scenario: st.session_state.update(current_scenario=s))
+@st.fragment
+@tracing.fragment_run("practice.sidebar", st.session_state)
+def scenario_sidebar():
+    """Filter and scenario list; filtering and paging rerun only this fragment."""
+    if st.button("Reset Progress", disabled=not bool(st.session_state[FINISHED_KEY])):
+        progress.set(FINISHED_KEY, {})
+        st.rerun()
+
+    current_filter = st.session_state.get("practice_filter", {})
+    side_col1, side_col2, side_col3 = st.columns(3)
+    with side_col1:
+        st.button(f"{"✅" if current_filter.get("difficulty") == 1 else ""}Easy", use_container_width=True, on_click=lambda: update_filter(current_filter, 1))
+    with side_col2:
+        st.button(f"{"✅" if current_filter.get("difficulty") == 2 else ""}Medium", use_container_width=True, on_click=lambda: update_filter(current_filter, 2))
+    with side_col3:
+        st.button(f"{"✅" if current_filter.get("difficulty") == 3 else ""}Hard", use_container_width=True, on_click=lambda: update_filter(current_filter, 3))
+
+    st.write("## Scenarios")
+    filtered = registry.filter(difficulty=current_filter.get("difficulty"))
+    current_index = registry.position(current_scenario.id, current_filter.get("difficulty"))
+    with tracing.span("render.sidebar"):
+        for scenario in paginate(filtered, "practice_scenarios", current_index):
+            if st.button(f"{"✅ " if is_scenario_finished(scenario.title) else ""}{translate_difficulty(scenario.difficulty)} - {scenario.title}",
+                         key=f"{scenario.title}_sidebar", use_container_width=True):
+                st.session_state.update(current_scenario_id=scenario.id)
+                st.rerun()
 
 
-successful = False
+with st.sidebar:
+    scenario_sidebar()
 
-scenario_title = current_scenario["title"]
+
+scenario_title = current_scenario.title
 
 st.title(scenario_title)
 
 
-col1, col2 = st.columns(2)
-with col1:
-    st.markdown(
-        current_scenario["description"]
-    )
-
-
-with col2:
-    st.write("Hit Ctrl + Enter to run the code in the editor below.")
-    response_dict = code_editor(get_current_code(), height=[10, 30], lang="python", key=scenario_title)
-
-
-def validate_code_for_security(code):
-    dangerous_nodes = (
-        ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal, ast.AsyncWith,
-    )
-    dangerous_names = {"exec", "eval", "open", "compile", "input", "__import__", "os", "sys", "subprocess"}
-
-    try:
-        tree = ast.parse(code)
-        for node in ast.walk(tree):
-            if isinstance(node, dangerous_nodes):
-                raise ValueError("Code contains potentially dangerous statements.")
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id in dangerous_names:
-                    raise ValueError(f"Use of '{node.func.id}' is not allowed.")
-                if isinstance(node.func, ast.Attribute) and node.func.attr in dangerous_names:
-                    raise ValueError(f"Use of '{node.func.attr}' is not allowed.")
-            if isinstance(node, ast.Name) and node.id in dangerous_names:
-                raise ValueError(f"Use of '{node.id}' is not allowed.")
-    except Exception as e:
-        raise ValueError(f"Security validation failed: {e}")
-    return code
-
-def validate_no_override_builtins(code):
-    predefined_names = set(dir(builtins))
-    try:
-        tree = ast.parse(code)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) and node.name in predefined_names:
-                raise ValueError(f"Overriding built-in name '{node.name}' is not allowed.")
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id in predefined_names:
-                        raise ValueError(f"Overriding built-in name '{target.id}' is not allowed.")
-    except Exception as e:
-        raise ValueError(f"Predefined name override validation failed: {e}")
-    return code
-
-def is_code_meet_optional_restriction(code, goal):
-    if "max_lines" in goal:
-        lines = [line for line in code.splitlines() if line.strip() and not line.strip().startswith("#") and not line.strip().startswith("def ")]
-        if len(lines) > goal["max_lines"]:
-           return False
-    return True
-
-if response_dict["text"]:
-    save_current_code(response_dict["text"])
-    try:
-        code = response_dict["text"]
-        validate_code_for_security(code)
-        validate_no_override_builtins(code)
-        exec(code, globals())
-        errors = 0
-        if "test_setup_code" in current_scenario:
-            try:
-                stdout_buffer = io.StringIO()
-                old_stdout = sys.stdout
-                try:
-                    sys.stdout = stdout_buffer
-                    exec(current_scenario["test_setup_code"], globals())
-                finally:
-                    sys.stdout = old_stdout
-                st.write("Test setup output:", stdout_buffer.getvalue())
-            except Exception as e:
-                raise ValueError(f"Test setup code execution failed: {e}")
-        if current_scenario["function_name"] in globals():
-            function = globals()[current_scenario["function_name"]]
-            for test_case in current_scenario["test_cases"]:
-                input_data = test_case["input"]
-                if isinstance(input_data, dict):
-                    result = function(**input_data)
-                else:
-                    result = function(*input_data)
-                expected_output = test_case["expected_output"]
-                if result != expected_output:
-                    errors += 1
-                    st.error(f"Test failed for input {input_data}. Expected {expected_output}, got {result}.")
-                else:
-                    st.success(f"Test passed for input {input_data}. Result: {result}.")
-            if errors == 0 and "optional_code_goal" in current_scenario:             
-                if is_code_meet_optional_restriction(code, current_scenario["optional_code_goal"]):
-                    st.success("Your code meets the optional restrictions.")
-                else:
-                    st.warning(f"Your code does not meet the optional restrictions, expected at most {current_scenario['optional_code_goal']['max_lines']} lines of code to be used")
-            if errors == 0:
-                st.success("All tests passed successfully!")
-                if scenario_title not in st.session_state[FINISHED_KEY]:
-                    st.session_state[FINISHED_KEY][scenario_title] = response_dict["text"]
-                    localS.setItem(FINISHED_KEY, st.session_state[FINISHED_KEY])
-                    st.rerun()
+def show_test_result(test_result):
+    peak = "" if test_result["peak_bytes"] is None else f" Peak memory: {format_bytes(test_result['peak_bytes'])}."
+    if test_result["passed"]:
+        st.success(f"Test passed for input {test_result['input']}. Result: {test_result['result']}.{peak}")
+    else:
+        st.error(f"Test failed for input {test_result['input']}. Expected {test_result['expected_output']}, got {test_result['result']}.{peak}")
+        differences = test_result.get("differences") or []
+        # A lone top-level difference repeats the message; nested ones point at what differs.
+        if len(differences) > 1 or differences and not differences[0].startswith("result:"):
+            st.code("\n".join(differences), language="text")
+    if test_result.get("output"):
+        st.code(test_result["output"], language="text")
+
+
+@tracing.fragment_run("practice.results", st.session_state)
+def show_grading(job, polling):
+    """Renders the results of the session's grading job; reruns on its own while the job runs."""
+    with tracing.span("render.results"):
+        # The worker thread appends to the list while this runs, so work on a copy.
+        for test_result in list(job.test_results):
+            show_test_result(test_result)
+        if not job.done:
+            st.caption(f"{len(job.test_results)} of {len(current_scenario.test_cases)} tests run…")
+            return
+        if polling:
+            # The full run records progress and renders the fragment without polling.
+            st.rerun()
+        grading_result = job.result
+        for phase, text in grading_result.get("output", {}).items():
+            st.caption(OUTPUT_LABELS[phase])
+            st.code(text, language="text")
+        if grading_result["skipped_tests"]:
+            st.info(f"Skipped the remaining {grading_result['skipped_tests']} tests after the first failure.")
+        property_tests = grading_result.get("property_tests")
+        if property_tests is not None:
+            if property_tests["passed"]:
+                st.success(f"Passed all {property_tests['total']} random tests.")
             else:
-                st.expander("Test Cases", expanded=False).code(
-                    json.dumps(current_scenario["test_cases"], indent=2), 
-                    language="json"
+                counterexample = property_tests["counterexample"]
+                st.error(
+                    f"Random test failed after {property_tests['checked']} of {property_tests['total']} passed, "
+                    f"for input {counterexample['input']}. Expected {counterexample['expected_output']}, got {counterexample['result']}."
                 )
-        else:
-            st.error("Function 'add_numbers' not found.")
-    except Exception as e:
-        # pass
-        st.error(f"Error executing code: {e}")
\ No newline at end of file
+        memory = grading_result.get("memory")
+        if memory is not None:
+            (st.success if memory["met"] else st.error)(memory["message"])
+        if grading_result["status"] in ("error", "timeout", "crashed", "cancelled"):
+            st.error(grading_result["error"])
+            return
+        if grading_result["optional_goal_met"] is True:
+            st.success("Your code meets the optional restrictions.")
+        elif grading_result["optional_goal_met"] is False:
+            for violation in grading_result["optional_goal_violations"]:
+                st.warning(f"Your code does not meet the optional restrictions, {violation}")
+        performance = grading_result.get("performance")
+        if performance is not None:
+            (st.success if performance["met"] else st.error if performance["required"] else st.warning)(performance["message"])
+            if performance["timings"]:
+                st.expander("Timings", expanded=not performance["met"]).table([
+                    {
+                        "n": timing["n"],
+                        "your solution (ms)": round(timing["seconds"] * 1000, 3),
+                        "reference (ms)": None if timing["reference_seconds"] is None else round(timing["reference_seconds"] * 1000, 3),
+                    }
+                    for timing in performance["timings"]
+                ])
+        if grading_result["status"] == "passed":
+            st.success("All tests passed successfully!")
+        elif st.toggle("Show the test cases", key="practice_show_test_cases"):
+            # Rendered on demand and cut per case, as inputs can be large.
+            for test_case in current_scenario.test_cases:
+                st.code(preview(json.dumps(test_case.to_dict(), indent=2, default=repr), limit=MAX_TEST_CASE_CHARS), language="json")
+
+
+@st.fragment
+@tracing.fragment_run("practice.workspace", st.session_state)
+def workspace():
+    """Description, editor and results; submitting code reruns only this fragment."""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(
+            current_scenario.description
+        )
+
+    with col2:
+        st.write("Hit Ctrl + Enter to run the code in the editor below.")
+        fail_fast = st.toggle("Stop at the first failing test", key="practice_fail_fast")
+        with tracing.span("render.editor"):
+            response_dict = code_editor(get_current_code(), height=[10, 30], lang="python", key=scenario_title)
+
+    if not response_dict["text"]:
+        return
+    save_current_code(response_dict["text"])
+    job = st.session_state.get(JOB_KEY)
+    if job is None or job.key != (current_scenario.id, response_dict["text"], fail_fast):
+        # The learner changed the code or the mode; the old result is of no use anymore.
+        if job is not None:
+            job.cancel()
+        with tracing.span("grading.submit"):
+            job = submit(current_scenario, response_dict["text"], fail_fast)
+        st.session_state[JOB_KEY] = job
+    job.report_spans()
+    if job.done and job.result["status"] == "passed" and scenario_title not in st.session_state[FINISHED_KEY]:
+        st.session_state[FINISHED_KEY][scenario_title] = response_dict["text"]
+        progress.set(FINISHED_KEY, st.session_state[FINISHED_KEY])
+        # The sidebar shows the finished state, so the whole page reruns.
+        st.rerun()
+    polling = not job.done
+    st.fragment(show_grading, run_every=POLL_INTERVAL if polling else None)(job, polling)
+
+
+workspace()
+
+tracing.end_rerun(trace, st.session_state)
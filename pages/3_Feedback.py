@@ -1,4 +1,5 @@
 import streamlit as st
+from utils.grading_service import cancel_session_job
 
 st.set_page_config(
     page_title="Python | Feedback",
@@ -7,6 +8,9 @@ st.set_page_config(
     layout="wide",
 )
 
+# A submission still being graded on the practice page is no longer of interest.
+cancel_session_job(st.session_state)
+
 st.title("Feedback Page")
 st.markdown(
     """
@@ -0,0 +1,142 @@
+import streamlit as st
+import statistics
+from datetime import datetime
+from utils import tracing
+from utils.grading_service import cancel_session_job, get_grading_cache
+
+st.set_page_config(
+    page_title="Python | Performance",
+    initial_sidebar_state="expanded",
+    page_icon=":snake:",
+    layout="wide",
+)
+
+# A submission still being graded on the practice page is no longer of interest.
+cancel_session_job(st.session_state)
+
+st.title("Performance")
+
+if not tracing.ENABLED:
+    # The page exposes timings and cache statistics of every session, so it only
+    # exists on deployments that opted into tracing.
+    st.info(f"This page is disabled. Start the app with `{tracing.TRACE_ENV}=1` to enable it.")
+    st.stop()
+
+st.subheader("Grading cache")
+cache_stats = get_grading_cache().stats()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Hits", cache_stats["hits"])
+col2.metric("Misses", cache_stats["misses"])
+col3.metric("Hit rate", f"{cache_stats['hit_rate']:.0%}")
+col4.metric("Entries", f"{cache_stats['size']} / {cache_stats['maxsize']}")
+if "disk" in cache_stats:
+    disk_stats = cache_stats["disk"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Memory hits", cache_stats["memory_hits"])
+    col2.metric("Shared disk hits", disk_stats["hits"])
+    col3.metric("Disk entries", disk_stats["size"])
+    col4.metric("Disk usage", f"{disk_stats['bytes'] / 2**20:.1f} / {disk_stats['max_bytes'] / 2**20:.0f} MiB")
+
+traces = tracing.read_traces()
+if not traces:
+    st.write(f"No traces recorded yet in `{tracing.trace_file()}`.")
+    st.stop()
+
+pages = sorted({trace["page"] for trace in traces})
+selected_pages = st.multiselect("Pages", pages, default=pages)
+traces = [trace for trace in traces if trace["page"] in selected_pages]
+if not traces:
+    st.write("No traces for the selected pages.")
+    st.stop()
+
+st.subheader(f"Slowest reruns (of the last {len(traces)})")
+slowest = sorted(traces, key=lambda trace: trace["duration_ms"], reverse=True)[:25]
+st.dataframe(
+    [
+        {
+            "page": trace["page"],
+            "duration_ms": trace["duration_ms"],
+            "started": datetime.fromtimestamp(trace["started_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+            "interrupted": trace.get("interrupted", False),
+            "spans": len(trace["spans"]),
+        }
+        for trace in slowest
+    ],
+    use_container_width=True,
+)
+
+st.subheader("Phase breakdown")
+durations = {}
+for trace in traces:
+    for span in trace["spans"]:
+        durations.setdefault(span["name"], []).append(span["duration_ms"])
+st.dataframe(
+    sorted(
+        (
+            {
+                "phase": name,
+                "count": len(values),
+                "total_ms": round(sum(values), 1),
+                "p50_ms": round(statistics.median(values), 2),
+                "p95_ms": round(tracing.percentile(values, 0.95), 2),
+                "max_ms": round(max(values), 2),
+            }
+            for name, values in durations.items()
+        ),
+        key=lambda row: row["total_ms"],
+        reverse=True,
+    ),
+    use_container_width=True,
+)
+
+st.subheader("Session memory")
+sessions = {}
+# Traces are newest first; walking them backwards sees every session in order.
+for trace in reversed(traces):
+    if trace.get("session_bytes") is not None:
+        sessions.setdefault(trace["session"], []).append(trace["session_bytes"])
+if sessions:
+    st.caption("Bytes reachable from each session's state at the end of its reruns.")
+    st.dataframe(
+        sorted(
+            (
+                {
+                    "session": session,
+                    "reruns": len(sizes),
+                    "latest_kib": round(sizes[-1] / 1024, 1),
+                    "max_kib": round(max(sizes) / 1024, 1),
+                    "growth_kib": round((sizes[-1] - sizes[0]) / 1024, 1),
+                }
+                for session, sizes in sessions.items()
+            ),
+            key=lambda row: row["latest_kib"],
+            reverse=True,
+        )[:25],
+        use_container_width=True,
+    )
+else:
+    st.write("No session memory recorded in these traces.")
+
+st.subheader("Grading memory")
+# Recorded by the grading workers as events and merged into the reruns with the "worker." prefix.
+namespace_sizes = [span["attrs"]["bytes"] for trace in traces for span in trace["spans"]
+                   if span["name"] == "worker.namespace" and span["attrs"]["bytes"] is not None]
+worker_rss = [span["attrs"]["rss_bytes"] for trace in reversed(traces) for span in trace["spans"]
+              if span["name"] == "worker.worker_memory"]
+if namespace_sizes or worker_rss:
+    col1, col2, col3 = st.columns(3)
+    if namespace_sizes:
+        col1.metric("Submission namespace p50", f"{statistics.median(namespace_sizes) / 1024:.1f} KiB")
+        col2.metric("Submission namespace max", f"{max(namespace_sizes) / 1024:.1f} KiB")
+    if worker_rss:
+        col3.metric("Latest worker RSS", f"{worker_rss[-1] / 2**20:.1f} MiB")
+else:
+    st.write("No grading memory recorded in these traces.")
+
+st.subheader("Rerun details")
+index = st.selectbox(
+    "Rerun",
+    range(len(slowest)),
+    format_func=lambda i: f"{slowest[i]['page']} – {slowest[i]['duration_ms']:.1f} ms",
+)
+st.dataframe(sorted(slowest[index]["spans"], key=lambda span: span["start_ms"]), use_container_width=True)
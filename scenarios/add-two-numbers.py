@@ -0,0 +1,8 @@
+{'title': 'Add two numbers',
+ 'difficulty': 1,
+ 'description': 'Create a function that adds two numbers together and returns the result.',
+ 'initial_code': 'def add_numbers(a: int, b: int) -> int:\n    # Your code here\n    pass',
+ 'function_name': 'add_numbers',
+ 'test_cases': [{'input': (2, 3), 'expected_output': 5, 'description': 'Adding 2 and 3 should return 5.'},
+                {'input': (-1, 1), 'expected_output': 0, 'description': 'Adding -1 and 1 should return 0.'},
+                {'input': (0, 0), 'expected_output': 0, 'description': 'Adding 0 and 0 should return 0.'}]}
@@ -0,0 +1,9 @@
+{'title': 'Calculate Factorial',
+ 'difficulty': 2,
+ 'description': 'Create a function that calculates the factorial of a given number and returns the result.',
+ 'initial_code': 'def factorial(n: int) -> int:\n    # Your code here\n    pass',
+ 'function_name': 'factorial',
+ 'test_cases': [{'input': (5,), 'expected_output': 120, 'description': 'Factorial of 5 should return 120.'},
+                {'input': (0,), 'expected_output': 1, 'description': 'Factorial of 0 should return 1.'},
+                {'input': (1,), 'expected_output': 1, 'description': 'Factorial of 1 should return 1.'},
+                {'input': (3,), 'expected_output': 6, 'description': 'Factorial of 3 should return 6.'}]}
@@ -0,0 +1,31 @@
+{'title': 'Class Decorator: Add Repr',
+ 'difficulty': 2,
+ 'description': 'Write a class decorator called `add_repr` that adds a custom `__repr__` method to any class '
+                'it decorates. The `__repr__` method should return a string in the format '
+                "`<ClassName({attribute_dict})>`, where `attribute_dict` is the dictionary of the instance's "
+                'attributes.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                '@add_repr\n'
+                'class Point:\n'
+                '    def __init__(self, x, y):\n'
+                '        self.x = x\n'
+                '        self.y = y\n'
+                'p = Point(1, 2)\n'
+                "repr(p)  # <Point({'x': 1, 'y': 2})>\n"
+                '```\n'
+                'Demonstrate your understanding of class decorators and dynamic method addition.',
+ 'initial_code': 'def add_repr(cls):\n    # Your code here\n    pass',
+ 'function_name': 'test_point_repr',
+ 'test_setup_code': '@add_repr\n'
+                    'class Point:\n'
+                    '    def __init__(self, x, y):\n'
+                    '        self.x = x\n'
+                    '        self.y = y\n'
+                    'def test_point_repr():\n'
+                    '    p = Point(3, 4)\n'
+                    '    return repr(p)\n',
+ 'test_cases': [{'input': (),
+                 'expected_output': "<Point({'x': 3, 'y': 4})>",
+                 'description': 'Should return custom repr for Point(3, 4).'}]}
@@ -0,0 +1,23 @@
+{'title': 'Collect unique values from a list',
+ 'difficulty': 1,
+ 'description': 'Create a function called `collect_unique_values` that takes a list of integers and returns '
+                'a set of unique values. This exercise is to demonstrate your understanding of sets in '
+                'Python.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                'collect_unique_values([1, 2, 2, 3, 4, 4])  # {1, 2, 3, 4}\n'
+                'collect_unique_values([5, 5, 5])  # {5}\n'
+                'collect_unique_values([])  # set()\n'
+                '```\n',
+ 'initial_code': 'def collect_unique_values(lst):\n    # Your code here\n    pass',
+ 'function_name': 'collect_unique_values',
+ 'test_cases': [{'input': ([1, 2, 2, 3, 4, 4],),
+                 'expected_output': {1, 2, 3, 4},
+                 'description': 'Should return {1, 2, 3, 4} for [1, 2, 2, 3, 4, 4].'},
+                {'input': ([5, 5, 5],),
+                 'expected_output': {5},
+                 'description': 'Should return {5} for [5, 5, 5].'},
+                {'input': ([],),
+                 'expected_output': set(),
+                 'description': 'Should return an empty set for an empty list.'}]}
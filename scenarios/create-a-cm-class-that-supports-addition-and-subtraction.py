@@ -0,0 +1,39 @@
+{'title': 'Create a cm class that supports addition and subtraction',
+ 'difficulty': 2,
+ 'description': 'Create a class called `Centimeter` that represents a length in centimeters.\n'
+                '  The class should support\n'
+                "  - addition of other 'Centimeter' instances\n"
+                '  - addition of an integer or float\n'
+                "  - subtraction of other 'Centimeter' instances\n"
+                '  - subtraction of an integer or float\n'
+                "  - equality comparison with other 'Centimeter' instances\n"
+                '\n'
+                '  For example:\n'
+                '```python\n'
+                'cm1 = Centimeter(10)\n'
+                'cm2 = Centimeter(5)\n'
+                'result_add = cm1 + cm2  # Centimeter(15)\n'
+                'result_sub = cm1 - cm2  # Centimeter(5)\n'
+                'result_add_with_number = cm1 + 5  # Centimeter(15)\n'
+                '```\n',
+ 'initial_code': 'class Centimeter:\n    # Your code here\n',
+ 'test_setup_code': 'def test_centimeter_operations(n1, n2):\n'
+                    '    cm1 = Centimeter(n1)\n'
+                    '    cm2 = Centimeter(n2)\n'
+                    '    assert (cm1 + cm2) == Centimeter(n1 + n2)\n'
+                    '    assert (cm1 + n2) == Centimeter(n1 + n2)\n'
+                    '    assert (cm1 - cm2) == Centimeter(n1 - n2)\n'
+                    '    assert (cm1 - n2) == Centimeter(n1 - n2)\n'
+                    '    assert (cm1 + Centimeter(0)) == cm1\n'
+                    '    assert (cm1 - Centimeter(0)) == cm1\n',
+ 'function_name': 'test_centimeter_operations',
+ 'test_cases': [{'input': (10, 5),
+                 'expected_output': None,
+                 'description': 'Adding Centimeter(10) and Centimeter(5) should return Centimeter(15).'},
+                {'input': (20, 10),
+                 'expected_output': None,
+                 'description': 'Subtracting Centimeter(10) from Centimeter(20) should return '
+                                'Centimeter(10).'},
+                {'input': (0, 0),
+                 'expected_output': None,
+                 'description': 'Adding two zero lengths should return Centimeter(0).'}]}
@@ -0,0 +1,28 @@
+{'title': 'Dictionary Comprehension with Conditional Logic',
+ 'difficulty': 1,
+ 'description': 'Create a function called `even_square_dict` that takes a list of integers and returns a '
+                'dictionary where the keys are the even numbers from the list and the values are their '
+                'squares. Suggestion: Use a dictionary comprehension with a condition.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                'even_square_dict([1, 2, 3, 4, 5])  # {2: 4, 4: 16}\n'
+                'even_square_dict([10, 15, 20])  # {10: 100, 20: 400}\n'
+                'even_square_dict([])  # {}\n'
+                '```\n'
+                'Demonstrate your understanding of dictionary comprehensions and conditional logic in '
+                'Python.',
+ 'initial_code': 'def even_square_dict(numbers):\n    # Your code here\n    pass',
+ 'function_name': 'even_square_dict',
+ 'test_cases': [{'input': ([1, 2, 3, 4, 5],),
+                 'expected_output': {2: 4, 4: 16},
+                 'description': 'Should return {2: 4, 4: 16} for [1, 2, 3, 4, 5].'},
+                {'input': ([10, 15, 20],),
+                 'expected_output': {10: 100, 20: 400},
+                 'description': 'Should return {10: 100, 20: 400} for [10, 15, 20].'},
+                {'input': ([1, 3, 5],),
+                 'expected_output': {},
+                 'description': 'Should return {} for [1, 3, 5] (no even numbers).'},
+                {'input': ([],),
+                 'expected_output': {},
+                 'description': 'Should return {} for an empty list.'}]}
@@ -0,0 +1,55 @@
+{'title': 'Find duplicate values efficiently',
+ 'difficulty': 2,
+ 'description': 'Create a function called `find_duplicates` that takes a list of integers and returns a '
+                'sorted list of the values that appear more than once.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                'find_duplicates([3, 1, 3, 2, 1])  # [1, 3]\n'
+                'find_duplicates([1, 2, 3])  # []\n'
+                '```\n'
+                '\n'
+                'Correct is not enough here: your solution is also timed on lists of up to 16,000 items and '
+                'only passes if it grows linearly with the input, O(n). Calling `list.count` for every item '
+                'is O(n²); see the lecture on performance considerations for faster alternatives.\n',
+ 'initial_code': 'def find_duplicates(items):\n    # Your code here\n    pass',
+ 'function_name': 'find_duplicates',
+ 'test_cases': [{'input': ([3, 1, 3, 2, 1],),
+                 'expected_output': [1, 3],
+                 'description': 'Should return [1, 3] for [3, 1, 3, 2, 1].'},
+                {'input': ([1, 2, 3],),
+                 'expected_output': [],
+                 'description': 'Should return an empty list when nothing repeats.'},
+                {'input': ([],),
+                 'expected_output': [],
+                 'description': 'Should return an empty list for an empty list.'},
+                {'input': ([7, 7, 7, 7],),
+                 'expected_output': [7],
+                 'description': 'Should list a value once however often it repeats.'}],
+ 'performance_goal': {'complexity': 'O(n)',
+                      'max_seconds': 0.05,
+                      'sizes': [1000, 2000, 4000, 8000, 16000],
+                      'input_generator': 'def generate(n):\n'
+                                         '    # Every value appears about twice, in a scrambled but '
+                                         'reproducible order.\n'
+                                         '    return ([(i * 7919) % (n // 2 + 1) for i in range(n)],)\n',
+                      'reference_solution': 'def find_duplicates(items):\n'
+                                            '    seen, duplicates = set(), set()\n'
+                                            '    for item in items:\n'
+                                            '        if item in seen:\n'
+                                            '            duplicates.add(item)\n'
+                                            '        seen.add(item)\n'
+                                            '    return sorted(duplicates)\n',
+                      'required': True},
+ 'property_tests': {'count': 2000,
+                    'seed': 0,
+                    'input_generator': 'def generate(rng):\n'
+                                       '    return ([rng.randint(0, 15) for _ in range(rng.randint(0, '
+                                       '20))],)\n',
+                    'reference_solution': 'def find_duplicates(items):\n'
+                                          '    seen, duplicates = set(), set()\n'
+                                          '    for item in items:\n'
+                                          '        if item in seen:\n'
+                                          '            duplicates.add(item)\n'
+                                          '        seen.add(item)\n'
+                                          '    return sorted(duplicates)\n'}}
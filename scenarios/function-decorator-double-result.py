@@ -0,0 +1,25 @@
+{'title': 'Function Decorator: Double Result',
+ 'difficulty': 2,
+ 'description': 'Write a function decorator called `double_result` that, when applied to any function, will '
+                'double the result returned by that function. The decorator should not take any arguments.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                '@double_result\n'
+                'def add(a, b):\n'
+                '    return a + b\n'
+                'add(2, 3)  # 10\n'
+                '```\n'
+                'Demonstrate your understanding of function decorators in Python.',
+ 'initial_code': 'def double_result(func):\n    # Your code here\n    pass',
+ 'function_name': 'add',
+ 'test_setup_code': '@double_result\ndef add(a, b):\n    return a + b\n',
+ 'test_cases': [{'input': (1, 3),
+                 'expected_output': 8,
+                 'description': 'add(1, 3) should return 8 because the result is doubled.'},
+                {'input': (0, 0),
+                 'expected_output': 0,
+                 'description': 'add(0, 0) should return 0 because the result is doubled.'},
+                {'input': (-1, 2),
+                 'expected_output': 2,
+                 'description': 'add(-1, 2) should return 2 because the result is doubled.'}]}
@@ -0,0 +1,32 @@
+{'title': 'Group by Remainder',
+ 'difficulty': 2,
+ 'description': 'Given a list of integers, create a function that returns a dictionary  that groups the '
+                'integers based on the remainder when divided  by a given divisor. The keys of the '
+                'dictionary should be the remainders, and the values should be lists of integers that yield '
+                'those remainders.',
+ 'initial_code': 'def group_by_remainder(lst:list, divisor:int) -> int:\n    # Your code here\n    pass',
+ 'function_name': 'group_by_remainder',
+ 'optional_code_goal': {'max_lines': 3},
+ 'test_cases': [{'input': ([10, 20, 30, 25, 15], 5),
+                 'expected_output': {0: [10, 20, 30, 25, 15]},
+                 'description': 'Grouping by remainder when divided by 5.'},
+                {'input': ([1, 2, 3, 4, 5], 2),
+                 'expected_output': {0: [2, 4], 1: [1, 3, 5]},
+                 'description': 'Grouping by remainder when divided by 2.'},
+                {'input': ([7, 14, 21], 7),
+                 'expected_output': {0: [7, 14, 21]},
+                 'description': 'All numbers yield the same remainder when divided by 7.'},
+                {'input': ([8, -8, -16], 4),
+                 'expected_output': {0: [8, -8, -16]},
+                 'description': 'All numbers yield the same remainder when divided by 4.'}],
+ 'property_tests': {'count': 2000,
+                    'seed': 0,
+                    'input_generator': 'def generate(rng):\n'
+                                       '    numbers = [rng.randint(-100, 100) for _ in range(rng.randint(0, '
+                                       '15))]\n'
+                                       '    return (numbers, rng.randint(1, 10))\n',
+                    'reference_solution': 'def group_by_remainder(lst, divisor):\n'
+                                          '    groups = {}\n'
+                                          '    for number in lst:\n'
+                                          '        groups.setdefault(number % divisor, []).append(number)\n'
+                                          '    return groups\n'}}
@@ -0,0 +1,25 @@
+{'title': 'Handle expections',
+ 'difficulty': 1,
+ 'description': 'Create a function that gets a string and tries to convert it to a number. If the conversion '
+                "fails, it should return 'Invalid input'. This exercise is to demonstrate your understanding "
+                'of exception handling in Python.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                'to_number("10")  # 10.0\n'
+                'to_number("abc")  # \'Invalid input\'\n'
+                '```\n',
+ 'initial_code': 'def to_number(s):\n    # Your code here\n    pass',
+ 'function_name': 'to_number',
+ 'test_cases': [{'input': ('10',),
+                 'expected_output': 10.0,
+                 'description': "Should return 10.0 for input '10'."},
+                {'input': ('abc',),
+                 'expected_output': 'Invalid input',
+                 'description': "Should return 'Invalid input' for input 'abc'."},
+                {'input': ('3.14',),
+                 'expected_output': 3.14,
+                 'description': "Should return 3.14 for input '3.14'."},
+                {'input': ('-5',),
+                 'expected_output': -5.0,
+                 'description': "Should return -5.0 for input '-5'."}]}
@@ -0,0 +1,31 @@
+{'title': 'Redact Username Decorator',
+ 'difficulty': 3,
+ 'description': 'Create a decorator that get a username as a parameter and reducts the username from **ALL** '
+                "input arguments of the function it decorates by using '???'  \n"
+                'For example if the username is  \n'
+                '```Thomas```  \n'
+                'and the function is called with  \n'
+                '```Thomas is tired```  \n'
+                'it should replace the argument with  \n'
+                '```??? is tired```',
+ 'initial_code': 'def redact_username(username: str):\n    # Your code here\n    pass',
+ 'function_name': 'test_function',
+ 'test_setup_code': "@redact_username('John')\n"
+                    'def test_function(input_string: str, notes: str="none"):\n'
+                    "    return input_string + ' Notes: ' + notes",
+ 'test_cases': [{'input': ('John is tired',),
+                 'expected_output': '??? is tired Notes: none',
+                 'description': "Redacting username 'John' should return '???'."},
+                {'input': ('Alice and John are buying a house',),
+                 'expected_output': 'Alice and ??? are buying a house Notes: none',
+                 'description': "Redacting username 'John' should return 'Alice and ??? are buying a "
+                                "house'."},
+                {'input': ("Charlie doesn't know anybody",),
+                 'expected_output': "Charlie doesn't know anybody Notes: none",
+                 'description': "No redaction needed as 'Charlie' is not the username."},
+                {'input': ('Bank is closing loan', 'John is the manager'),
+                 'expected_output': 'Bank is closing loan Notes: ??? is the manager',
+                 'description': 'All parameters should be redacted if they contain the username.'},
+                {'input': {'input_string': 'Bank is closing loan', 'notes': 'John is the manager'},
+                 'expected_output': 'Bank is closing loan Notes: ??? is the manager',
+                 'description': 'All parameters should be redacted if they contain the username.'}]}
@@ -0,0 +1,24 @@
+{'title': 'Reverse list',
+ 'difficulty': 1,
+ 'description': 'Create a function that reverses a list and returns the reversed list.',
+ 'initial_code': 'def reverse_list(lst: list) -> list:\n    # Your code here\n    pass',
+ 'function_name': 'reverse_list',
+ 'optional_code_goal': {'max_lines': 1},
+ 'test_cases': [{'input': ([2, 3],),
+                 'expected_output': [3, 2],
+                 'description': 'Reversing the list [2, 3] should return [3, 2].'},
+                {'input': ([5, 4, 3, 2, 1],),
+                 'expected_output': [1, 2, 3, 4, 5],
+                 'description': 'Reversing the list [5, 4, 3, 2, 1] should return [1, 2, 3, 4, 5].'},
+                {'input': ([1],),
+                 'expected_output': [1],
+                 'description': 'Reversing the list [1] should return [1].'},
+                {'input': ([],),
+                 'expected_output': [],
+                 'description': 'Reversing an empty list should return an empty list.'}],
+ 'property_tests': {'count': 2000,
+                    'seed': 0,
+                    'input_generator': 'def generate(rng):\n'
+                                       '    return ([rng.randint(-100, 100) for _ in range(rng.randint(0, '
+                                       '20))],)\n',
+                    'reference_solution': 'def reverse_list(lst):\n    return lst[::-1]\n'}}
@@ -0,0 +1,25 @@
+{'title': 'Stream the sum of squares',
+ 'difficulty': 2,
+ 'description': 'Create a function called `sum_of_squares` that takes an iterable of integers and returns '
+                'the sum of their squares.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                'sum_of_squares([1, 2, 3])  # 14\n'
+                'sum_of_squares([])  # 0\n'
+                '```\n'
+                '\n'
+                'Your function is also called with a generator of 1,000,000 numbers and may use at most 64 '
+                'KiB of memory while doing so. Building a list of all squares does not fit; process the '
+                'values one at a time, as shown in the lecture on generators and iterators.\n',
+ 'initial_code': 'def sum_of_squares(numbers):\n    # Your code here\n    pass',
+ 'function_name': 'sum_of_squares',
+ 'test_cases': [{'input': ([1, 2, 3],),
+                 'expected_output': 14,
+                 'description': 'Should return 14 for [1, 2, 3].'},
+                {'input': ([],), 'expected_output': 0, 'description': 'Should return 0 for an empty list.'},
+                {'input': ((-2, 5),),
+                 'expected_output': 29,
+                 'description': 'Should accept any iterable, such as a tuple.'}],
+ 'memory_goal': {'max_peak_bytes': 65536,
+                 'input_generator': 'def generate():\n    return ((x for x in range(1_000_000)),)\n'}}
@@ -0,0 +1,25 @@
+{'title': 'Tuple Packing and Unpacking',
+ 'difficulty': 2,
+ 'description': 'Create a function called `swap_and_pack` that takes two arguments, swaps them, and returns '
+                'them as a tuple. Then, demonstrate tuple unpacking by writing a test that unpacks the '
+                'result into two variables. This exercise is to show your understanding of tuple packing and '
+                'unpacking in Python.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                "result = swap_and_pack('hello', 42)  # (42, 'hello')\n"
+                "a, b = swap_and_pack('hello', 42)\n"
+                "# a == 42, b == 'hello'\n"
+                '```\n'
+                'If you pass two values, the function should return them swapped in a tuple.',
+ 'initial_code': 'def swap_and_pack(a, b):\n    # Your code here\n    pass',
+ 'function_name': 'swap_and_pack',
+ 'test_cases': [{'input': ('hello', 42),
+                 'expected_output': (42, 'hello'),
+                 'description': "Should return (42, 'hello') for input ('hello', 42)."},
+                {'input': (1, 2),
+                 'expected_output': (2, 1),
+                 'description': 'Should return (2, 1) for input (1, 2).'},
+                {'input': ([1, 2], {'a': 10}),
+                 'expected_output': ({'a': 10}, [1, 2]),
+                 'description': "Should return ({'a': 10}, [1, 2]) for input ([1, 2], {'a': 10})."}]}
@@ -0,0 +1,27 @@
+{'title': 'Unpacking and Extended Iterable Unpacking',
+ 'difficulty': 1,
+ 'description': 'Create a function called `split_first_last` that takes a list of at least two elements and '
+                'returns a tuple containing the first element, a list of all middle elements, and the last '
+                'element. Demonstrate your understanding of iterable unpacking and the use of the * operator '
+                'in function arguments.\n'
+                '\n'
+                'For example:\n'
+                '```python\n'
+                'split_first_last([1, 2, 3, 4])  # (1, [2, 3], 4)\n'
+                "split_first_last(['a', 'b', 'c'])  # ('a', ['b'], 'c')\n"
+                '```\n'
+                'If the list has only two elements, the middle list should be empty.',
+ 'initial_code': 'def split_first_last(lst):\n    # Your code here\n    pass',
+ 'function_name': 'split_first_last',
+ 'test_cases': [{'input': ([1, 2, 3, 4],),
+                 'expected_output': (1, [2, 3], 4),
+                 'description': 'Should return (1, [2, 3], 4) for [1, 2, 3, 4].'},
+                {'input': (['a', 'b', 'c'],),
+                 'expected_output': ('a', ['b'], 'c'),
+                 'description': "Should return ('a', ['b'], 'c') for ['a', 'b', 'c']."},
+                {'input': ([10, 20],),
+                 'expected_output': (10, [], 20),
+                 'description': 'Should return (10, [], 20) for [10, 20].'},
+                {'input': ([1, 2, 3, 4, 5, 6],),
+                 'expected_output': (1, [2, 3, 4, 5], 6),
+                 'description': 'Should return (1, [2, 3, 4, 5], 6) for [1, 2, 3, 4, 5, 6].'}]}
@@ -0,0 +1,12 @@
+import pytest
+
+from utils.cache import CACHE_DIR_ENV
+from utils.tracing import TRACE_FILE_ENV
+
+
+@pytest.fixture(autouse=True)
+def isolated_files(monkeypatch, tmp_path):
+    # Grading writes property test cases and cache entries; keep them out of the
+    # working tree, and keep a developer's own files from leaking into the tests.
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    monkeypatch.setenv(TRACE_FILE_ENV, str(tmp_path / "traces" / "reruns.jsonl"))
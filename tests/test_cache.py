@@ -0,0 +1,81 @@
+import os
+import pickle
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import DiskCache, LRUCache, TieredCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "hit_rate": 0.75, "size": 2, "maxsize": 2}
+
+
+def test_lru_cache_stores_falsy_values():
+    cache = LRUCache()
+    cache.set("empty", [])
+    assert cache.get("empty", "missing") == []
+
+
+def test_disk_cache_is_shared_through_its_directory(tmp_path):
+    DiskCache(tmp_path).set(("key", 1), {"status": "passed"})
+    assert DiskCache(tmp_path).get(("key", 1)) == {"status": "passed"}
+
+
+def test_disk_cache_entries_expire(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path, ttl=10)
+    cache.set("key", "value")
+    now = cache_module.time.time()
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 11)
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+
+class Unloadable:
+    def __reduce__(self):
+        return (_raise, ())
+
+
+def _raise():
+    raise AttributeError("the class of this entry no longer exists")
+
+
+@pytest.mark.parametrize("data", [b"", b"not a pickle", pickle.dumps((None, "key", Unloadable()))])
+def test_unreadable_disk_entries_are_misses(tmp_path, data):
+    cache = DiskCache(tmp_path)
+    path = cache._path("key")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(data)
+    assert cache.get("key", "missing") == "missing"
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_cache_evicts_least_recently_read(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=10_000)
+    for index in range(5):
+        cache.set(index, b"x" * 3000)
+        path = cache._path(index)
+        os.utime(path, (index, index))
+    assert cache.evict() > 0
+    assert cache.stats()["bytes"] <= 9000
+    assert cache.get(4) is not None
+    assert cache.get(0) is None
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    DiskCache(tmp_path).set("key", "value")
+    cache = TieredCache(LRUCache(), DiskCache(tmp_path))
+    assert cache.get("key") == "value"
+    assert cache.get("key") == "value"
+    stats = cache.stats()
+    assert (stats["hits"], stats["memory_hits"], stats["disk"]["hits"], stats["misses"]) == (2, 1, 1, 0)
+    assert cache.get("other") is None
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,102 @@
+import ast
+
+import pytest
+
+from utils.code_analysis import (
+    BUILTINS, GOAL, GOAL_RULES, SECURITY, MaxLinesRule, Rule, Violation, analyze_code, count_lines, goal_rules,
+)
+
+
+def only_violation(code, goal=None):
+    [violation] = analyze_code(code, goal).violations
+    return violation
+
+
+@pytest.mark.parametrize("code, line, col", [
+    ("import os", 1, 0),
+    ("from math import pi", 1, 0),
+    ("def f():\n    global x", 2, 4),
+    ("def f():\n    x = 1\n    def g():\n        nonlocal x", 4, 8),
+    ("async def f():\n    async with lock:\n        pass", 2, 4),
+])
+def test_dangerous_statements(code, line, col):
+    violation = only_violation(code)
+    assert violation == Violation(SECURITY, "Code contains potentially dangerous statements.", line, col)
+
+
+@pytest.mark.parametrize("code, name, col", [
+    ("x = 1\ny = eval('1')", "eval", 4),
+    ("x = 1\nf = open", "open", 4),
+    ("x = 1\ny = obj.exec('ls')", "exec", 4),
+    ("x = 1\nsys", "sys", 0),
+])
+def test_dangerous_names(code, name, col):
+    violation = only_violation(code)
+    assert violation == Violation(SECURITY, f"Use of '{name}' is not allowed.", 2, col)
+
+
+@pytest.mark.parametrize("code, name, line", [
+    ("def print():\n    pass", "print", 1),
+    ("x = 1\nlist = []", "list", 2),
+    ("a = sum = 0", "sum", 1),
+])
+def test_builtin_overrides(code, name, line):
+    violation = only_violation(code)
+    assert violation == Violation(BUILTINS, f"Overriding built-in name '{name}' is not allowed.", line, 0)
+
+
+def test_clean_code_has_no_violations():
+    report = analyze_code("def reverse_list(lst):\n    # keep it short\n    return lst[::-1]\n")
+    assert report.violations == [] and report.errors == []
+    assert report.node_counts["FunctionDef"] == 1
+
+
+def test_count_lines_skips_blank_lines_comments_and_signatures():
+    code = "def f(x):\n\n    # comment\n    y = x + 1\n    return y\n"
+    assert count_lines(code) == 2
+
+
+def test_max_lines_goal():
+    code = "def f(x):\n    y = x\n    z = y\n    return z\n"
+    assert analyze_code(code, {"max_lines": 3}).goal_violations == []
+    violation = only_violation(code, {"max_lines": 2})
+    assert violation == Violation(GOAL, "expected at most 2 lines of code to be used, found 3")
+    assert str(violation) == violation.message
+
+
+def test_goal_rules_come_from_the_goal_keys():
+    assert GOAL_RULES == {"max_lines": MaxLinesRule}
+    [rule] = goal_rules({"max_lines": 5, "unknown_goal": 1})
+    assert isinstance(rule, MaxLinesRule) and rule.max_lines == 5
+    assert goal_rules(None) == []
+
+
+def test_goal_violations_are_not_errors():
+    report = analyze_code("import os\nx = 1\ny = 2\n", {"max_lines": 1})
+    assert [violation.category for violation in report.errors] == [SECURITY]
+    assert [violation.category for violation in report.goal_violations] == [GOAL]
+
+
+def test_syntax_error_is_reported_without_running_rules():
+    report = analyze_code("def f(:\n    import os\n", {"max_lines": 0})
+    [violation] = report.violations
+    assert violation.category == SECURITY
+    assert violation.message.startswith("invalid syntax")
+    assert violation.line == 1
+    assert str(violation).endswith(f"(line 1, column {violation.col})")
+    assert report.counted_lines == 1
+
+
+def test_custom_rules_only_see_their_node_types():
+    class NameCounter(Rule):
+        node_types = (ast.Name,)
+
+        def __init__(self):
+            self.seen = []
+
+        def visit(self, node, report):
+            self.seen.append(node.id)
+
+    rule = NameCounter()
+    analyze_code("y = x + z", rules=(rule,))
+    assert sorted(rule.seen) == ["x", "y", "z"]
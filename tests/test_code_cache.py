@@ -0,0 +1,22 @@
+from utils.code_cache import compile_cached, harness_function, prewarm
+from utils.scenarios import registry
+
+
+def test_same_source_is_compiled_once():
+    code = compile_cached("x = 1\n", "<test>")
+    assert compile_cached("x = 1\n", "<test>") is code
+    assert compile_cached("x = 2\n", "<test>") is not code
+    assert compile_cached("x = 1\n", "<other>") is not code
+
+
+def test_harness_functions_do_not_share_state():
+    scenario = next(scenario for scenario in registry if scenario.property_tests)
+    first = harness_function(scenario, "property_tests", "reference_solution", scenario.function_name)
+    second = harness_function(scenario, "property_tests", "reference_solution", scenario.function_name)
+    assert first is not second
+    assert first.__code__ is second.__code__
+    assert first.__globals__ is not second.__globals__
+
+
+def test_prewarm_compiles_every_scenario_source():
+    assert prewarm(registry) >= sum(1 for scenario in registry if scenario.property_tests) * 2
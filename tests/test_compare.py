@@ -0,0 +1,80 @@
+from utils.compare import MAX_PAIRWISE_ITEMS, compare
+
+
+def test_equal_values_have_no_differences():
+    assert compare({"a": [1, 2.0, (3, "x")]}, {"a": [1, 2.0, (3, "x")]}) == []
+
+
+def test_floats_are_equal_within_tolerance():
+    assert compare(0.1 + 0.2, 0.3) == []
+    assert compare(float("nan"), float("nan")) == []
+    assert compare(1.5, 1.0, abs_tol=0.1) == ["result: expected 1.0, got 1.5"]
+    assert compare(1.05, 1.0, rel_tol=0.1) == []
+
+
+def test_huge_int_is_not_close_to_a_float():
+    [difference] = compare(10**400, 1.0)
+    assert difference.startswith("result: expected 1.0, got 1000")
+
+
+def test_nested_difference_has_a_path():
+    assert compare([{"total": 3.25}], [{"total": 3.5}]) == ["[0]['total']: expected 3.5, got 3.25"]
+
+
+def test_types_are_compared():
+    assert compare("1", 1) == ["result: expected int 1, got str '1'"]
+    assert compare((1, 2), [1, 2]) == ["result: expected list [1, 2], got tuple (1, 2)"]
+
+
+def test_missing_and_unexpected_keys():
+    assert compare({"b": 2}, {"a": 1}) == ["result: missing keys 'a'", "result: unexpected keys 'b'"]
+
+
+def test_length_and_items_of_long_sequences():
+    expected = list(range(5000))
+    actual = expected[:4000] + [-1] + expected[4001:]
+    assert compare(actual, expected) == ["[4000]: expected 4000, got -1"]
+    assert compare(expected[:-1], expected) == ["result: expected 5000 items, got 4999"]
+
+
+def test_differences_are_limited():
+    assert len(compare(list(range(100)), list(range(1, 101)), limit=3)) == 3
+
+
+def test_unordered_lists():
+    assert compare([3, 1, 2], [1, 2, 3], unordered=True) == []
+    assert compare([3, 1, 2], [1, 2, 3]) != []
+    assert compare([1, 1, 2], [1, 2, 2], unordered=True) == ["(sorted)[1]: expected 2, got 1"]
+    # Unorderable but hashable items are counted.
+    assert compare([1, "a"], ["a", 2], unordered=True) == ["result: missing items 2", "result: unexpected items 1"]
+    # Unhashable, unorderable items are matched pairwise.
+    assert compare([{"a": 1}, [2]], [[2], {"a": 1}], unordered=True) == []
+    too_many = [{"a": i} for i in range(MAX_PAIRWISE_ITEMS + 1)] + [[0]]
+    assert compare(too_many, too_many[::-1], unordered=True) != []
+
+
+def test_unordered_applies_to_lists_only():
+    assert compare((2, 1), (1, 2), unordered=True) != []
+
+
+def test_sets():
+    assert compare({1, 2}, {2, 3}) == ["result: missing items 3", "result: unexpected items 1"]
+
+
+def test_objects_failing_to_compare_or_print():
+    class Broken:
+        def __eq__(self, other):
+            raise RuntimeError("no")
+
+        def __repr__(self):
+            raise RuntimeError("no")
+
+    [difference] = compare(Broken(), 1)
+    assert difference.startswith("result: expected int 1, got Broken <unprintable Broken")
+
+
+def test_deeply_nested_values():
+    actual, expected = [1], [2]
+    for _ in range(100_000):
+        actual, expected = [actual], [expected]
+    assert compare(actual, expected) == ["result: the values are nested too deeply to compare"]
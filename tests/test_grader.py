@@ -0,0 +1,130 @@
+import pytest
+
+from utils import tracing
+from utils.grader import grade_submission, grading_cache_key, is_cacheable
+from utils.scenarios import registry
+
+REVERSE_LIST = next(scenario for scenario in registry if scenario.title == "Reverse list")
+SOLUTION = "def reverse_list(lst):\n    return lst[::-1]\n"
+
+
+def test_correct_solution_passes():
+    result = grade_submission(REVERSE_LIST, SOLUTION)
+    assert result["status"] == "passed"
+    assert all(test["passed"] for test in result["test_results"])
+
+
+def test_submission_deleting_its_builtins_is_graded():
+    result = grade_submission(REVERSE_LIST, SOLUTION + "del __builtins__\n")
+    assert result["status"] == "passed"
+
+
+def test_submission_clearing_its_globals_is_graded():
+    result = grade_submission(REVERSE_LIST, SOLUTION + "globals().clear()\n")
+    assert result["status"] == "error"
+    assert result["error"] == "Function 'reverse_list' not found."
+
+
+def test_object_failing_to_size_itself_is_graded(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    code = SOLUTION + (
+        "class Unsizable:\n"
+        "    def __sizeof__(self):\n"
+        "        raise RuntimeError('no size')\n"
+        "value = Unsizable()\n"
+    )
+    with tracing.collect() as trace:
+        result = grade_submission(REVERSE_LIST, code)
+    assert result["status"] == "passed"
+    [event] = [span for span in trace.spans if span["name"] == "namespace"]
+    assert event["attrs"] == {"bytes": None}
+
+
+def test_namespace_size_is_traced(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    with tracing.collect() as trace:
+        grade_submission(REVERSE_LIST, SOLUTION + "data = list(range(1000))\n")
+    [event] = [span for span in trace.spans if span["name"] == "namespace"]
+    assert event["attrs"]["bytes"] > 8000
+
+
+def test_namespace_is_not_sized_without_tracing(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", False)
+    monkeypatch.setattr("utils.grader.retained_bytes", lambda value: 1 / 0)
+    assert grade_submission(REVERSE_LIST, SOLUTION)["status"] == "passed"
+
+
+def test_grading_cache_key_changes_with_the_grader_version(monkeypatch):
+    key = grading_cache_key(REVERSE_LIST, SOLUTION)
+    monkeypatch.setattr("utils.grader.GRADER_VERSION", -1)
+    assert grading_cache_key(REVERSE_LIST, SOLUTION) != key
+
+
+FIND_DUPLICATES = next(scenario for scenario in registry if scenario.title == "Find duplicate values efficiently")
+
+
+def test_solution_missing_a_required_performance_goal_fails():
+    code = "def find_duplicates(items):\n    return sorted({item for item in items if items.count(item) > 1})\n"
+    result = grade_submission(FIND_DUPLICATES, code)
+    assert result["status"] == "failed"
+    assert result["performance"]["required"] and not result["performance"]["met"]
+    assert not is_cacheable(result)
+
+
+def test_solution_meeting_a_required_performance_goal_passes():
+    code = (
+        "def find_duplicates(items):\n"
+        "    seen, duplicates = set(), set()\n"
+        "    for item in items:\n"
+        "        if item in seen:\n"
+        "            duplicates.add(item)\n"
+        "        seen.add(item)\n"
+        "    return sorted(duplicates)\n"
+    )
+    result = grade_submission(FIND_DUPLICATES, code)
+    assert result["status"] == "passed"
+    assert is_cacheable(result)
+
+
+def test_peak_memory_is_only_measured_for_memory_goals():
+    assert all(test["peak_bytes"] is None for test in grade_submission(REVERSE_LIST, SOLUTION)["test_results"])
+    scenario = next(scenario for scenario in registry if scenario.title == "Stream the sum of squares")
+    result = grade_submission(scenario, "def sum_of_squares(numbers):\n    return sum(x * x for x in numbers)\n")
+    assert result["status"] == "passed"
+    assert all(test["peak_bytes"] is not None for test in result["test_results"])
+
+
+@pytest.mark.parametrize("code, error", [
+    ("import os\n" + SOLUTION, "Error executing code: Security validation failed: "),
+    ("def print(*args):\n    pass\n" + SOLUTION, "Error executing code: Predefined name override validation failed: "),
+    ("def reverse_list(lst:\n", "Error executing code: "),
+    ("raise RuntimeError('boom')\n", "Error executing code: boom"),
+    ("def reverse_list(lst):\n    raise KeyError('k')\n", "Error executing code: 'k'"),
+    ("def reverse_list(lst):\n    return [0] * 10**12\n", "Error executing code: memory limit exceeded."),
+])
+def test_error_paths(code, error):
+    result = grade_submission(REVERSE_LIST, code)
+    assert result["status"] == "error"
+    assert result["error"].startswith(error)
+
+
+def test_wrong_answer_fails_with_differences_and_output():
+    code = "def reverse_list(lst):\n    print('called with', lst)\n    return lst\n"
+    result = grade_submission(REVERSE_LIST, code)
+    assert result["status"] == "failed"
+    failed = next(test for test in result["test_results"] if not test["passed"])
+    assert failed["differences"]
+    assert failed["output"].startswith("called with")
+
+
+def test_fail_fast_skips_the_remaining_tests():
+    reported = []
+    result = grade_submission(REVERSE_LIST, "def reverse_list(lst):\n    return None\n",
+                              on_test_result=lambda index, test: reported.append(index), fail_fast=True)
+    assert reported == [0]
+    assert result["skipped_tests"] == len(REVERSE_LIST.test_cases) - 1
+
+
+def test_output_of_the_code_is_captured():
+    result = grade_submission(REVERSE_LIST, "print('hello')\n" + SOLUTION)
+    assert result["output"] == {"code": "hello\n"}
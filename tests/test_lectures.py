@@ -0,0 +1,19 @@
+from utils.lectures import build_catalog, split_sections
+
+
+def test_sections_split_at_headings_outside_code_fences():
+    sections = split_sections("Intro\n# One\ntext\n```\n# not a heading\n```\n## Two\n", title="Lecture")
+    assert [(section.heading, section.level) for section in sections] == [("Lecture", 0), ("One", 1), ("Two", 2)]
+    assert sections[1].code == "# not a heading"
+
+
+def test_repeated_headings_get_unique_anchors():
+    body = "# Pitfalls\n# Pitfalls\n# Pitfalls 1\n# Pitfalls\n"
+    anchors = [section.anchor for section in split_sections(body)]
+    assert anchors == ["pitfalls", "pitfalls-1", "pitfalls-1-1", "pitfalls-2"]
+
+
+def test_anchors_are_unique_in_every_lecture():
+    for lecture in build_catalog():
+        anchors = [section.anchor for section in lecture.sections]
+        assert len(set(anchors)) == len(anchors), lecture.id
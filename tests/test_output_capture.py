@@ -0,0 +1,49 @@
+import sys
+
+import pytest
+
+from utils.output_capture import RingBuffer, capture_output
+
+
+def test_short_output_is_kept_whole():
+    buffer = RingBuffer(10)
+    buffer.write("abc")
+    buffer.write("def")
+    assert buffer.getvalue() == "abcdef"
+
+
+def test_oldest_output_is_dropped():
+    buffer = RingBuffer(5)
+    for text in ("abc", "def", "gh"):
+        buffer.write(text)
+    assert buffer.dropped == 3
+    assert buffer.getvalue() == "[… 3 earlier characters truncated …]\ndefgh"
+
+
+def test_write_longer_than_the_limit_keeps_its_tail():
+    buffer = RingBuffer(4)
+    buffer.write("ab")
+    assert buffer.write("0123456789") == 10
+    assert buffer.dropped == 8
+    assert buffer.getvalue().endswith("\n6789")
+
+
+def test_only_text_can_be_written():
+    with pytest.raises(TypeError):
+        RingBuffer(4).write(b"bytes")
+
+
+def test_capture_output_interleaves_stdout_and_stderr():
+    with capture_output(100) as buffer:
+        print("out")
+        print("err", file=sys.stderr)
+        print("out again")
+    assert buffer.getvalue() == "out\nerr\nout again\n"
+
+
+def test_printing_in_a_loop_stays_bounded():
+    with capture_output(20) as buffer:
+        for index in range(100_000):
+            print(index)
+    assert buffer.getvalue().endswith("99998\n99999\n")
+    assert sum(len(chunk) for chunk in buffer._chunks) == 20
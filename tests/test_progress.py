@@ -0,0 +1,121 @@
+import sqlite3
+import time
+
+import pytest
+
+from utils.progress import BrowserProgress, SqliteProgressStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "progress.db")
+
+
+@pytest.fixture
+def store(path):
+    store = SqliteProgressStore(path, flush_interval=3600)
+    yield store
+    store.close()
+
+
+def stored(path):
+    with sqlite3.connect(path) as connection:
+        return dict(connection.execute("SELECT key, value FROM progress WHERE learner_id = 'a'").fetchall())
+
+
+def fail_writes(store, during_write=lambda: None):
+    store._connection.create_function("during_write", 0, during_write)
+    store._connection.execute(
+        "CREATE TRIGGER fail BEFORE INSERT ON progress "
+        "BEGIN SELECT during_write(); SELECT RAISE(ABORT, 'disk full'); END"
+    )
+
+
+def test_writes_are_batched_behind_reads(store, path):
+    store.set("a", "lecture_progress", 3)
+    assert store.load("a") == {"lecture_progress": 3}
+    assert stored(path) == {}
+    store.flush()
+    assert stored(path) == {"lecture_progress": "3"}
+
+
+def test_failed_flush_keeps_values_pending(store, path):
+    store.set("a", "k", 1)
+    store.set("a", "j", 1)
+    fail_writes(store, during_write=lambda: store.set("a", "k", 2))
+    with pytest.raises(sqlite3.IntegrityError):
+        store.flush()
+    assert not store._connection.in_transaction
+    store._connection.execute("DROP TRIGGER fail")
+    store.flush()
+    # The value set while the write was failing is the one kept.
+    assert stored(path) == {"k": "2", "j": "1"}
+
+
+def test_flush_loop_survives_failed_writes(path):
+    store = SqliteProgressStore(path, flush_interval=0.01)
+    try:
+        fail_writes(store)
+        store.set("a", "k", 1)
+        time.sleep(0.1)
+        assert store._flusher.is_alive()
+        store._connection.execute("DROP TRIGGER fail")
+        deadline = time.monotonic() + 5
+        while not stored(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stored(path) == {"k": "1"}
+    finally:
+        store.close()
+
+
+def test_browser_progress_is_imported_once(store, path):
+    assert not store.is_imported("a")
+    store.import_values("a", {"lecture_progress": 2, "practice_finished": None})
+    assert store.is_imported("a")
+    # Imported values are written right away rather than behind.
+    assert stored(path) == {"lecture_progress": "2"}
+
+
+def test_values_survive_reopening(store, path):
+    store.set("a", "k", {"done": [1, 2]})
+    store.close()
+    reopened = SqliteProgressStore(path)
+    try:
+        assert reopened.load("a") == {"k": {"done": [1, 2]}}
+    finally:
+        reopened.close()
+
+
+class FakeLocalStorage:
+    def __init__(self, items):
+        self.items = items
+        self.reads = 0
+
+    def getItem(self, key):
+        self.reads += 1
+        return self.items.get(key)
+
+    def getAll(self):
+        return self.items
+
+    def setItem(self, item_key, value, key=None):
+        self.items[item_key] = value
+
+
+def test_browser_progress_reads_each_key_once():
+    local_storage = FakeLocalStorage({"lecture_progress": 4})
+    progress = BrowserProgress(lambda: local_storage)
+    for _ in range(3):
+        progress.new_run()
+        assert progress.get("lecture_progress") == 4
+        assert progress.get("lecture_sections_read", {}) == {}
+    assert local_storage.reads == 2
+
+
+def test_browser_progress_asks_again_until_the_browser_answered():
+    local_storage = FakeLocalStorage({})
+    progress = BrowserProgress(lambda: local_storage)
+    assert progress.get("lecture_progress") is None
+    local_storage.items["lecture_progress"] = 4
+    progress.new_run()
+    assert progress.get("lecture_progress") == 4
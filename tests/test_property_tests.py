@@ -0,0 +1,29 @@
+from utils.property_tests import generate_cases, run_property_tests
+from utils.scenarios import Scenario
+
+SCENARIO = Scenario.from_dict({
+    "title": "Double it",
+    "difficulty": 1,
+    "description": "Return twice the number.",
+    "function_name": "double",
+    "test_cases": [{"input": [1], "expected_output": 2}],
+    "comparison": {"unordered": True},
+    "property_tests": {
+        "count": 8,
+        "input_generator": "def generate(rng):\n    return (rng.randint(0, 10**6),)",
+        "reference_solution": "def double(n):\n    return 2 * n",
+    },
+})
+
+
+def test_correct_function_passes():
+    result = run_property_tests(SCENARIO, lambda n: 2 * n)
+    assert result == {"passed": True, "checked": 8, "total": 8, "counterexample": None}
+
+
+def test_answers_in_another_order_fail_despite_unordered_comparison():
+    # Every expected answer is given once, but each to the wrong case.
+    answers = iter(reversed([expected for _, expected in generate_cases(SCENARIO)]))
+    result = run_property_tests(SCENARIO, lambda n: next(answers))
+    assert not result["passed"]
+    assert result["checked"] == 0
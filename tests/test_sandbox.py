@@ -0,0 +1,21 @@
+import threading
+
+from utils.sandbox import GradingPool
+from utils.scenarios import registry
+
+REVERSE_LIST = next(scenario for scenario in registry if scenario.title == "Reverse list")
+SOLUTION = "def reverse_list(lst):\n    return lst[::-1]\n"
+
+
+def test_job_cancelled_while_queued_takes_no_worker():
+    pool = GradingPool(size=1)
+    try:
+        busy = pool._idle.get()
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+        result = pool.grade(REVERSE_LIST, SOLUTION, cancel=cancel)
+        assert result["status"] == "cancelled"
+        pool._idle.put(busy)
+        assert pool.grade(REVERSE_LIST, SOLUTION)["status"] == "passed"
+    finally:
+        pool.close()
@@ -0,0 +1,44 @@
+import pytest
+
+from utils.scenarios import DIFFICULTIES, ScenarioRegistry, build_manifest, registry
+
+
+def test_position_matches_the_filtered_list():
+    for difficulty in (None, *DIFFICULTIES):
+        filtered = registry.filter(difficulty=difficulty)
+        for index, scenario in enumerate(filtered):
+            assert registry.position(scenario.id, difficulty) == index
+
+
+def test_position_of_a_scenario_outside_the_filter():
+    scenario = registry.filter(difficulty=1)[0]
+    assert registry.position(scenario.id, 2) is None
+    assert registry.position("no-such-scenario") is None
+
+
+def write_scenario(directory, **fields):
+    data = {
+        "title": "Add one",
+        "difficulty": 1,
+        "description": "Return n + 1.",
+        "function_name": "add_one",
+        "test_cases": [{"input": [1], "expected_output": 2}],
+        **fields,
+    }
+    (directory / "add-one.py").write_text(repr(data))
+
+
+def test_scenario_files_load_when_they_match_the_manifest(tmp_path):
+    write_scenario(tmp_path)
+    build_manifest(str(tmp_path))
+    [scenario] = ScenarioRegistry.from_directory(str(tmp_path))
+    assert scenario.function_name == "add_one"
+
+
+def test_scenario_file_edited_after_building_the_manifest_fails_to_load(tmp_path):
+    write_scenario(tmp_path)
+    build_manifest(str(tmp_path))
+    write_scenario(tmp_path, test_cases=[{"input": [1], "expected_output": 3}])
+    [scenario] = ScenarioRegistry.from_directory(str(tmp_path))
+    with pytest.raises(ValueError, match="does not match the manifest"):
+        scenario.test_cases
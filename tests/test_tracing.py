@@ -0,0 +1,89 @@
+import threading
+
+import pytest
+
+from utils import tracing
+
+
+def test_trace_collected_on_another_thread_is_merged(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    collected = []
+
+    def run():
+        with tracing.collect() as trace:
+            with tracing.span("grading.pool"):
+                pass
+        collected.append(trace)
+
+    with tracing.collect() as current:
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        # The thread starts without a trace, so its spans only arrive when merged.
+        assert current.spans == []
+        assert tracing.add_trace(collected[0])
+    [span] = current.spans
+    assert span["name"] == "grading.pool"
+    assert span["start_ms"] >= 0
+
+
+def test_trace_is_not_merged_without_a_current_trace(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    with tracing.collect() as trace:
+        tracing.event("worker_memory", rss_bytes=1)
+    assert not tracing.add_trace(trace)
+
+
+@pytest.fixture
+def written(monkeypatch):
+    traces = []
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    monkeypatch.setattr(tracing, "_write", lambda trace, **extra: traces.append((trace, extra)))
+    return traces
+
+
+def test_fragment_rerun_records_its_spans(written):
+    state = {}
+
+    @tracing.fragment_run("practice.workspace", state)
+    def fragment():
+        with tracing.span("grading.submit"):
+            pass
+
+    # A fragment rerun runs on a fresh thread without the page's trace.
+    thread = threading.Thread(target=fragment)
+    thread.start()
+    thread.join()
+    [(trace, extra)] = written
+    assert trace.name == "practice.workspace"
+    assert [span["name"] for span in trace.spans] == ["grading.submit"]
+    assert extra == {"fragment": True, "session": state[tracing.SESSION_KEY]}
+
+
+def test_fragment_in_a_page_run_records_into_the_page_trace(written):
+    state = {}
+    trace = tracing.begin_rerun("practice", state)
+    with tracing.fragment_run("practice.workspace", state):
+        with tracing.span("render.editor"):
+            pass
+    tracing.end_rerun(trace)
+    [(page_trace, _)] = written
+    assert page_trace is trace
+    assert [span["name"] for span in trace.spans] == ["render.editor"]
+
+
+def test_interrupted_fragment_rerun_is_written(written):
+    with pytest.raises(RuntimeError):
+        with tracing.fragment_run("practice.results"):
+            raise RuntimeError("st.rerun()")
+    [(_, extra)] = written
+    assert extra == {"fragment": True, "interrupted": True}
+    assert tracing._current.get() is None
+
+
+def test_percentile():
+    samples = [5, 1, 4, 2, 3]
+    assert tracing.percentile(samples, 0) == 1
+    assert tracing.percentile(samples, 0.5) == 3
+    assert tracing.percentile(samples, 0.95) == 5
+    assert tracing.percentile([7], 0.99) == 7
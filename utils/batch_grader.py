@@ -0,0 +1,166 @@
+"""Grade stored submissions from the command line.
+
+    python -m utils.batch_grader submissions.jsonl
+    python -m utils.batch_grader exported_progress/ --workers 8 --timeout 5 --output report.jsonl
+
+A JSONL input holds one ``{"scenario": ..., "code": ..., "learner": ...}`` object per
+line, where ``scenario`` is a scenario id or title. A directory is scanned for
+``*.jsonl`` files in that format and for ``*.json`` files holding the
+``practice_finished`` map of the Practice page (scenario title -> code); the file
+name is used as the learner. One JSON line is written per submission as soon as it
+is graded, followed by a summary on stderr.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils.cache import LRUCache
+from utils.grader import grading_cache_key, is_cacheable
+from utils.sandbox import DEFAULT_TIMEOUT, GradingPool
+from utils.scenarios import registry
+
+
+def _read_jsonl(path):
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, start=1):
+            if line.strip():
+                submission = json.loads(line)
+                submission.setdefault("source", f"{path}:{line_number}")
+                yield submission
+
+
+def _read_progress_export(path):
+    with open(path, 'r') as f:
+        data = json.load(f)
+    learner = os.path.splitext(os.path.basename(path))[0]
+    if "code" in data and "scenario" in data:
+        yield {"learner": learner, "source": path, **data}
+        return
+    for title, code in data.items():
+        yield {"learner": learner, "scenario": title, "code": code, "source": path}
+
+
+def read_submissions(path):
+    if not os.path.isdir(path):
+        yield from _read_jsonl(path)
+        return
+    for name in sorted(os.listdir(path)):
+        file_path = os.path.join(path, name)
+        if name.endswith(".jsonl"):
+            yield from _read_jsonl(file_path)
+        elif name.endswith(".json"):
+            yield from _read_progress_export(file_path)
+
+
+def resolve_scenario(name):
+    return registry.get(name) or registry.get_by_title(name)
+
+
+def summarize(submission, scenario, result, full=False):
+    report = {
+        "source": submission.get("source"),
+        "learner": submission.get("learner"),
+        "scenario": scenario.id,
+        "status": result["status"],
+        "passed": sum(test["passed"] for test in result["test_results"]),
+        "failed": sum(not test["passed"] for test in result["test_results"]),
+        "error": result["error"],
+        "optional_goal_met": result["optional_goal_met"],
+        "performance_met": result["performance"]["met"] if result.get("performance") else None,
+        "property_tests_passed": result["property_tests"]["passed"] if result.get("property_tests") else None,
+        "memory_met": result["memory"]["met"] if result.get("memory") else None,
+    }
+    if full:
+        report["result"] = result
+    return report
+
+
+class BatchGrader:
+    """Feeds submissions to a GradingPool, keeping at most a few jobs per worker in flight.
+
+    Identical (scenario, code) pairs are graded once and answered from a cache,
+    which is common when a cohort converges on the same solution.
+    """
+
+    def __init__(self, pool, timeout=None, cache_size=100_000, full=False):
+        self.pool = pool
+        self.timeout = timeout
+        self.full = full
+        self.cache = LRUCache(maxsize=cache_size)
+
+    def _grade(self, submission):
+        scenario = resolve_scenario(submission.get("scenario", ""))
+        if scenario is None:
+            return {
+                "source": submission.get("source"),
+                "learner": submission.get("learner"),
+                "scenario": submission.get("scenario"),
+                "status": "unknown_scenario",
+                "error": f"Unknown scenario '{submission.get('scenario')}'",
+            }
+        code = submission.get("code") or ""
+        key = grading_cache_key(scenario, code)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.pool.grade(scenario, code, timeout=self.timeout)
+            if is_cacheable(result):
+                self.cache.set(key, result)
+        return summarize(submission, scenario, result, self.full)
+
+    def run(self, submissions):
+        """Yield one report per submission in completion order."""
+        max_in_flight = self.pool.size * 2
+        with ThreadPoolExecutor(max_workers=self.pool.size) as executor:
+            in_flight = set()
+            for submission in submissions:
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                in_flight.add(executor.submit(self._grade, submission))
+            for future in wait(in_flight).done:
+                yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade stored Practice submissions in parallel.")
+    parser.add_argument("input", help="JSONL file of submissions or a directory of exports")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of grading processes")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="wall-clock seconds per submission")
+    parser.add_argument("--output", help="write the JSONL report here instead of stdout")
+    parser.add_argument("--full", action="store_true", help="include every test case result in the report")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    statuses = Counter()
+    pool = GradingPool(size=args.workers, timeout=args.timeout)
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        grader = BatchGrader(pool, timeout=args.timeout, full=args.full)
+        for report in grader.run(read_submissions(args.input)):
+            statuses[report["status"]] += 1
+            output.write(json.dumps(report, default=str) + "\n")
+            output.flush()
+    finally:
+        pool.close()
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - started
+    total = sum(statuses.values())
+    summary = {
+        "submissions": total,
+        "seconds": round(elapsed, 3),
+        "per_second": round(total / elapsed, 1) if elapsed else None,
+        "statuses": dict(statuses),
+        "cache": grader.cache.stats(),
+    }
+    print(json.dumps(summary), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""A single prebuilt file holding the lectures and the scenario catalog.
+
+    python -m utils.bundle build [path]    # writes build/content.bundle by default
+
+Setting ``FASTSKILLING_BUNDLE`` to the path of a bundle makes the app load all
+content from it instead of scanning, reading and parsing ``materials/`` and
+``scenarios/``: the file is memory-mapped once per process and every entry is
+unpickled on first use from its slice, found through an offsets index. The
+bundle is a deployment artifact; rebuild it whenever the content changes, as
+the app does not watch the directories while a bundle is in use.
+
+Layout: ``MAGIC``, the index length as an 8 byte little-endian integer, the index
+as JSON, then the pickled entries back to back. The index holds the version (a
+hash of all entries), the lecture list, the scenario manifest and
+``[offset, length]`` per entry relative to the end of the index.
+"""
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLE_ENV = "FASTSKILLING_BUNDLE"
+DEFAULT_BUNDLE_PATH = os.path.join(ROOT_DIR, "build", "content.bundle")
+MAGIC = b"FSKBUNDLE1\n"
+_HEADER = struct.Struct("<Q")
+
+
+class ContentBundle:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a content bundle")
+        start = len(MAGIC) + _HEADER.size
+        (index_length,) = _HEADER.unpack_from(self._mmap, len(MAGIC))
+        self.index = json.loads(self._mmap[start:start + index_length])
+        self._data_start = start + index_length
+        self.version = self.index["version"]
+
+    @property
+    def lectures(self):
+        """``(filename, mtime_ns)`` of every lecture, in catalog order."""
+        return tuple((filename, mtime_ns) for filename, mtime_ns in self.index["lectures"])
+
+    @property
+    def manifest(self):
+        return self.index["manifest"]
+
+    def load(self, name):
+        offset, length = self.index["entries"][name]
+        start = self._data_start + offset
+        return pickle.loads(self._mmap[start:start + length])
+
+
+def build_bundle(path=DEFAULT_BUNDLE_PATH):
+    """Validate and pack the lectures and scenarios into ``path``; returns the version."""
+    from utils.lectures import MATERIALS_DIR, _scan, lecture_name, split_sections
+    from utils.scenarios import MANIFEST_FILE, SCENARIOS_DIR, Scenario, read_scenario_file
+
+    payloads = {}
+    lectures = _scan(MATERIALS_DIR)
+    for filename, _ in lectures:
+        with open(os.path.join(MATERIALS_DIR, filename), 'r') as f:
+            body = f.read()
+        payloads[f"lectures/{filename}"] = (body, split_sections(body, lecture_name(filename)))
+    with open(os.path.join(SCENARIOS_DIR, MANIFEST_FILE), 'r') as f:
+        manifest = json.load(f)
+    for entry in manifest:
+        data = read_scenario_file(os.path.join(SCENARIOS_DIR, entry["file"]))
+        Scenario.from_dict(data)
+        payloads[f"scenarios/{entry['file']}"] = data
+
+    blobs, entries, offset = [], {}, 0
+    digest = hashlib.sha256()
+    for name, payload in payloads.items():
+        blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        entries[name] = [offset, len(blob)]
+        offset += len(blob)
+        digest.update(name.encode() + b"\0" + blob)
+        blobs.append(blob)
+    index = json.dumps({
+        "version": digest.hexdigest()[:16],
+        "lectures": [list(lecture) for lecture in lectures],
+        "manifest": manifest,
+        "entries": entries,
+    }).encode()
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(len(index)))
+        f.write(index)
+        for blob in blobs:
+            f.write(blob)
+    # Running processes keep their mapping of the old file.
+    os.replace(tmp_path, path)
+    return digest.hexdigest()[:16]
+
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+
+def get_bundle():
+    """Return the process-wide bundle named by ``FASTSKILLING_BUNDLE``, or None when unset."""
+    global _bundle
+    path = os.environ.get(BUNDLE_ENV)
+    if not path:
+        return None
+    with _bundle_lock:
+        if _bundle is None:
+            _bundle = ContentBundle(path)
+        return _bundle
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["build"] or len(sys.argv) > 3:
+        sys.exit("usage: python -m utils.bundle build [path]")
+    target = sys.argv[2] if len(sys.argv) == 3 else DEFAULT_BUNDLE_PATH
+    print(f"Wrote content bundle {build_bundle(target)} to {target}")
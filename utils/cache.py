@@ -0,0 +1,278 @@
+"""In-process and on-disk caches.
+
+:class:`LRUCache` is a bounded in-memory mapping. :class:`DiskCache` stores
+pickled entries as files in a directory that several app processes on the same
+machine can share, e.g. replicas behind a load balancer, so that work done by
+one of them is not repeated by the others. :class:`TieredCache` puts the former
+in front of the latter; :func:`shared_cache` builds one per named namespace under
+``FASTSKILLING_CACHE_DIR`` (``.cache`` by default).
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:  # file locks are only available on POSIX systems
+    fcntl = None
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR_ENV = "FASTSKILLING_CACHE_DIR"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# The directory size is checked after this many writes by one process.
+EVICTION_CHECK_INTERVAL = 100
+# Eviction removes the least recently used entries until the size is below this share of the limit.
+EVICTION_TARGET = 0.9
+
+_MISSING = object()
+
+
+def cache_dir():
+    return os.environ.get(CACHE_DIR_ENV, os.path.join(ROOT_DIR, ".cache"))
+
+
+class LRUCache:
+    """Thread-safe, size-bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        self.file = open(self.path, 'a')
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if fcntl is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        self.file.close()
+        return False
+
+
+class DiskCache:
+    """Pickled entries stored one file per key, shared by every process using ``directory``.
+
+    Files are written to a temporary name and renamed into place, so readers never
+    see partial entries and need no lock. Entries expire ``ttl`` seconds after they
+    were written. Once the directory grows beyond ``max_bytes`` the entries read
+    least recently are removed under an exclusive file lock, so that concurrent
+    processes do not evict at the same time.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, ttl=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+        self._lock_path = os.path.join(directory, ".lock")
+        self._counter_lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".pickle")
+
+    def _count(self, name, amount=1):
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                expires_at, stored_key, value = pickle.load(f)
+        except Exception:
+            # Missing, partial or unreadable entries, e.g. pickled by another version
+            # of the code whose classes no longer load, are all just misses.
+            self._count("misses")
+            return default
+        if stored_key != key or (expires_at is not None and expires_at < time.time()):
+            if stored_key == key:
+                self._remove(path)
+            self._count("misses")
+            return default
+        try:
+            # The modification time doubles as the last access time for eviction.
+            os.utime(path)
+        except OSError:
+            pass
+        self._count("hits")
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        expires_at = time.time() + self.ttl if self.ttl else None
+        data = pickle.dumps((expires_at, key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._counter_lock:
+            self._writes += 1
+            check = self._writes % EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as files:
+                    for entry in files:
+                        if entry.name.endswith(".pickle"):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Remove the least recently read entries while the directory exceeds ``max_bytes``."""
+        with _FileLock(self._lock_path):
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes * EVICTION_TARGET:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+        self._count("evictions", removed)
+        return removed
+
+    def clear(self):
+        with _FileLock(self._lock_path):
+            for _, _, path in self._entries():
+                self._remove(path)
+        with self._counter_lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        entries = self._entries()
+        with self._counter_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class TieredCache:
+    """An in-process LRUCache in front of a shared DiskCache; disk hits are promoted."""
+
+    def __init__(self, memory, disk):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key, default=None):
+        value = self.memory.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.disk.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def __len__(self):
+        return len(self.memory)
+
+    def stats(self):
+        """Memory statistics at the top level, the disk tier's under ``disk``.
+
+        Overall hits count lookups answered by either tier; misses are those that
+        reached the disk and found nothing.
+        """
+        memory = self.memory.stats()
+        disk = self.disk.stats()
+        hits = memory["hits"] + disk["hits"]
+        lookups = hits + disk["misses"]
+        return {
+            **memory,
+            "hits": hits,
+            "misses": disk["misses"],
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_hits": memory["hits"],
+            "disk": disk,
+        }
+
+
+def shared_cache(name, maxsize=1024, max_bytes=DEFAULT_MAX_BYTES, ttl=None):
+    """Return a TieredCache whose disk tier lives in ``<cache dir>/<name>``."""
+    return TieredCache(LRUCache(maxsize=maxsize), DiskCache(os.path.join(cache_dir(), name), max_bytes, ttl))
@@ -0,0 +1,154 @@
+import ast
+import builtins
+from collections import Counter
+from dataclasses import dataclass, field
+
+SECURITY = "security"
+BUILTINS = "builtins"
+GOAL = "goal"
+
+DANGEROUS_NODES = (ast.Import, ast.ImportFrom, ast.Global, ast.Nonlocal, ast.AsyncWith)
+DANGEROUS_NAMES = frozenset({"exec", "eval", "open", "compile", "input", "__import__", "os", "sys", "subprocess"})
+BUILTIN_NAMES = frozenset(dir(builtins))
+
+
+@dataclass(frozen=True)
+class Violation:
+    category: str
+    message: str
+    line: int | None = None
+    col: int | None = None
+
+    def __str__(self):
+        if self.line is None:
+            return self.message
+        return f"{self.message} (line {self.line}, column {self.col})"
+
+
+@dataclass
+class CodeReport:
+    violations: list[Violation] = field(default_factory=list)
+    counted_lines: int = 0
+    node_counts: Counter = field(default_factory=Counter)
+
+    def by_category(self, category):
+        return [violation for violation in self.violations if violation.category == category]
+
+    @property
+    def errors(self):
+        return [violation for violation in self.violations if violation.category != GOAL]
+
+    @property
+    def goal_violations(self):
+        return self.by_category(GOAL)
+
+
+def _violation(category, message, node=None):
+    if node is None:
+        return Violation(category, message)
+    return Violation(category, message, node.lineno, node.col_offset)
+
+
+class Rule:
+    """A check run by :func:`analyze_code`.
+
+    ``node_types`` selects the nodes handed to :meth:`visit` during the single tree
+    walk; :meth:`finish` runs once afterwards for checks that need the whole report.
+    """
+
+    node_types = ()
+
+    def visit(self, node, report):
+        pass
+
+    def finish(self, report):
+        pass
+
+
+class DangerousStatementRule(Rule):
+    node_types = DANGEROUS_NODES
+
+    def visit(self, node, report):
+        report.violations.append(_violation(SECURITY, "Code contains potentially dangerous statements.", node))
+
+
+class DangerousNameRule(Rule):
+    node_types = (ast.Name, ast.Call)
+
+    def visit(self, node, report):
+        if isinstance(node, ast.Name):
+            if node.id in DANGEROUS_NAMES:
+                report.violations.append(_violation(SECURITY, f"Use of '{node.id}' is not allowed.", node))
+        elif isinstance(node.func, ast.Attribute) and node.func.attr in DANGEROUS_NAMES:
+            report.violations.append(_violation(SECURITY, f"Use of '{node.func.attr}' is not allowed.", node))
+
+
+class BuiltinOverrideRule(Rule):
+    node_types = (ast.FunctionDef, ast.Assign)
+
+    def visit(self, node, report):
+        if isinstance(node, ast.FunctionDef):
+            names = [node.name]
+        else:
+            names = [target.id for target in node.targets if isinstance(target, ast.Name)]
+        for name in names:
+            if name in BUILTIN_NAMES:
+                report.violations.append(_violation(BUILTINS, f"Overriding built-in name '{name}' is not allowed.", node))
+
+
+class MaxLinesRule(Rule):
+    def __init__(self, max_lines):
+        self.max_lines = max_lines
+
+    def finish(self, report):
+        if report.counted_lines > self.max_lines:
+            report.violations.append(Violation(
+                GOAL,
+                f"expected at most {self.max_lines} lines of code to be used, found {report.counted_lines}",
+            ))
+
+
+DEFAULT_RULES = (DangerousStatementRule(), DangerousNameRule(), BuiltinOverrideRule())
+
+# Maps a key of a scenario's ``optional_code_goal`` to the rule enforcing it.
+GOAL_RULES = {
+    "max_lines": MaxLinesRule,
+}
+
+
+def goal_rules(goal):
+    return [GOAL_RULES[key](value) for key, value in (goal or {}).items() if key in GOAL_RULES]
+
+
+def count_lines(code):
+    # Blank lines, comments and function signatures do not count towards line goals.
+    count = 0
+    for line in code.splitlines():
+        stripped = line.strip()
+        if stripped and not stripped.startswith("#") and not stripped.startswith("def "):
+            count += 1
+    return count
+
+
+def analyze_code(code, goal=None, rules=DEFAULT_RULES):
+    """Parse ``code`` once and run every rule over the tree in a single walk."""
+    report = CodeReport(counted_lines=count_lines(code))
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        report.violations.append(Violation(SECURITY, f"invalid syntax: {e.msg}", e.lineno, e.offset))
+        return report
+    rules = [*rules, *goal_rules(goal)]
+    dispatch = {}
+    for rule in rules:
+        for node_type in rule.node_types:
+            dispatch.setdefault(node_type, []).append(rule)
+    node_counts = report.node_counts
+    for node in ast.walk(tree):
+        node_type = type(node)
+        node_counts[node_type.__name__] += 1
+        for rule in dispatch.get(node_type, ()):
+            rule.visit(node, report)
+    for rule in rules:
+        rule.finish(report)
+    return report
@@ -0,0 +1,56 @@
+"""Process-wide cache of compiled scenario code.
+
+Setup code and the harness code of the goals (input generators and reference
+solutions) are compiled once per process and reused as code objects, keyed by
+a hash of their source, so regrading a popular scenario pays no compile cost.
+Grading workers call :func:`prewarm` when they start.
+"""
+import hashlib
+
+from utils.cache import LRUCache
+
+SETUP_FILENAME = "<test setup>"
+# The goal fields holding harness code, by the scenario attribute of the goal.
+HARNESS_FIELDS = {
+    "performance_goal": ("input_generator", "reference_solution"),
+    "memory_goal": ("input_generator",),
+    "property_tests": ("input_generator", "reference_solution"),
+}
+
+_code_objects = LRUCache(maxsize=1024)
+
+
+def compile_cached(source, filename):
+    key = (filename, hashlib.sha256(source.encode()).digest())
+    code = _code_objects.get(key)
+    if code is None:
+        code = compile(source, filename, "exec")
+        _code_objects.set(key, code)
+    return code
+
+
+def harness_function(scenario, goal, field, function_name):
+    """Run the ``field`` code of a scenario goal in a fresh namespace and return ``function_name`` from it."""
+    namespace = {"__name__": f"__{goal}__"}
+    exec(compile_cached(getattr(scenario, goal)[field], f"<{goal}.{field}>"), namespace)
+    return namespace[function_name]
+
+
+def prewarm(scenarios):
+    """Compile the setup and harness code of ``scenarios``; returns how many sources were compiled."""
+    count = 0
+    for scenario in scenarios:
+        if scenario.test_setup_code:
+            compile_cached(scenario.test_setup_code, SETUP_FILENAME)
+            count += 1
+        for goal, fields in HARNESS_FIELDS.items():
+            spec = getattr(scenario, goal) or {}
+            for field in fields:
+                if field in spec:
+                    compile_cached(spec[field], f"<{goal}.{field}>")
+                    count += 1
+    return count
+
+
+def stats():
+    return _code_objects.stats()
@@ -0,0 +1,185 @@
+"""Comparison of test outputs with the expected values.
+
+:func:`compare` walks both values together and returns a short list of the
+differences it found, as readable lines with the path to each, e.g.
+``[2]['total']: expected 3.5, got 3.25``; an empty list means equal. The walk
+stops after ``limit`` differences, so a wrong answer on a large output costs no
+more than a right one. Floats are equal within a tolerance, and a scenario may
+ask for lists to be compared regardless of order with its ``comparison``
+options::
+
+    "comparison": {"rel_tol": 1e-6, "abs_tol": 1e-9, "unordered": True}
+
+Only plain Python values are handled: expected outputs are literals from the
+scenario files, and submissions cannot import libraries such as NumPy.
+"""
+import collections
+import math
+
+COMPARISON_OPTIONS = ("rel_tol", "abs_tol", "unordered")
+REL_TOL = 1e-9
+ABS_TOL = 1e-12
+MAX_DIFFERENCES = 5
+MAX_REPR_CHARS = 80
+MAX_LISTED_KEYS = 5
+# Long sequences are compared a slice at a time with ==; only unequal slices are walked.
+CHUNK_SIZE = 1024
+# Unordered lists of unhashable, unsortable items are matched pairwise up to this length.
+MAX_PAIRWISE_ITEMS = 300
+
+
+def _short(value):
+    try:
+        text = repr(value)
+    except Exception as e:
+        text = f"<unprintable {type(value).__name__}: {e}>"
+    if len(text) <= MAX_REPR_CHARS:
+        return text
+    return f"{text[:MAX_REPR_CHARS]}… ({len(text) - MAX_REPR_CHARS} more characters)"
+
+
+def _keys(keys):
+    keys = list(keys)
+    listed = ", ".join(_short(key) for key in keys[:MAX_LISTED_KEYS])
+    return listed if len(keys) <= MAX_LISTED_KEYS else f"{listed} and {len(keys) - MAX_LISTED_KEYS} more"
+
+
+def _equal(actual, expected):
+    try:
+        return bool(actual == expected)
+    except Exception:
+        # Learner objects may raise from __eq__ or return something without a truth value.
+        return False
+
+
+class _Comparison:
+    def __init__(self, rel_tol, abs_tol, unordered, limit):
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+        self.unordered = unordered
+        self.limit = limit
+        self.differences = []
+
+    @property
+    def done(self):
+        return len(self.differences) >= self.limit
+
+    def differ(self, path, message):
+        self.differences.append(f"{path or 'result'}: {message}")
+
+    def mismatch(self, path, actual, expected):
+        self.differ(path, f"expected {_short(expected)}, got {_short(actual)}")
+
+    def walk(self, actual, expected, path=""):
+        if actual is expected:
+            return
+        if _equal(actual, expected):
+            # The common case, decided by == in C; the walk below only explains differences.
+            return
+        elif isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+            self.walk_number(actual, expected, path)
+        elif isinstance(expected, dict) and isinstance(actual, dict):
+            self.walk_dict(actual, expected, path)
+        elif isinstance(expected, (list, tuple)) and type(actual) is type(expected):
+            if self.unordered and isinstance(expected, list):
+                self.walk_unordered(actual, expected, path)
+            else:
+                self.walk_sequence(actual, expected, path)
+        elif isinstance(expected, (set, frozenset)) and isinstance(actual, (set, frozenset)):
+            self.walk_set(actual, expected, path)
+        elif not (isinstance(actual, type(expected)) or isinstance(expected, type(actual))):
+            self.differ(path, f"expected {type(expected).__name__} {_short(expected)}, "
+                              f"got {type(actual).__name__} {_short(actual)}")
+        else:
+            self.mismatch(path, actual, expected)
+
+    def walk_number(self, actual, expected, path):
+        if isinstance(actual, float) or isinstance(expected, float):
+            try:
+                if math.isnan(actual) and math.isnan(expected):
+                    return
+                if math.isclose(actual, expected, rel_tol=self.rel_tol, abs_tol=self.abs_tol):
+                    return
+            except OverflowError:
+                # An int too large for a float cannot be close to one.
+                pass
+        self.mismatch(path, actual, expected)
+
+    def walk_dict(self, actual, expected, path):
+        missing = [key for key in expected if key not in actual]
+        extra = [key for key in actual if key not in expected]
+        if missing:
+            self.differ(path, f"missing keys {_keys(missing)}")
+        if extra and not self.done:
+            self.differ(path, f"unexpected keys {_keys(extra)}")
+        for key, value in expected.items():
+            if self.done:
+                return
+            if key in actual:
+                self.walk(actual[key], value, f"{path}[{_short(key)}]")
+
+    def walk_sequence(self, actual, expected, path):
+        if len(actual) != len(expected):
+            self.differ(path, f"expected {len(expected)} items, got {len(actual)}")
+        for start in range(0, min(len(actual), len(expected)), CHUNK_SIZE):
+            end = start + CHUNK_SIZE
+            if _equal(actual[start:end], expected[start:end]):
+                continue
+            for index in range(start, min(end, len(actual), len(expected))):
+                if self.done:
+                    return
+                self.walk(actual[index], expected[index], f"{path}[{index}]")
+
+    def walk_unordered(self, actual, expected, path):
+        if len(actual) != len(expected):
+            self.differ(path, f"expected {len(expected)} items in any order, got {len(actual)}")
+            return
+        try:
+            actual, expected = sorted(actual), sorted(expected)
+        except TypeError:
+            # Unorderable items: fall back to counting, which needs hashable ones.
+            try:
+                missing = list((collections.Counter(expected) - collections.Counter(actual)).elements())
+                extra = list((collections.Counter(actual) - collections.Counter(expected)).elements())
+            except TypeError:
+                if len(expected) > MAX_PAIRWISE_ITEMS:
+                    self.differ(path, f"cannot compare more than {MAX_PAIRWISE_ITEMS} unsortable items in any order")
+                    return
+                missing, extra = self.match_pairwise(actual, expected)
+            if missing:
+                self.differ(path, f"missing items {_keys(missing)}")
+            if extra and not self.done:
+                self.differ(path, f"unexpected items {_keys(extra)}")
+            return
+        self.walk_sequence(actual, expected, f"{path}(sorted)")
+
+    def match_pairwise(self, actual, expected):
+        unmatched = list(actual)
+        missing = []
+        for item in expected:
+            for index, candidate in enumerate(unmatched):
+                if not compare(candidate, item, self.rel_tol, self.abs_tol, self.unordered, limit=1):
+                    del unmatched[index]
+                    break
+            else:
+                missing.append(item)
+        return missing, unmatched
+
+    def walk_set(self, actual, expected, path):
+        if actual == expected:
+            return
+        missing, extra = expected - actual, actual - expected
+        if missing:
+            self.differ(path, f"missing items {_keys(missing)}")
+        if extra and not self.done:
+            self.differ(path, f"unexpected items {_keys(extra)}")
+
+
+def compare(actual, expected, rel_tol=REL_TOL, abs_tol=ABS_TOL, unordered=False, limit=MAX_DIFFERENCES):
+    """Return up to ``limit`` lines describing how ``actual`` differs from ``expected``."""
+    comparison = _Comparison(rel_tol, abs_tol, unordered, limit)
+    try:
+        comparison.walk(actual, expected)
+    except RecursionError:
+        comparison.differ("", "the values are nested too deeply to compare")
+    return comparison.differences[:limit]
@@ -0,0 +1,226 @@
+import builtins
+import contextlib
+import copy
+import hashlib
+
+from utils import tracing
+from utils.code_analysis import BUILTINS, SECURITY, analyze_code
+from utils.compare import compare
+from utils.memory import check_memory, peak_memory, retained_bytes
+from utils.output_capture import MAX_TEST_OUTPUT_CHARS, capture_output
+from utils.performance import check_performance
+from utils.property_tests import run_property_tests
+from utils.scenarios import ScenarioTestCase
+
+# Part of every grading cache key. Bump it whenever a change to the grading or to
+# the shape of the result would make results cached by the previous code wrong.
+GRADER_VERSION = 1
+# Only deterministic outcomes are worth remembering; timeouts and crashes depend on
+# the load of the machine at the time of grading.
+CACHEABLE_STATUSES = ("passed", "failed", "error")
+# Inputs and outputs are shown to the learner as text; very large values are cut
+# so they cannot blow up the result message or the page.
+MAX_VALUE_CHARS = 500
+GRADED_SCENARIO_FIELDS = ("function_name", "test_setup_code", "test_cases", "optional_code_goal",
+                          "performance_goal", "memory_goal", "property_tests", "comparison")
+# Taken before any learner code runs in the process, so a submission that patches
+# the builtins module cannot change what later submissions see.
+_BUILTINS = dict(builtins.__dict__)
+
+
+def _canonical(value):
+    # repr() of a set depends on string hash randomisation, so sets are sorted to
+    # keep the fingerprint stable across processes.
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(_canonical(item) for item in value)) + "}"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{_canonical(k)}: {_canonical(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__ + "(" + ", ".join(_canonical(item) for item in value) + ")"
+    if isinstance(value, ScenarioTestCase):
+        return _canonical(value.to_dict())
+    return repr(value)
+
+
+def is_cacheable(result):
+    """Whether a result is deterministic enough to remember."""
+    performance = result["performance"]
+    # A required timing that failed may be down to the load at the time, like a timeout.
+    too_slow = performance is not None and performance["required"] and not performance["met"]
+    return result["status"] in CACHEABLE_STATUSES and not too_slow
+
+
+def scenario_version(scenario):
+    if scenario.version is not None:
+        return str(scenario.version)
+    graded = {field: getattr(scenario, field) for field in GRADED_SCENARIO_FIELDS}
+    return hashlib.sha256(_canonical(graded).encode()).hexdigest()[:16]
+
+
+def grading_cache_key(scenario, code):
+    return (GRADER_VERSION, scenario.title, scenario_version(scenario), hashlib.sha256(code.encode()).hexdigest())
+
+
+def preview(value, limit=MAX_VALUE_CHARS):
+    text = str(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… ({len(text) - limit} more characters)"
+
+
+def new_result(status="passed", error=None):
+    return {
+        "status": status,
+        "error": error,
+        "test_results": [],
+        "optional_goal_met": None,
+        "optional_goal_violations": [],
+        "counted_lines": None,
+        "performance": None,
+        "memory": None,
+        "property_tests": None,
+        "skipped_tests": 0,
+        "output": {},
+    }
+
+
+@contextlib.contextmanager
+def _captured(result, phase):
+    """Capture what a grading phase prints into ``result["output"][phase]``, even when it raises."""
+    with capture_output() as buffer:
+        try:
+            yield buffer
+        finally:
+            text = buffer.getvalue()
+            if text:
+                result["output"][phase] = result["output"].get(phase, "") + text
+
+
+def new_namespace():
+    """Return a fresh namespace for one submission, with its own copy of the builtins."""
+    return {"__name__": "__main__", "__builtins__": dict(_BUILTINS)}
+
+
+def grade_submission(scenario, code, on_test_result=None, fail_fast=False):
+    """Run the learner's code against a scenario and return a plain, picklable result dict.
+
+    Values are rendered with ``str`` before they leave this function so the result
+    can cross a process boundary even when the learner returns arbitrary objects.
+    ``on_test_result(index, test_result)`` is called as soon as each test case has
+    run; with ``fail_fast`` the remaining test cases are skipped after a failure.
+    The submission runs in its own namespace, which is cleared afterwards; with
+    tracing enabled its size is recorded as a "namespace" event. What it prints
+    is captured, bounded, per phase into ``output`` and per test case into the
+    test result.
+    """
+    result = new_result()
+    namespace = new_namespace()
+    try:
+        with tracing.span("validate"):
+            report = analyze_code(code, scenario.optional_code_goal)
+        result["counted_lines"] = report.counted_lines
+        security_violations = report.by_category(SECURITY)
+        if security_violations:
+            raise ValueError(f"Security validation failed: {security_violations[0]}")
+        builtins_violations = report.by_category(BUILTINS)
+        if builtins_violations:
+            raise ValueError(f"Predefined name override validation failed: {builtins_violations[0]}")
+        with tracing.span("exec_user_code"), _captured(result, "code"):
+            exec(code, namespace)
+        if scenario.test_setup_code:
+            try:
+                with tracing.span("exec_setup_code"), _captured(result, "setup"):
+                    exec(scenario.setup_code_object, namespace)
+            except Exception as e:
+                raise ValueError(f"Test setup code execution failed: {e}")
+        function_name = scenario.function_name
+        if function_name not in namespace:
+            result.update(status="error", error=f"Function '{function_name}' not found.")
+            return result
+        function = namespace[function_name]
+        for index, test_case in enumerate(scenario.test_cases):
+            # Learner code may mutate its arguments; the scenario itself must stay intact.
+            input_data = copy.deepcopy(test_case.input_data)
+            # tracemalloc slows allocation-heavy code down several times, so memory is
+            # only traced for scenarios that have a budget; see utils.memory.
+            memory = peak_memory() if scenario.memory_goal else None
+            with (tracing.span("test_case", index=index), memory or contextlib.nullcontext(),
+                  capture_output(MAX_TEST_OUTPUT_CHARS) as test_output):
+                if isinstance(input_data, dict):
+                    output = function(**input_data)
+                else:
+                    output = function(*input_data)
+            expected_output = test_case.expected_output
+            with tracing.span("compare", index=index):
+                differences = compare(output, expected_output, **scenario.comparison)
+            test_result = {
+                "input": preview(test_case.input_data),
+                "expected_output": preview(expected_output),
+                "result": preview(output),
+                "passed": not differences,
+                "differences": differences,
+                "peak_bytes": memory.peak_bytes if memory else None,
+                "output": test_output.getvalue(),
+            }
+            result["test_results"].append(test_result)
+            if on_test_result is not None:
+                on_test_result(index, test_result)
+            if fail_fast and not test_result["passed"]:
+                result["skipped_tests"] = len(scenario.test_cases) - index - 1
+                break
+        if any(not test["passed"] for test in result["test_results"]):
+            result["status"] = "failed"
+        elif scenario.property_tests:
+            with tracing.span("property_tests"), _captured(result, "checks"):
+                property_tests = run_property_tests(scenario, function)
+            if not property_tests["passed"]:
+                result["status"] = "failed"
+                property_tests["counterexample"] = {
+                    name: preview(value) for name, value in property_tests["counterexample"].items()
+                }
+            result["property_tests"] = property_tests
+        if result["status"] == "passed":
+            if scenario.optional_code_goal:
+                result["optional_goal_violations"] = [str(violation) for violation in report.goal_violations]
+                result["optional_goal_met"] = not result["optional_goal_violations"]
+            if scenario.memory_goal:
+                # Unlike the optional goal, the memory budget is part of passing.
+                with tracing.span("memory"), _captured(result, "checks"):
+                    result["memory"] = check_memory(scenario, function, result["test_results"])
+                if not result["memory"]["met"]:
+                    result["status"] = "failed"
+        if result["status"] == "passed" and scenario.performance_goal:
+            # Only correct solutions are timed; unless the goal is required, the report
+            # is advisory like the optional goal.
+            required = bool(scenario.performance_goal.get("required"))
+            with tracing.span("performance"):
+                try:
+                    with _captured(result, "checks"):
+                        result["performance"] = check_performance(scenario, function)
+                except MemoryError:
+                    raise
+                except Exception as e:
+                    result["performance"] = {"met": False, "required": required,
+                                             "message": f"Performance check failed: {e}", "timings": []}
+            if required and not result["performance"]["met"]:
+                result["status"] = "failed"
+    except MemoryError:
+        result.update(status="error", error="Error executing code: memory limit exceeded.")
+    except Exception as e:
+        result.update(status="error", error=f"Error executing code: {e}")
+    finally:
+        # The submission may have deleted this itself, e.g. with globals().clear().
+        namespace.pop("__builtins__", None)
+        if tracing.ENABLED:
+            # Sizing walks everything the submission kept, so it is only paid for when traced.
+            try:
+                namespace_bytes = retained_bytes(namespace)
+            except Exception:
+                # Learner objects can raise from __sizeof__ or while being walked.
+                namespace_bytes = None
+            tracing.event("namespace", bytes=namespace_bytes)
+        with tracing.span("release_namespace"):
+            # Breaks the cycles between the learner's functions and their globals, so
+            # everything is freed now rather than by the next garbage collection.
+            namespace.clear()
+    return result
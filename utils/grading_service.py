@@ -0,0 +1,130 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from utils import tracing
+from utils.cache import shared_cache
+
+# utils.grader and utils.sandbox are imported where they are used: Home and the
+# lecture page only need cancel_session_job and should not pay for the grader.
+
+JOB_KEY = "grading_job"
+# Number of grading worker processes; one per CPU when unset.
+GRADING_WORKERS_ENV = "FASTSKILLING_GRADING_WORKERS"
+# Cached results are keyed by the scenario version, so they never go stale; the TTL
+# only keeps the shared directory from holding on to one-off submissions forever.
+GRADING_CACHE_TTL = 7 * 24 * 3600
+
+
+@st.cache_resource
+def get_grading_pool():
+    from utils.sandbox import GradingPool
+
+    return GradingPool(size=int(os.environ.get(GRADING_WORKERS_ENV, 0)) or None)
+
+
+@st.cache_resource
+def get_grading_cache():
+    return shared_cache("grading", maxsize=2048, ttl=GRADING_CACHE_TTL)
+
+
+@st.cache_resource
+def get_grading_executor():
+    # One thread per worker: more would only queue up waiting for a free worker.
+    return ThreadPoolExecutor(max_workers=get_grading_pool().size, thread_name_prefix="grading")
+
+
+def _cached_result(cache, key, on_test_result):
+    with tracing.span("grading.cache_lookup"):
+        result = cache.get(key)
+    if result is not None and on_test_result is not None:
+        for index, test_result in enumerate(result["test_results"]):
+            on_test_result(index, test_result)
+    return result
+
+
+def _grade(pool, cache, key, scenario, code, on_test_result, fail_fast, cancel=None):
+    """Grade on the worker pool and remember deterministic results; the caller has missed the cache."""
+    from utils.grader import is_cacheable
+
+    with tracing.span("grading.pool", scenario=scenario.id) as pool_span:
+        result = pool.grade(scenario, code, on_test_result=on_test_result, fail_fast=fail_fast, cancel=cancel)
+    tracing.add_spans(result.get("spans"), offset_ms=pool_span.start_ms, prefix="worker.")
+    if is_cacheable(result):
+        cache.set(key, result)
+    return result
+
+
+class GradingJob:
+    """A submission graded on a background thread; pages poll it instead of waiting.
+
+    ``test_results`` fills up while the worker runs and ``result`` is set once it
+    is done. The background thread records its spans in a trace of its own, which
+    the page merges into its rerun with :meth:`report_spans`.
+    """
+
+    def __init__(self, scenario, code, fail_fast):
+        self.scenario_id = scenario.id
+        self.key = (scenario.id, code, fail_fast)
+        self.test_results = []
+        self.result = None
+        self.trace = None
+        self.cancelled = threading.Event()
+        self._spans_reported = False
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def report_spans(self):
+        """Add the spans of the finished job to the current rerun's trace, once."""
+        if self.done and not self._spans_reported:
+            self._spans_reported = tracing.add_trace(self.trace)
+
+    def _on_test_result(self, index, test_result):
+        self.test_results.append(test_result)
+
+    def _run(self, pool, cache, cache_key, scenario, code, fail_fast):
+        from utils.grader import new_result
+
+        # Pages only trace their own thread, so the job collects its spans itself.
+        with tracing.collect() as trace:
+            try:
+                if self.cancelled.is_set():
+                    result = new_result("cancelled", "Grading was cancelled.")
+                else:
+                    result = _grade(pool, cache, cache_key, scenario, code, self._on_test_result, fail_fast,
+                                    cancel=self.cancelled)
+            except Exception as e:
+                result = new_result("error", f"Grading failed: {e}")
+        # The trace is complete before the job reports being done.
+        self.trace = trace
+        self.result = result
+
+
+def submit(scenario, code, fail_fast=False):
+    """Start grading in the background and return the job; cache hits finish right away."""
+    from utils.grader import grading_cache_key
+
+    job = GradingJob(scenario, code, fail_fast)
+    cache = get_grading_cache()
+    cache_key = (*grading_cache_key(scenario, code), fail_fast)
+    result = _cached_result(cache, cache_key, job._on_test_result)
+    if result is not None:
+        job.result = result
+        return job
+    # The cached resources are resolved here, on the script thread, and handed over.
+    get_grading_executor().submit(job._run, get_grading_pool(), cache, cache_key, scenario, code, fail_fast)
+    return job
+
+
+def cancel_session_job(state):
+    """Cancel and forget the grading job of a session, e.g. when the learner leaves the page."""
+    job = state.pop(JOB_KEY, None)
+    if job is not None:
+        job.cancel()
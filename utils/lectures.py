@@ -0,0 +1,241 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+from utils.bundle import get_bundle
+from utils.cache import shared_cache
+
+MATERIALS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "materials")
+# How often, at most, the materials directory is checked for changes.
+CHECK_INTERVAL = 5.0
+# Parsed lectures are keyed by their content, so every edit adds an entry; these
+# bound the shared directory instead of letting old versions pile up forever.
+PARSED_CACHE_TTL = 30 * 24 * 3600
+PARSED_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Part of the parsed-lecture cache keys; bump it when split_sections changes its output.
+PARSER_VERSION = 1
+
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+
+@dataclass(frozen=True)
+class Section:
+    heading: str
+    level: int
+    anchor: str
+    body: str
+    prose: str
+    code: str
+
+
+@dataclass(frozen=True)
+class Lecture:
+    filename: str
+    id: str
+    index: int
+    name: str
+    body: str
+    mtime_ns: int
+    previous_id: str | None
+    next_id: str | None
+    sections: tuple[Section, ...] = ()
+
+
+def lecture_id(filename):
+    return filename[4:-3]
+
+
+def lecture_name(filename):
+    return filename.split('.')[0].split('_', maxsplit=1)[1].replace('_', ' ')
+
+
+def heading_anchor(heading):
+    # Mirrors the anchors Streamlit generates for markdown headings.
+    return "-".join(part for part in re.split(r"[\W_]+", heading.lower()) if part)
+
+
+def split_sections(body, title=""):
+    """Split markdown into sections at headings, ignoring ``#`` lines inside code fences.
+
+    Text before the first heading becomes a level 0 section named ``title``.
+    Anchors are unique within the lecture: a repeated heading gets a ``-1``,
+    ``-2``, … suffix, as the page keys the sections by anchor.
+    """
+    sections = []
+    anchors = set()
+    heading, level = title, 0
+    lines, prose, code = [], [], []
+    fence = None
+
+    def close():
+        if lines and (level or any(line.strip() for line in lines)):
+            base = anchor = heading_anchor(heading)
+            suffix = 0
+            while anchor in anchors:
+                suffix += 1
+                anchor = f"{base}-{suffix}"
+            anchors.add(anchor)
+            sections.append(Section(
+                heading=heading,
+                level=level,
+                anchor=anchor,
+                body="\n".join(lines),
+                prose="\n".join(prose),
+                code="\n".join(code),
+            ))
+
+    for line in body.splitlines():
+        fence_match = FENCE_PATTERN.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker == fence:
+                fence = None
+            lines.append(line)
+            continue
+        if fence is None:
+            heading_match = HEADING_PATTERN.match(line)
+            if heading_match:
+                close()
+                heading, level = heading_match.group(2), len(heading_match.group(1))
+                lines, prose, code = [line], [], []
+                continue
+        lines.append(line)
+        (code if fence is not None else prose).append(line)
+    close()
+    return tuple(sections)
+
+
+class LectureCatalog:
+    """Immutable snapshot of the materials directory with O(1) lookups by lecture id."""
+
+    def __init__(self, lectures, signature):
+        self.lectures = lectures
+        self.signature = signature
+        self.by_id = {lecture.id: lecture for lecture in lectures}
+
+    def __len__(self):
+        return len(self.lectures)
+
+    def __iter__(self):
+        return iter(self.lectures)
+
+    @property
+    def first(self):
+        return self.lectures[0]
+
+    @property
+    def last(self):
+        return self.lectures[-1]
+
+    def get(self, lecture_id, default=None):
+        return self.by_id.get(lecture_id, default)
+
+
+def _scan(materials_dir):
+    with os.scandir(materials_dir) as entries:
+        return tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns)
+            for entry in entries
+            if entry.is_file() and entry.name.endswith(".md")
+        ))
+
+
+def _parse(filename, body, cache):
+    if cache is None:
+        return split_sections(body, lecture_name(filename))
+    key = (PARSER_VERSION, filename, hashlib.sha256(body.encode()).hexdigest())
+    sections = cache.get(key)
+    if sections is None:
+        sections = split_sections(body, lecture_name(filename))
+        cache.set(key, sections)
+    return sections
+
+
+def _link(signature, contents):
+    ids = [lecture_id(filename) for filename, _ in signature]
+    lectures = []
+    for index, (filename, mtime_ns) in enumerate(signature):
+        body, sections = contents(filename, mtime_ns)
+        lectures.append(Lecture(
+            filename=filename,
+            id=ids[index],
+            index=index,
+            name=lecture_name(filename),
+            body=body,
+            mtime_ns=mtime_ns,
+            previous_id=ids[index - 1] if index > 0 else None,
+            next_id=ids[index + 1] if index + 1 < len(ids) else None,
+            sections=sections,
+        ))
+    return LectureCatalog(lectures, signature)
+
+
+def build_catalog(materials_dir=MATERIALS_DIR, signature=None, previous=None, cache=None):
+    """Read the lectures, reusing bodies and sections of unchanged files from ``previous``.
+
+    Changed files are parsed through ``cache`` when given, keyed by their content.
+    """
+    signature = signature if signature is not None else _scan(materials_dir)
+    reusable = {}
+    if previous is not None:
+        reusable = {(lecture.filename, lecture.mtime_ns): (lecture.body, lecture.sections) for lecture in previous}
+
+    def contents(filename, mtime_ns):
+        if (filename, mtime_ns) in reusable:
+            return reusable[(filename, mtime_ns)]
+        with open(os.path.join(materials_dir, filename), 'r') as f:
+            body = f.read()
+        return body, _parse(filename, body, cache)
+
+    return _link(signature, contents)
+
+
+def catalog_from_bundle(bundle):
+    """Build the catalog from a prebuilt content bundle; nothing is parsed."""
+    return _link(bundle.lectures, lambda filename, _: bundle.load(f"lectures/{filename}"))
+
+
+_catalog = None
+_last_check = 0.0
+_lock = threading.Lock()
+_parsed_cache = None
+
+
+def _get_parsed_cache():
+    global _parsed_cache
+    if _parsed_cache is None:
+        _parsed_cache = shared_cache("lectures", maxsize=256, max_bytes=PARSED_CACHE_MAX_BYTES,
+                                     ttl=PARSED_CACHE_TTL)
+    return _parsed_cache
+
+
+def get_catalog(materials_dir=MATERIALS_DIR):
+    """Return the process-wide catalog, rebuilding it when a lecture file changed.
+
+    With a content bundle configured the catalog is loaded from it once instead.
+    """
+    global _catalog, _last_check
+    bundle = get_bundle()
+    if bundle is not None:
+        # A bundle is immutable; there is nothing to watch.
+        with _lock:
+            if _catalog is None:
+                _catalog = catalog_from_bundle(bundle)
+        return _catalog
+    now = time.monotonic()
+    if _catalog is not None and now - _last_check < CHECK_INTERVAL:
+        return _catalog
+    with _lock:
+        if _catalog is None or now - _last_check >= CHECK_INTERVAL:
+            signature = _scan(materials_dir)
+            if _catalog is None or signature != _catalog.signature:
+                _catalog = build_catalog(materials_dir, signature, _catalog, _get_parsed_cache())
+            _last_check = now
+    return _catalog
@@ -0,0 +1,136 @@
+"""Peak memory measurement for grading and the ``memory_goal`` of scenarios.
+
+A goal looks like::
+
+    "memory_goal": {
+        "max_peak_bytes": 1_000_000,
+        "input_generator": "def generate():\n    return ((x for x in range(1_000_000)),)",
+    }
+
+``generate()`` returns the positional arguments of a stress input that is only
+used for this check. Without a generator the budget applies to the largest peak
+of the scenario's own test cases. Peaks are measured with tracemalloc, so they
+cover Python allocations made during the call, not the inputs built before it.
+
+Only scenarios with a memory goal get a peak per test case. tracemalloc slows
+allocation-heavy code down several times, which every other scenario would pay
+for in grading time, in its timeouts and in the timings of its performance
+goal; their test results carry ``peak_bytes`` None and the page shows no peak.
+
+:func:`retained_bytes` and :func:`current_rss_bytes` account for memory that
+stays alive: what a submission's namespace or a session holds on to, and the
+resident size of a process.
+"""
+import collections
+import gc
+import itertools
+import os
+import sys
+import tracemalloc
+import types
+
+from utils.code_cache import harness_function
+
+MEMORY_GOAL_FIELDS = ("max_peak_bytes",)
+# Walking an object costs about 2µs, so sizing stops after this many objects and
+# the result is a lower bound; large containers still count their own size.
+RETAINED_OBJECTS_LIMIT = 20_000
+# Shared code and library state, counted where referenced but never followed.
+_LEAF_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.CodeType)
+_DONE = object()
+
+
+class peak_memory:
+    """Context manager measuring the peak traced allocation inside the block.
+
+    The result is in ``peak_bytes`` after the block; an already running tracemalloc
+    session, e.g. a benchmark, is reused and left running.
+    """
+
+    def __enter__(self):
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        self.peak_bytes = 0
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _, peak = tracemalloc.get_traced_memory()
+        self.peak_bytes = max(0, peak - self.baseline)
+        if self.started:
+            tracemalloc.stop()
+        return False
+
+
+def format_bytes(size):
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def retained_bytes(root, limit=RETAINED_OBJECTS_LIMIT):
+    """Approximate the bytes reachable from ``root``, counting every object once."""
+    seen = set()
+    total = 0
+    pending = [iter((root,))]
+    while pending and len(seen) < limit:
+        try:
+            obj = next(pending[-1], _DONE)
+        except RuntimeError:
+            # A container changed size while walking it, e.g. another thread's session state.
+            obj = _DONE
+        if obj is _DONE:
+            pending.pop()
+            continue
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj, 0)
+        if isinstance(obj, _LEAF_TYPES):
+            continue
+        # Containers are walked lazily; gc.get_referents would copy a huge list first.
+        if isinstance(obj, dict):
+            pending.append(itertools.chain.from_iterable(obj.items()))
+        elif isinstance(obj, (list, tuple, set, frozenset, collections.deque)):
+            pending.append(iter(obj))
+        elif gc.is_tracked(obj):
+            # Untracked objects, e.g. numbers and strings, cannot refer to anything.
+            pending.append(iter(gc.get_referents(obj)))
+    return total
+
+
+def current_rss_bytes():
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        # Peak rather than current RSS, in KiB on Linux; the best there is without /proc.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def check_memory(scenario, function, test_results):
+    """Return a report dict on whether ``function`` stays within the scenario's memory budget."""
+    goal = scenario.memory_goal
+    budget = goal["max_peak_bytes"]
+    if "input_generator" in goal:
+        args = tuple(harness_function(scenario, "memory_goal", "input_generator", "generate")())
+        with peak_memory() as measured:
+            function(*args)
+        peak = measured.peak_bytes
+        subject = "on the large input"
+    else:
+        peak = max((test["peak_bytes"] or 0 for test in test_results), default=0)
+        subject = "across the test cases"
+    met = peak <= budget
+    verb = "within" if met else "over"
+    return {
+        "met": met,
+        "peak_bytes": peak,
+        "max_peak_bytes": budget,
+        "message": f"Peak memory {subject} was {format_bytes(peak)}, {verb} the budget of {format_bytes(budget)}.",
+    }
@@ -0,0 +1,64 @@
+"""Bounded capture of what learner code prints.
+
+Output is kept in a ring buffer: once the limit is reached the oldest text is
+dropped, so a print in a tight loop costs a bounded amount of memory and the last
+lines, usually the interesting ones, survive. Sizes are in characters.
+"""
+import collections
+import contextlib
+import io
+
+MAX_PHASE_CHARS = 8192
+MAX_TEST_OUTPUT_CHARS = 2048
+
+
+class RingBuffer(io.TextIOBase):
+    """A writable text stream keeping only the last ``limit`` characters."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.dropped = 0
+        self._chunks = collections.deque()
+        self._size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        written = len(text)
+        if written >= self.limit:
+            self.dropped += self._size + written - self.limit
+            self._chunks.clear()
+            self._chunks.append(text[written - self.limit:])
+            self._size = self.limit
+            return written
+        self._chunks.append(text)
+        self._size += written
+        while self._size > self.limit:
+            excess = self._size - self.limit
+            first = self._chunks[0]
+            if len(first) <= excess:
+                self._chunks.popleft()
+                cut = len(first)
+            else:
+                self._chunks[0] = first[excess:]
+                cut = excess
+            self._size -= cut
+            self.dropped += cut
+        return written
+
+    def getvalue(self):
+        text = "".join(self._chunks)
+        if self.dropped:
+            return f"[… {self.dropped} earlier characters truncated …]\n{text}"
+        return text
+
+
+@contextlib.contextmanager
+def capture_output(limit=MAX_PHASE_CHARS):
+    """Redirect stdout and stderr, interleaved, into a :class:`RingBuffer` for the block."""
+    buffer = RingBuffer(limit)
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        yield buffer
@@ -0,0 +1,30 @@
+"""Paginated sidebar lists: only the visible slice of a long list is rendered."""
+import math
+
+import streamlit as st
+
+PAGE_SIZE = 20
+
+
+def paginate(items, key, current_index=None, page_size=PAGE_SIZE):
+    """Render pager controls when there is more than one page and return the visible items.
+
+    The page jumps to ``current_index`` whenever that changes, so the selected item
+    is visible after navigating to it by other means.
+    """
+    items = tuple(items)
+    pages = max(1, math.ceil(len(items) / page_size))
+    state = st.session_state.setdefault(f"_{key}_pager", {"page": 0, "current": None})
+    if current_index is not None and current_index != state["current"]:
+        state["page"] = current_index // page_size
+        state["current"] = current_index
+    state["page"] = min(state["page"], pages - 1)
+    if pages > 1:
+        previous_col, label_col, next_col = st.columns([1, 2, 1])
+        previous_col.button("◀", key=f"{key}_previous_page", use_container_width=True, disabled=state["page"] == 0,
+                            on_click=lambda: state.update(page=state["page"] - 1))
+        label_col.caption(f"Page {state['page'] + 1} of {pages}")
+        next_col.button("▶", key=f"{key}_next_page", use_container_width=True, disabled=state["page"] == pages - 1,
+                        on_click=lambda: state.update(page=state["page"] + 1))
+    start = state["page"] * page_size
+    return items[start:start + page_size]
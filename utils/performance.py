@@ -0,0 +1,170 @@
+"""Empirical time complexity checks for scenarios with a ``performance_goal``.
+
+A goal looks like::
+
+    "performance_goal": {
+        "complexity": "O(n)",
+        "max_seconds": 0.05,
+        "sizes": [1000, 2000, 4000, 8000, 16000],
+        "input_generator": "def generate(n):\n    return (list(range(n)),)",
+        "reference_solution": "def find_duplicates(items):\n    ...",
+        "required": True,
+    }
+
+``generate(n)`` returns the positional arguments for an input of size ``n``. The
+submission is timed on every size as the minimum of several repeats, the growth
+class is read off the slope of the timings in log space, and the reference
+solution is timed the same way for comparison. ``max_seconds`` applies to the
+largest size. The report is advisory unless the goal is ``required``, in which
+case a submission that misses it fails.
+"""
+import copy
+import math
+import time
+
+from utils.code_cache import harness_function
+
+# Ordered from the cheapest to the most expensive growth class.
+COMPLEXITY_CLASSES = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n),
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log2(n),
+    "O(n²)": lambda n: float(n) ** 2,
+    "O(n³)": lambda n: float(n) ** 3,
+}
+COMPLEXITY_ALIASES = {"O(n^2)": "O(n²)", "O(n**2)": "O(n²)", "O(n^3)": "O(n³)", "O(n**3)": "O(n³)"}
+DEFAULT_SIZES = (1000, 2000, 4000, 8000, 16000)
+DEFAULT_REPEATS = 5
+# A repeat is made of enough calls to take at least this long, so that very fast
+# calls are not lost in timer resolution.
+MIN_REPEAT_SECONDS = 0.002
+# Larger sizes are skipped once a single call gets this slow, and slow sizes get
+# fewer repeats, so that timing a quadratic solution stays within the grading timeout.
+MAX_CALL_SECONDS = 0.5
+MAX_SIZE_SECONDS = 0.3
+MIN_POINTS = 3
+# Classes are told apart by how steeply the time grows with n. Neighbouring classes
+# such as O(n) and O(n log n) differ by ~0.1 in slope over the default sizes, far
+# below timing noise, so a class is accepted while the measured slope is at most
+# this much steeper than the class' own.
+SLOPE_TOLERANCE = 0.3
+
+_reference_cache = {}
+
+
+def normalize_complexity(name):
+    name = COMPLEXITY_ALIASES.get(name, name)
+    if name not in COMPLEXITY_CLASSES:
+        raise ValueError(f"Unknown complexity class '{name}', expected one of {list(COMPLEXITY_CLASSES)}")
+    return name
+
+
+def _time_call(function, args, number):
+    started = time.perf_counter()
+    for _ in range(number):
+        function(*args)
+    return (time.perf_counter() - started) / number
+
+
+def measure(function, generate, sizes=DEFAULT_SIZES, repeats=DEFAULT_REPEATS):
+    """Return ``[(n, seconds)]`` using the minimum of ``repeats`` timings per size.
+
+    The minimum is the least noisy estimate: interference from other processes only
+    ever makes a run slower.
+    """
+    measurements = []
+    for n in sizes:
+        args = tuple(generate(n))
+        single = _time_call(function, copy.deepcopy(args), 1)
+        if single > MAX_CALL_SECONDS:
+            measurements.append((n, single))
+            break
+        number = max(1, math.ceil(MIN_REPEAT_SECONDS / max(single, 1e-9)))
+        best = single if number == 1 else math.inf
+        started = time.perf_counter()
+        for _ in range(repeats):
+            best = min(best, _time_call(function, copy.deepcopy(args), number))
+            if time.perf_counter() - started > MAX_SIZE_SECONDS:
+                break
+        measurements.append((n, best))
+    return measurements
+
+
+def _slope(points):
+    # Least squares slope of log(y) over log(n).
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(max(y, 1e-12)) for _, y in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+
+
+def fit_complexity(measurements):
+    """Return the cheapest growth class that explains the measured log-log slope."""
+    if len(measurements) < 2:
+        return None
+    measured = _slope(measurements)
+    sizes = [n for n, _ in measurements]
+    for name, model in COMPLEXITY_CLASSES.items():
+        if measured <= _slope([(n, model(n)) for n in sizes]) + SLOPE_TOLERANCE:
+            return name
+    return name
+
+
+def _rank(name):
+    return list(COMPLEXITY_CLASSES).index(name)
+
+
+def _reference_measurements(scenario, goal, generate, sizes, repeats):
+    key = (scenario.id, scenario.version)
+    if key not in _reference_cache:
+        reference = harness_function(scenario, "performance_goal", "reference_solution", scenario.function_name)
+        _reference_cache[key] = measure(reference, generate, sizes, repeats)
+    return _reference_cache[key]
+
+
+def check_performance(scenario, function):
+    """Time ``function`` against the scenario's performance goal and return a report dict."""
+    goal = scenario.performance_goal
+    target = normalize_complexity(goal["complexity"])
+    sizes = goal.get("sizes", DEFAULT_SIZES)
+    repeats = goal.get("repeats", DEFAULT_REPEATS)
+    generate = harness_function(scenario, "performance_goal", "input_generator", "generate")
+
+    measured = measure(function, generate, sizes, repeats)
+    completed = len(measured) == len(sizes) and measured[-1][1] <= MAX_CALL_SECONDS
+    complexity = fit_complexity(measured) if len(measured) >= MIN_POINTS else None
+    reference = None
+    if "reference_solution" in goal:
+        reference = _reference_measurements(scenario, goal, generate, sizes, repeats)
+
+    within_budget = completed and ("max_seconds" not in goal or measured[-1][1] <= goal["max_seconds"])
+    meets_complexity = complexity is not None and _rank(complexity) <= _rank(target)
+    if complexity is None:
+        message = f"Your solution is too slow to measure: a single call took {measured[-1][1] * 1000:.0f} ms at n={measured[-1][0]}, target {target}."
+    elif not meets_complexity:
+        message = f"Your solution is {complexity}, target {target}."
+    elif not within_budget:
+        message = f"Your solution is {complexity} as targeted, but took {measured[-1][1] * 1000:.2f} ms at n={measured[-1][0]}, budget {goal['max_seconds'] * 1000:.2f} ms."
+    else:
+        message = f"Your solution is {complexity}, target {target}: {measured[-1][1] * 1000:.2f} ms at n={measured[-1][0]}."
+
+    return {
+        "target": target,
+        "complexity": complexity,
+        "meets_complexity": meets_complexity,
+        "within_budget": within_budget,
+        "met": meets_complexity and within_budget,
+        "required": bool(goal.get("required")),
+        "message": message,
+        "timings": [
+            {
+                "n": n,
+                "seconds": seconds,
+                "reference_seconds": reference[index][1] if reference and index < len(reference) else None,
+            }
+            for index, (n, seconds) in enumerate(measured)
+        ],
+        "reference_complexity": fit_complexity(reference) if reference and len(reference) >= MIN_POINTS else None,
+    }
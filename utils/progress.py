@@ -0,0 +1,258 @@
+"""Learner progress storage for the pages.
+
+By default progress lives in the browser's LocalStorage, as it always has, but
+every key is read at most once per session. Setting ``FASTSKILLING_PROGRESS_DB``
+to a file path switches to a server-side SQLite store: the browser then only
+holds a learner id, progress is read once per session from an in-process cache
+and writes are batched to the database in the background. Existing browser
+progress is imported the first time a learner shows up.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+
+from utils.cache import LRUCache
+
+# streamlit is imported where the session is needed, so the stores work without it.
+
+PROGRESS_DB_ENV = "FASTSKILLING_PROGRESS_DB"
+LEARNER_ID_KEY = "learner_id"
+# Browser keys that are copied into the server-side store on first use.
+IMPORTED_KEYS = ("lecture_progress", "lecture_finished", "practice_finished")
+SESSION_KEY = "_progress_store"
+FLUSH_INTERVAL = 0.5
+FLUSH_BATCH_SIZE = 200
+
+_MISSING = object()
+_logger = logging.getLogger("fastskilling.progress")
+
+
+class BrowserProgress:
+    """Progress in LocalStorage, with each key read from the component once per session.
+
+    Until the browser has answered, the component holds no items at all, and
+    caching a key's absence then would hide the learner's real progress. Once it
+    holds any item, a missing key really is unset and that is cached as well. The
+    component is only created in runs that actually need to talk to the browser,
+    and at most once per run.
+    """
+
+    def __init__(self, local_storage_factory, local_storage=None):
+        self.local_storage_factory = local_storage_factory
+        self.values = {}
+        self._local_storage = local_storage
+
+    def new_run(self):
+        self._local_storage = None
+
+    @property
+    def local_storage(self):
+        if self._local_storage is None:
+            self._local_storage = self.local_storage_factory()
+        return self._local_storage
+
+    def get(self, key, default=None):
+        value = self.values.get(key, _MISSING)
+        if value is _MISSING:
+            local_storage = self.local_storage
+            value = local_storage.getItem(key)
+            if value is not None or local_storage.getAll():
+                self.values[key] = value
+        return default if value is None else value
+
+    def set(self, key, value):
+        self.values[key] = value
+        self.local_storage.setItem(key, value, key=f"set_{key}")
+
+
+class SqliteProgressStore:
+    """Process-wide SQLite (WAL) store with a read cache and write-behind batching."""
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, cache_size=10_000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS progress ("
+            "learner_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (learner_id, key))"
+        )
+        self._connection.execute("CREATE TABLE IF NOT EXISTS imported (learner_id TEXT PRIMARY KEY)")
+        self._db_lock = threading.Lock()
+        # Held from taking the pending values until they are written, so that an older
+        # batch can never be committed after a newer one.
+        self._flush_lock = threading.Lock()
+        self._cache = LRUCache(maxsize=cache_size)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="progress-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def load(self, learner_id):
+        """Return all progress of a learner; the database is hit once per learner."""
+        values = self._cache.get(learner_id)
+        if values is None:
+            with self._db_lock:
+                rows = self._connection.execute(
+                    "SELECT key, value FROM progress WHERE learner_id = ?", (learner_id,)
+                ).fetchall()
+            values = {key: json.loads(value) for key, value in rows}
+            with self._pending_lock:
+                values.update({key: value for (learner, key), value in self._pending.items() if learner == learner_id})
+            self._cache.set(learner_id, values)
+        return values
+
+    def set(self, learner_id, key, value):
+        self.load(learner_id)[key] = value
+        with self._pending_lock:
+            self._pending[(learner_id, key)] = value
+            size = len(self._pending)
+        if size >= FLUSH_BATCH_SIZE:
+            self._wake.set()
+
+    def is_imported(self, learner_id):
+        with self._db_lock:
+            return self._connection.execute(
+                "SELECT 1 FROM imported WHERE learner_id = ?", (learner_id,)
+            ).fetchone() is not None
+
+    def import_values(self, learner_id, values):
+        for key, value in values.items():
+            if value is not None:
+                self.set(learner_id, key, value)
+        self.flush()
+        with self._db_lock:
+            self._connection.execute("INSERT OR IGNORE INTO imported (learner_id) VALUES (?)", (learner_id,))
+
+    def flush(self):
+        """Write the pending values; on failure they stay pending for the next flush."""
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            rows = [(learner_id, key, json.dumps(value)) for (learner_id, key), value in pending.items()]
+            try:
+                with self._db_lock:
+                    self._connection.execute("BEGIN")
+                    try:
+                        self._connection.executemany(
+                            "INSERT INTO progress (learner_id, key, value) VALUES (?, ?, ?) "
+                            "ON CONFLICT (learner_id, key) DO UPDATE SET value = excluded.value",
+                            rows,
+                        )
+                        self._connection.execute("COMMIT")
+                    except BaseException:
+                        if self._connection.in_transaction:
+                            self._connection.execute("ROLLBACK")
+                        raise
+            except BaseException:
+                with self._pending_lock:
+                    # Values set while the write was failing are newer and win.
+                    for item, value in pending.items():
+                        self._pending.setdefault(item, value)
+                raise
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # E.g. a locked or full database; the values are retried on the next round.
+                _logger.exception("Writing progress to %s failed", self.path)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+        self._connection.close()
+
+
+class ServerProgress:
+    """Per-session view on the SQLite store with the same interface as BrowserProgress."""
+
+    def __init__(self, store, learner_id):
+        self.store = store
+        self.learner_id = learner_id
+
+    def new_run(self):
+        pass
+
+    def get(self, key, default=None):
+        value = self.store.load(self.learner_id).get(key)
+        return default if value is None else value
+
+    def set(self, key, value):
+        self.store.set(self.learner_id, key, value)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_sqlite_store(path):
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SqliteProgressStore(path)
+        return _store
+
+
+def _local_storage():
+    from streamlit_local_storage import LocalStorage
+    return LocalStorage()
+
+
+def _server_progress(path, local_storage):
+    import streamlit as st
+
+    learner_id = local_storage.getItem(LEARNER_ID_KEY)
+    if learner_id is None:
+        # The first run of a session happens before the browser answered; only
+        # a second run without an id means this really is a new learner.
+        if not st.session_state.get("_learner_id_checked"):
+            st.session_state["_learner_id_checked"] = True
+            return None
+        learner_id = uuid.uuid4().hex
+        local_storage.setItem(LEARNER_ID_KEY, learner_id, key="set_learner_id")
+    store = get_sqlite_store(path)
+    if not store.is_imported(learner_id):
+        store.import_values(learner_id, {key: local_storage.getItem(key) for key in IMPORTED_KEYS})
+    return ServerProgress(store, learner_id)
+
+
+def get_progress():
+    """Return the progress store of the current session, creating it on first use.
+
+    Pages call this once at the top of every run.
+    """
+    import streamlit as st
+
+    progress = st.session_state.get(SESSION_KEY)
+    if progress is not None:
+        progress.new_run()
+        return progress
+    path = os.environ.get(PROGRESS_DB_ENV)
+    if path:
+        local_storage = _local_storage()
+        progress = _server_progress(path, local_storage)
+        if progress is None:
+            return BrowserProgress(_local_storage, local_storage)
+    else:
+        progress = BrowserProgress(_local_storage)
+    st.session_state[SESSION_KEY] = progress
+    return progress
@@ -0,0 +1,128 @@
+"""Seeded random tests for scenarios with ``property_tests``.
+
+A scenario declares::
+
+    "property_tests": {
+        "count": 2000,
+        "seed": 0,
+        "input_generator": "def generate(rng):\n    return ([rng.randint(-9, 9) for _ in range(rng.randint(0, 20))],)",
+        "reference_solution": "def reverse_list(lst):\n    return lst[::-1]",
+    }
+
+``generate(rng)`` receives a ``random.Random`` and returns the positional
+arguments of one case. The inputs and the reference solution's outputs only
+depend on the scenario, so they are computed once and pickled to a cache
+directory (``FASTSKILLING_CACHE_DIR``, ``.cache`` by default); every worker then
+reads the file once and keeps it in memory.
+"""
+import hashlib
+import json
+import os
+import pickle
+import random
+import tempfile
+import threading
+
+from utils.cache import cache_dir
+from utils.code_cache import harness_function
+from utils.compare import compare
+
+PROPERTY_TESTS_FIELDS = ("input_generator", "reference_solution")
+DEFAULT_COUNT = 1000
+DEFAULT_SEED = 0
+BATCH_SIZE = 256
+
+_cases = {}
+_cases_lock = threading.Lock()
+
+
+def _fingerprint(scenario):
+    spec = json.dumps(scenario.property_tests, sort_keys=True)
+    return hashlib.sha256(f"{scenario.function_name}\0{spec}".encode()).hexdigest()[:16]
+
+
+def generate_cases(scenario):
+    """Return ``[(args, expected_output)]`` by running the reference on seeded inputs."""
+    spec = scenario.property_tests
+    rng = random.Random(spec.get("seed", DEFAULT_SEED))
+    generate = harness_function(scenario, "property_tests", "input_generator", "generate")
+    reference = harness_function(scenario, "property_tests", "reference_solution", scenario.function_name)
+    cases = []
+    for _ in range(spec.get("count", DEFAULT_COUNT)):
+        args = tuple(generate(rng))
+        # The expected output is computed on a copy in case the reference mutates its input.
+        expected_output = reference(*pickle.loads(pickle.dumps(args)))
+        cases.append((args, expected_output))
+    return cases
+
+
+def _case_file(scenario):
+    return os.path.join(cache_dir(), "property_tests", f"{scenario.id}-{_fingerprint(scenario)}.pickle")
+
+
+def cached_cases(scenario):
+    """Return the pickled cases of a scenario, generating and storing them on first use.
+
+    The pickle bytes are kept rather than the objects so that every submission
+    gets fresh inputs to mutate with a single ``pickle.loads``.
+    """
+    key = (scenario.id, _fingerprint(scenario))
+    with _cases_lock:
+        data = _cases.get(key)
+        if data is not None:
+            return data
+        path = _case_file(scenario)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = pickle.dumps(generate_cases(scenario), protocol=pickle.HIGHEST_PROTOCOL)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Several workers may generate the same file; replacing atomically keeps
+            # readers from ever seeing a partial one.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        _cases[key] = data
+        return data
+
+
+def _counterexample(scenario, index, output=None, error=None):
+    # Learner code may have mutated the arguments, so the input is reported as generated.
+    args, expected_output = pickle.loads(cached_cases(scenario))[index]
+    return {
+        "input": args,
+        "expected_output": expected_output,
+        "result": f"raised {error!r}" if error is not None else output,
+    }
+
+
+def run_property_tests(scenario, function, batch_size=BATCH_SIZE):
+    """Run ``function`` on the cached cases and stop at the first counterexample.
+
+    The counterexample holds the raw values; the caller renders them.
+
+    Outputs are compared a batch at a time with a single comparison; only a
+    failing batch is searched for the case that differs. Comparison follows the
+    scenario's ``comparison`` options.
+    """
+    cases = pickle.loads(cached_cases(scenario))
+    total = len(cases)
+    for start in range(0, total, batch_size):
+        batch = cases[start:start + batch_size]
+        outputs = []
+        for offset, (args, _) in enumerate(batch):
+            try:
+                outputs.append(function(*args))
+            except Exception as e:
+                return {"passed": False, "checked": start + offset, "total": total,
+                        "counterexample": _counterexample(scenario, start + offset, error=e)}
+        # A tuple, so that "unordered" applies to each output and never to the batch itself.
+        if compare(tuple(outputs), tuple(expected_output for _, expected_output in batch), limit=1,
+                   **scenario.comparison):
+            for offset, (output, (_, expected_output)) in enumerate(zip(outputs, batch)):
+                if compare(output, expected_output, limit=1, **scenario.comparison):
+                    return {"passed": False, "checked": start + offset, "total": total,
+                            "counterexample": _counterexample(scenario, start + offset, output)}
+    return {"passed": True, "checked": total, "total": total, "counterexample": None}
@@ -0,0 +1,214 @@
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # resource limits are only available on POSIX systems
+    resource = None
+
+from utils import code_cache, tracing
+from utils.grader import grade_submission, new_result
+from utils.memory import current_rss_bytes
+
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_CPU_SECONDS = 5
+DEFAULT_MEMORY_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_JOBS_PER_WORKER = 200
+# How often a waiting grade() checks whether the caller cancelled the job.
+CANCEL_POLL_INTERVAL = 0.05
+
+
+def _set_soft_limit(limit, value):
+    _, hard = resource.getrlimit(limit)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(limit, (value, hard))
+
+
+def _apply_memory_limit(memory_bytes):
+    if resource is None or not memory_bytes:
+        return
+    _set_soft_limit(resource.RLIMIT_AS, memory_bytes)
+
+
+def _apply_cpu_limit(cpu_seconds):
+    # RLIMIT_CPU counts the whole lifetime of the process, so the budget for the
+    # next job is granted on top of what this worker has already used.
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _set_soft_limit(resource.RLIMIT_CPU, math.ceil(usage.ru_utime + usage.ru_stime + cpu_seconds))
+
+
+def _worker_main(conn, cpu_seconds, memory_bytes):
+    _apply_memory_limit(memory_bytes)
+    # Compile every scenario's setup and harness code before the first job arrives.
+    from utils.scenarios import registry
+    code_cache.prewarm(registry)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        scenario, code, fail_fast, stream = job
+        _apply_cpu_limit(cpu_seconds)
+        on_test_result = None
+        if stream:
+            def on_test_result(index, test_result):
+                conn.send(("test_result", index, test_result))
+        with tracing.collect() as trace:
+            result = grade_submission(scenario, code, on_test_result, fail_fast)
+            if trace is not None:
+                tracing.event("worker_memory", rss_bytes=current_rss_bytes())
+        result["spans"] = trace.spans if trace is not None else []
+        conn.send(("result", result))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, context, cpu_seconds, memory_bytes):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_seconds, memory_bytes),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def crash_reason(self):
+        self.process.join(timeout=1)
+        if hasattr(signal, "SIGXCPU") and self.process.exitcode == -signal.SIGXCPU:
+            return "CPU time limit exceeded."
+        return f"Grading worker crashed (exit code {self.process.exitcode})."
+
+
+class GradingPool:
+    """A fixed number of worker processes started up front that grade submissions.
+
+    Every job gets a wall-clock timeout on top of the CPU and address space limits
+    applied inside the worker. A worker that times out or dies is replaced in the
+    background, and healthy workers are recycled after ``max_jobs_per_worker`` jobs
+    so that leaks in learner code cannot accumulate.
+    """
+
+    def __init__(self, size=None, timeout=DEFAULT_TIMEOUT, cpu_seconds=DEFAULT_CPU_SECONDS,
+                 memory_bytes=DEFAULT_MEMORY_BYTES, max_jobs_per_worker=DEFAULT_MAX_JOBS_PER_WORKER,
+                 start_method="spawn"):
+        self.size = size or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._context = multiprocessing.get_context(start_method)
+        self._idle = queue.Queue()
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        return _Worker(self._context, self.cpu_seconds, self.memory_bytes)
+
+    def _replace(self, worker, graceful):
+        def replace():
+            if graceful:
+                worker.stop()
+            else:
+                worker.kill()
+            if not self._closed:
+                self._idle.put(self._spawn())
+        threading.Thread(target=replace, daemon=True).start()
+
+    def _take_worker(self, cancel):
+        """Wait for an idle worker; returns None if ``cancel`` is set first."""
+        if cancel is None:
+            return self._idle.get()
+        while not cancel.is_set():
+            try:
+                return self._idle.get(timeout=CANCEL_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        return None
+
+    def grade(self, scenario, code, timeout=None, on_test_result=None, fail_fast=False, cancel=None):
+        """Grade in a worker and return the result dict.
+
+        ``on_test_result(index, test_result)`` is called in the calling thread as
+        each test case finishes in the worker. The timeout covers the whole job.
+        Setting the ``cancel`` event stops the job and kills its worker.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        # A job cancelled while queued must not take a worker from the ones still wanted.
+        worker = self._take_worker(cancel)
+        if worker is None:
+            return new_result("cancelled", "Grading was cancelled.")
+        deadline = time.monotonic() + timeout
+        try:
+            worker.conn.send((scenario, code, fail_fast, on_test_result is not None))
+            while True:
+                remaining = deadline - time.monotonic()
+                wait = remaining if cancel is None else min(remaining, CANCEL_POLL_INTERVAL)
+                if not worker.conn.poll(max(0.0, wait)):
+                    if cancel is not None and cancel.is_set():
+                        self._replace(worker, graceful=False)
+                        worker = None
+                        return new_result("cancelled", "Grading was cancelled.")
+                    if wait < remaining:
+                        continue
+                    self._replace(worker, graceful=False)
+                    worker = None
+                    return new_result("timeout", f"Execution timed out after {timeout:g} seconds.")
+                message = worker.conn.recv()
+                if message[0] == "result":
+                    result = message[1]
+                    break
+                on_test_result(*message[1:])
+        except (EOFError, OSError):
+            reason = worker.crash_reason()
+            self._replace(worker, graceful=False)
+            worker = None
+            return new_result("crashed", reason)
+        except BaseException:
+            # The caller gave up, e.g. a Streamlit rerun raised from the callback; the
+            # worker may still be busy with the job and cannot be reused.
+            self._replace(worker, graceful=False)
+            worker = None
+            raise
+        finally:
+            if worker is not None:
+                worker.jobs += 1
+                if worker.jobs >= self.max_jobs_per_worker:
+                    self._replace(worker, graceful=True)
+                else:
+                    self._idle.put(worker)
+        return result
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
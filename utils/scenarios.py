@@ -1,591 +1,377 @@
-class ScenarioBuilder:
-    def __init__(self, title):
-        self.title = title
-
-    def description(self, description):
-        self.description = description
-        return self
-    
-    def initial_code(self, code):
-        self.initial_code = code
-        return self
-
-    def function_name(self, name):
-        self.function_name = name
-        return self
-
-    def test_cases(self, cases):
-        if not self.test_cases:
-            self.test_cases = []
-        self.test_cases.append(cases)
-        return self
-    
-    def test_setup_code(self, setup_code):
-        self.test_setup_code = setup_code
-        return self
-
-    def build(self):
-        return {
-            "title": self.title,
-            "description": self.description,
-            "initial_code": self.initial_code,
-            "function_name": self.function_name,
-            "test_cases": self.test_cases,
-            "test_setup_code": self.test_setup_code
-        }
-    
-class ScenarioTestCase:
-    def description(self, description):
-        self.description = description
-        return self
-    def input_data(self, input_data):
-        self.input_data = input_data
-        return self
-    def expected_output(self, expected_output):
-        self.expected_output = expected_output
-        return self
-
-generated_scenarios = [
-    {
-        "title": "Redact Username Decorator",
-        "difficulty": 3,
-    "description": "Create a decorator that get a username as a parameter and reducts the username from **ALL** input arguments of the function it decorates by using '???'  \nFor example if the username is  \n```Thomas```  \nand the function is called with  \n```Thomas is tired```  \nit should replace the argument with  \n```??? is tired```",
-    "initial_code": "def redact_username(username: str):\n    # Your code here\n    pass",
-    "function_name": "test_function",
-    "test_setup_code": "@redact_username('John')\ndef test_function(input_string: str, notes: str=\"none\"):\n    return input_string + ' Notes: ' + notes",
-    "test_cases": [
-        {
-            "input": ("John is tired",),
-            "expected_output": "??? is tired Notes: none",
-            "description": "Redacting username 'John' should return '???'."
-        },
-        {
-            "input": ("Alice and John are buying a house",),
-            "expected_output": "Alice and ??? are buying a house Notes: none",
-            "description": "Redacting username 'John' should return 'Alice and ??? are buying a house'."
-        },
-        {
-            "input": ("Charlie doesn't know anybody",),
-            "expected_output": "Charlie doesn't know anybody Notes: none",
-            "description": "No redaction needed as 'Charlie' is not the username."
-        },
-        {
-            "input": ("Bank is closing loan", "John is the manager"),
-            "expected_output": "Bank is closing loan Notes: ??? is the manager",
-            "description": "All parameters should be redacted if they contain the username."
-        },
-        {
-            "input": {"input_string":"Bank is closing loan", "notes":"John is the manager"},
-            "expected_output": "Bank is closing loan Notes: ??? is the manager",
-            "description": "All parameters should be redacted if they contain the username."
-        }
-    ]
-},
-{
-    "title": "Unpacking and Extended Iterable Unpacking",
-    "difficulty": 1,
-    "description": (
-        "Create a function called `split_first_last` that takes a list of at least two elements and returns a tuple "
-        "containing the first element, a list of all middle elements, and the last element. "
-        "Demonstrate your understanding of iterable unpacking and the use of the * operator in function arguments.\n\n"
-        "For example:\n"
-        "```python\n"
-        "split_first_last([1, 2, 3, 4])  # (1, [2, 3], 4)\n"
-        "split_first_last(['a', 'b', 'c'])  # ('a', ['b'], 'c')\n"
-        "```\n"
-        "If the list has only two elements, the middle list should be empty."
-    ),
-    "initial_code": (
-        "def split_first_last(lst):\n"
-        "    # Your code here\n"
-        "    pass"
-    ),
-    "function_name": "split_first_last",
-    "test_cases": [
-        {
-            "input": ([1, 2, 3, 4],),
-            "expected_output": (1, [2, 3], 4),
-            "description": "Should return (1, [2, 3], 4) for [1, 2, 3, 4]."
-        },
-        {
-            "input": (['a', 'b', 'c'],),
-            "expected_output": ('a', ['b'], 'c'),
-            "description": "Should return ('a', ['b'], 'c') for ['a', 'b', 'c']."
-        },
-        {
-            "input": ([10, 20],),
-            "expected_output": (10, [], 20),
-            "description": "Should return (10, [], 20) for [10, 20]."
-        },
-        {
-            "input": ([1, 2, 3, 4, 5, 6],),
-            "expected_output": (1, [2, 3, 4, 5], 6),
-            "description": "Should return (1, [2, 3, 4, 5], 6) for [1, 2, 3, 4, 5, 6]."
-        }
-    ]
-},
-    {
-        "title": "Add two numbers",
-        "difficulty": 1,
-    "description": "Create a function that adds two numbers together and returns the result.",
-    "initial_code": "def add_numbers(a: int, b: int) -> int:\n    # Your code here\n    pass",
-    "function_name": "add_numbers",
-    "test_cases": [
-        {
-            "input": (2, 3),
-            "expected_output": 5,
-            "description": "Adding 2 and 3 should return 5."
-        },
-        {
-            "input": (-1, 1),
-            "expected_output": 0,
-            "description": "Adding -1 and 1 should return 0."
-        },
-        {
-            "input": (0, 0),
-            "expected_output": 0,
-            "description": "Adding 0 and 0 should return 0."
-        }
-    ]
-},
-    {
-        "title": "Reverse list",
-        "difficulty": 1,
-    "description": "Create a function that reverses a list and returns the reversed list.",
-    "initial_code": "def reverse_list(lst: list) -> list:\n    # Your code here\n    pass",
-    "function_name": "reverse_list",
-    "optional_code_goal": {"max_lines": 1},
-    "test_cases": [
-        {
-            "input": ([2, 3],),
-            "expected_output": [3, 2],
-            "description": "Reversing the list [2, 3] should return [3, 2]."
-        },
-        {
-            "input": ([5, 4, 3, 2, 1],),
-            "expected_output": [1, 2, 3, 4, 5],
-            "description": "Reversing the list [5, 4, 3, 2, 1] should return [1, 2, 3, 4, 5]."
-        },
-        {
-            "input": ([1],),
-            "expected_output": [1],
-            "description": "Reversing the list [1] should return [1]."
-        },
-        {
-            "input": ([],),
-            "expected_output": [],
-            "description": "Reversing an empty list should return an empty list."
-        }
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
 
-    ]
-},
-    {
-        "title": "Group by Remainder",
-        "difficulty": 2,
-    "description": "Given a list of integers, create a function that returns a dictionary  that groups the integers based on the remainder when divided  by a given divisor. The keys of the dictionary should be the remainders, and the values should be lists of integers that yield those remainders.",
-    "initial_code": "def group_by_remainder(lst:list, divisor:int) -> int:\n    # Your code here\n    pass",
-    "function_name": "group_by_remainder",
-    "optional_code_goal": {"max_lines": 3},
-    "test_cases": [
-        {
-            "input": ([10, 20, 30, 25, 15], 5),
-            "expected_output": {0: [10, 20, 30, 25, 15],},
-            "description": "Grouping by remainder when divided by 5."
-        },
-        {
-            "input": ([1, 2, 3, 4, 5], 2),
-            "expected_output": {0: [2, 4], 1: [1, 3, 5]},
-            "description": "Grouping by remainder when divided by 2."
-        },
-        {
-            "input": ([7, 14, 21], 7),
-            "expected_output": {0: [7, 14, 21]},
-            "description": "All numbers yield the same remainder when divided by 7."
-        },
-        {
-            "input": ([8, -8, -16], 4),
-            "expected_output": {0: [8, -8, -16]},
-            "description": "All numbers yield the same remainder when divided by 4."
-        }
-    ]
-    
-},
-{    "title": "Calculate Factorial",
-        "difficulty": 2,
-    "description": "Create a function that calculates the factorial of a given number and returns the result.",
-    "initial_code": "def factorial(n: int) -> int:\n    # Your code here\n    pass",
-    "function_name": "factorial",
-    "test_cases": [
-        {
-            "input": (5,),
-            "expected_output": 120,
-            "description": "Factorial of 5 should return 120."
-        },
-        {
-            "input": (0,),
-            "expected_output": 1,
-            "description": "Factorial of 0 should return 1."
-        },
-        {
-            "input": (1,),
-            "expected_output": 1,
-            "description": "Factorial of 1 should return 1."
-        },
-        {
-            "input": (3,),
-            "expected_output": 6,
-            "description": "Factorial of 3 should return 6."
-        }
-    ]
-},
-{
-    "title": "Dictionary Comprehension with Conditional Logic",
-    "difficulty": 1,
-    "description": (
-        "Create a function called `even_square_dict` that takes a list of integers and returns a dictionary where the keys "
-        "are the even numbers from the list and the values are their squares. Suggestion: Use a dictionary comprehension with a condition.\n\n"
-        "For example:\n"
-        "```python\n"
-        "even_square_dict([1, 2, 3, 4, 5])  # {2: 4, 4: 16}\n"
-        "even_square_dict([10, 15, 20])  # {10: 100, 20: 400}\n"
-        "even_square_dict([])  # {}\n"
-        "```\n"
-        "Demonstrate your understanding of dictionary comprehensions and conditional logic in Python."
-    ),
-    "initial_code": (
-        "def even_square_dict(numbers):\n"
-        "    # Your code here\n"
-        "    pass"
-    ),
-    "function_name": "even_square_dict",
-    "test_cases": [
-        {
-            "input": ([1, 2, 3, 4, 5],),
-            "expected_output": {2: 4, 4: 16},
-            "description": "Should return {2: 4, 4: 16} for [1, 2, 3, 4, 5]."
-        },
-        {
-            "input": ([10, 15, 20],),
-            "expected_output": {10: 100, 20: 400},
-            "description": "Should return {10: 100, 20: 400} for [10, 15, 20]."
-        },
-        {
-            "input": ([1, 3, 5],),
-            "expected_output": {},
-            "description": "Should return {} for [1, 3, 5] (no even numbers)."
-        },
-        {
-            "input": ([],),
-            "expected_output": {},
-            "description": "Should return {} for an empty list."
-        }
-    ]
-},
-{
-    "title": "Tuple Packing and Unpacking",
-    "difficulty": 2,
-    "description": (
-        "Create a function called `swap_and_pack` that takes two arguments, swaps them, and returns them as a tuple. "
-        "Then, demonstrate tuple unpacking by writing a test that unpacks the result into two variables. "
-        "This exercise is to show your understanding of tuple packing and unpacking in Python.\n\n"
-        "For example:\n"
-        "```python\n"
-        "result = swap_and_pack('hello', 42)  # (42, 'hello')\n"
-        "a, b = swap_and_pack('hello', 42)\n"
-        "# a == 42, b == 'hello'\n"
-        "```\n"
-        "If you pass two values, the function should return them swapped in a tuple."
-    ),
-    "initial_code": (
-        "def swap_and_pack(a, b):\n"
-        "    # Your code here\n"
-        "    pass"
-    ),
-    "function_name": "swap_and_pack",
-    "test_cases": [
-        {
-            "input": ("hello", 42),
-            "expected_output": (42, "hello"),
-            "description": "Should return (42, 'hello') for input ('hello', 42)."
-        },
-        {
-            "input": (1, 2),
-            "expected_output": (2, 1),
-            "description": "Should return (2, 1) for input (1, 2)."
-        },
-        {
-            "input": ([1, 2], {"a": 10}),
-            "expected_output": ({"a": 10}, [1, 2]),
-            "description": "Should return ({'a': 10}, [1, 2]) for input ([1, 2], {'a': 10})."
-        }
-    ]
-},
-{
-    "title": "Class Decorator: Add Repr",
-    "difficulty": 2,
-    "description": (
-        "Write a class decorator called `add_repr` that adds a custom `__repr__` method to any class it decorates. "
-        "The `__repr__` method should return a string in the format `<ClassName({attribute_dict})>`, "
-        "where `attribute_dict` is the dictionary of the instance's attributes.\n\n"
-        "For example:\n"
-        "```python\n"
-        "@add_repr\n"
-        "class Point:\n"
-        "    def __init__(self, x, y):\n"
-        "        self.x = x\n"
-        "        self.y = y\n"
-        "p = Point(1, 2)\n"
-        "repr(p)  # <Point({'x': 1, 'y': 2})>\n"
-        "```\n"
-        "Demonstrate your understanding of class decorators and dynamic method addition."
-    ),
-    "initial_code": (
-        "def add_repr(cls):\n"
-        "    # Your code here\n"
-        "    pass"
-    ),
-    "function_name": "test_point_repr",
-    "test_setup_code": (
-        "@add_repr\n"
-        "class Point:\n"
-        "    def __init__(self, x, y):\n"
-        "        self.x = x\n"
-        "        self.y = y\n"
-        "def test_point_repr():\n"
-        "    p = Point(3, 4)\n"
-        "    return repr(p)\n"
-    ),
-    "test_cases": [
-        {
-            "input": (),
-            "expected_output": "<Point({'x': 3, 'y': 4})>",
-            "description": "Should return custom repr for Point(3, 4)."
-        }
-    ]
-},
-{
-    "title": "Function Decorator: Double Result",
-    "difficulty": 2,
-    "description": (
-        "Write a function decorator called `double_result` that, when applied to any function, "
-        "will double the result returned by that function. The decorator should not take any arguments.\n\n"
-        "For example:\n"
-        "```python\n"
-        "@double_result\n"
-        "def add(a, b):\n"
-        "    return a + b\n"
-        "add(2, 3)  # 10\n"
-        "```\n"
-        "Demonstrate your understanding of function decorators in Python."
-    ),
-    "initial_code": (
-        "def double_result(func):\n"
-        "    # Your code here\n"
-        "    pass"
-    ),
-    "function_name": "add",
-    "test_setup_code": (
-        "@double_result\n"
-        "def add(a, b):\n"
-        "    return a + b\n"
-    ),
-    "test_cases": [
-        {
-            "input": (1,3),
-            "expected_output": 8,
-            "description": "add(1, 3) should return 8 because the result is doubled."
-        },
-        {
-            "input": (0, 0),
-            "expected_output": 0,
-            "description": "add(0, 0) should return 0 because the result is doubled."
-        },
-        {
-            "input": (-1, 2),
-            "expected_output": 2,
-            "description": "add(-1, 2) should return 2 because the result is doubled."
-        }
-    ]
-},
-{"title": "Collect unique values from a list",
-    "difficulty": 1,
-    "description": (
-        "Create a function called `collect_unique_values` that takes a list of integers and returns a set of unique values. "
-        "This exercise is to demonstrate your understanding of sets in Python.\n\n"
-        "For example:\n"
-        "```python\n"
-        "collect_unique_values([1, 2, 2, 3, 4, 4])  # {1, 2, 3, 4}\n"
-        "collect_unique_values([5, 5, 5])  # {5}\n"
-        "collect_unique_values([])  # set()\n"
-        "```\n"
-    ),
-    "initial_code": (
-        "def collect_unique_values(lst):\n"
-        "    # Your code here\n"
-        "    pass"
-    ),
-    "function_name": "collect_unique_values",
-    "test_cases": [
-        {
-            "input": ([1, 2, 2, 3, 4, 4],),
-            "expected_output": {1, 2, 3, 4},
-            "description": "Should return {1, 2, 3, 4} for [1, 2, 2, 3, 4, 4]."
-        },
-        {
-            "input": ([5, 5, 5],),
-            "expected_output": {5},
-            "description": "Should return {5} for [5, 5, 5]."
-        },
-        {
-            "input": ([],),
-            "expected_output": set(),
-            "description": "Should return an empty set for an empty list."
-        }
-    ]
-},
-{
-    "title": "Handle expections",
-    "difficulty": 1,
-    "description": (
-        "Create a function that gets a string and tries to convert it to a number. "
-        "If the conversion fails, it should return 'Invalid input'. "
-        "This exercise is to demonstrate your understanding of exception handling in Python.\n\n"
-        "For example:\n"
-        "```python\n"
-        "to_number(\"10\")  # 10.0\n"
-        "to_number(\"abc\")  # 'Invalid input'\n"
-        "```\n"
-    ),
-    "initial_code": (
-        "def to_number(s):\n"
-        "    # Your code here\n"
-        "    pass"
-    ),
-    "function_name": "to_number",
-    "test_cases": [
-        {
-            "input": ("10",),
-            "expected_output": 10.0,
-            "description": "Should return 10.0 for input '10'."
-        },
-        {
-            "input": ("abc",),
-            "expected_output": "Invalid input",
-            "description": "Should return 'Invalid input' for input 'abc'."
-        },
-        {
-            "input": ("3.14",),
-            "expected_output": 3.14,
-            "description": "Should return 3.14 for input '3.14'."
-        },
-        {
-            "input": ("-5",),
-            "expected_output": -5.0,
-            "description": "Should return -5.0 for input '-5'."
+from utils.bundle import get_bundle
+from utils.code_cache import SETUP_FILENAME, compile_cached
+from utils.compare import COMPARISON_OPTIONS
+from utils.memory import MEMORY_GOAL_FIELDS
+from utils.performance import normalize_complexity
+from utils.property_tests import PROPERTY_TESTS_FIELDS
+
+SCENARIOS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scenarios")
+MANIFEST_FILE = "manifest.json"
+
+DIFFICULTIES = (1, 2, 3)
+SUMMARY_FIELDS = ("title", "difficulty", "tags")
+REQUIRED_FIELDS = ("title", "difficulty", "description", "function_name", "test_cases")
+OPTIONAL_FIELDS = ("initial_code", "test_setup_code", "optional_code_goal", "performance_goal", "memory_goal",
+                   "property_tests", "comparison", "tags", "version")
+PERFORMANCE_GOAL_FIELDS = ("complexity", "input_generator")
+
+
+def scenario_id(title):
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+
+
+class _Frozen:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class ScenarioTestCase(_Frozen):
+    __slots__ = ("input_data", "expected_output", "description")
+
+    def __init__(self, input_data, expected_output, description=""):
+        object.__setattr__(self, "input_data", input_data)
+        object.__setattr__(self, "expected_output", expected_output)
+        object.__setattr__(self, "description", description)
+
+    @classmethod
+    def from_dict(cls, data):
+        if "input" not in data or "expected_output" not in data:
+            raise ValueError("test case needs 'input' and 'expected_output'")
+        if not isinstance(data["input"], (tuple, list, dict)):
+            raise ValueError("test case 'input' must be a tuple of arguments or a dict of keyword arguments")
+        return cls(data["input"], data["expected_output"], data.get("description", ""))
+
+    def to_dict(self):
+        return {"input": self.input_data, "expected_output": self.expected_output, "description": self.description}
+
+
+class ScenarioDetails(_Frozen):
+    """The part of a scenario that is only needed once somebody opens or grades it."""
+
+    __slots__ = ("description", "initial_code", "function_name", "test_cases", "test_setup_code",
+                 "optional_code_goal", "performance_goal", "memory_goal", "property_tests", "comparison",
+                 "_setup_code_object")
+
+    def __init__(self, description, function_name, test_cases, initial_code="", test_setup_code=None,
+                 optional_code_goal=None, performance_goal=None, memory_goal=None,
+                 property_tests=None, comparison=None):
+        values = {
+            "description": description,
+            "initial_code": initial_code,
+            "function_name": function_name,
+            "test_cases": tuple(test_cases),
+            "test_setup_code": test_setup_code,
+            "optional_code_goal": dict(optional_code_goal) if optional_code_goal else None,
+            "performance_goal": dict(performance_goal) if performance_goal else None,
+            "memory_goal": dict(memory_goal) if memory_goal else None,
+            "property_tests": dict(property_tests) if property_tests else None,
+            "comparison": dict(comparison) if comparison else {},
+            "_setup_code_object": None,
         }
-    ]
-},  
-{
-    "title": "Create a cm class that supports addition and subtraction",
-    "difficulty": 2,
-    "description": (
-        "Create a class called `Centimeter` that represents a length in centimeters.\n  "
-        "The class should support\n  "
-        "- addition of other 'Centimeter' instances\n  "
-        "- addition of an integer or float\n  "
-        "- subtraction of other 'Centimeter' instances\n  "
-        "- subtraction of an integer or float\n  "
-        "- equality comparison with other 'Centimeter' instances\n\n  "
-        "For example:\n"
-        "```python\n"
-        "cm1 = Centimeter(10)\n"
-        "cm2 = Centimeter(5)\n"
-        "result_add = cm1 + cm2  # Centimeter(15)\n"
-        "result_sub = cm1 - cm2  # Centimeter(5)\n"
-        "result_add_with_number = cm1 + 5  # Centimeter(15)\n"
-        "```\n"
-    ),
-    "initial_code": (
-        "class Centimeter:\n"
-        "    # Your code here\n"
-    ),
-    "test_setup_code": (
-        "def test_centimeter_operations(n1, n2):\n"
-        "    cm1 = Centimeter(n1)\n"
-        "    cm2 = Centimeter(n2)\n"
-        "    assert (cm1 + cm2) == Centimeter(n1 + n2)\n"
-        "    assert (cm1 + n2) == Centimeter(n1 + n2)\n"
-        "    assert (cm1 - cm2) == Centimeter(n1 - n2)\n"
-        "    assert (cm1 - n2) == Centimeter(n1 - n2)\n"
-        "    assert (cm1 + Centimeter(0)) == cm1\n"
-        "    assert (cm1 - Centimeter(0)) == cm1\n"
-    ),
-    "function_name": "test_centimeter_operations",
-    "test_cases": [
-        {
-            "input": (10, 5),
-            "expected_output": None,
-            "description": "Adding Centimeter(10) and Centimeter(5) should return Centimeter(15)."
-        },
-        {
-            "input": (20, 10),
-            "expected_output": None,
-            "description": "Subtracting Centimeter(10) from Centimeter(20) should return Centimeter(10)."
-        },
-        {
-            "input": (0, 0),
-            "expected_output": None,
-            "description": "Adding two zero lengths should return Centimeter(0)."
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data["test_cases"]:
+            raise ValueError("at least one test case is required")
+        return cls(
+            data["description"],
+            data["function_name"],
+            [ScenarioTestCase.from_dict(case) for case in data["test_cases"]],
+            initial_code=data.get("initial_code", ""),
+            test_setup_code=data.get("test_setup_code"),
+            optional_code_goal=data.get("optional_code_goal"),
+            performance_goal=data.get("performance_goal"),
+            memory_goal=data.get("memory_goal"),
+            property_tests=data.get("property_tests"),
+            comparison=data.get("comparison"),
+        )
+
+    @property
+    def setup_code_object(self):
+        if self._setup_code_object is None and self.test_setup_code:
+            object.__setattr__(self, "_setup_code_object", compile_cached(self.test_setup_code, SETUP_FILENAME))
+        return self._setup_code_object
+
+
+def _validate(data, fields=REQUIRED_FIELDS):
+    missing = [name for name in fields if name not in data]
+    if missing:
+        raise ValueError(f"missing fields {missing}")
+    unknown = set(data) - set(REQUIRED_FIELDS) - set(OPTIONAL_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown fields {sorted(unknown)}")
+    if data["difficulty"] not in DIFFICULTIES:
+        raise ValueError(f"difficulty must be one of {DIFFICULTIES}")
+    goal = data.get("performance_goal")
+    if goal is not None:
+        missing = [name for name in PERFORMANCE_GOAL_FIELDS if name not in goal]
+        if missing:
+            raise ValueError(f"performance_goal is missing fields {missing}")
+        normalize_complexity(goal["complexity"])
+    goal = data.get("memory_goal")
+    if goal is not None:
+        missing = [name for name in MEMORY_GOAL_FIELDS if name not in goal]
+        if missing:
+            raise ValueError(f"memory_goal is missing fields {missing}")
+    spec = data.get("property_tests")
+    if spec is not None:
+        missing = [name for name in PROPERTY_TESTS_FIELDS if name not in spec]
+        if missing:
+            raise ValueError(f"property_tests is missing fields {missing}")
+    unknown = set(data.get("comparison") or {}) - set(COMPARISON_OPTIONS)
+    if unknown:
+        raise ValueError(f"unknown comparison options {sorted(unknown)}")
+
+
+def _details_property(name):
+    return property(lambda self: getattr(self.details, name))
+
+
+class Scenario(_Frozen):
+    """Summary of an exercise; the details are loaded from ``loader`` on first access."""
+
+    __slots__ = ("id", "title", "difficulty", "tags", "version", "_loader", "_details")
+
+    def __init__(self, title, difficulty, tags=(), version=None, loader=None, details=None):
+        values = {
+            "id": scenario_id(title),
+            "title": title,
+            "difficulty": difficulty,
+            "tags": tuple(tags),
+            "version": version,
+            "_loader": loader,
+            "_details": details,
         }
-    ]
-},
-{
-    "title": "Lambda Functions and Functional Programming",
-    "difficulty": 2,
-    "description": (
-        "Create a function called `process_data` that takes a list of dictionaries and applies various transformations "
-        "using lambda functions. The function should:\n"
-        "1. Filter out dictionaries where 'age' is less than 18\n"
-        "2. Transform each remaining dictionary by adding a 'category' field:\n"
-        "   - 'young' if age < 30\n"
-        "   - 'adult' if age >= 30 and < 60\n"
-        "   - 'senior' if age >= 60\n"
-        "3. Sort the results by age in ascending order\n\n"
-        "Use lambda functions with filter(), map(), and sorted() built-in functions.\n\n"
-        "For example:\n"
-        "```python\n"
-        "data = [{'name': 'Alice', 'age': 25}, {'name': 'Bob', 'age': 15}, {'name': 'Charlie', 'age': 65}]\n"
-        "process_data(data)  # [{'name': 'Alice', 'age': 25, 'category': 'young'}, {'name': 'Charlie', 'age': 65, 'category': 'senior'}]\n"
-        "```\n"
-        "This demonstrates understanding of lambda functions and functional programming concepts in Python."
-    ),
-    "initial_code": (
-        "def process_data(data):\n"
-        "    # Your code here - use lambda functions with filter, map, and sorted\n"
-        "    pass"
-    ),
-    "function_name": "process_data",
-    "test_cases": [
-        {
-            "input": ([{'name': 'Alice', 'age': 25}, {'name': 'Bob', 'age': 15}, {'name': 'Charlie', 'age': 65}],),
-            "expected_output": [{'name': 'Alice', 'age': 25, 'category': 'young'}, {'name': 'Charlie', 'age': 65, 'category': 'senior'}],
-            "description": "Should filter out minors, add categories, and sort by age."
-        },
-        {
-            "input": ([{'name': 'David', 'age': 45}, {'name': 'Eve', 'age': 30}, {'name': 'Frank', 'age': 17}],),
-            "expected_output": [{'name': 'Eve', 'age': 30, 'category': 'adult'}, {'name': 'David', 'age': 45, 'category': 'adult'}],
-            "description": "Should handle adult category and filter out minors."
-        },
-        {
-            "input": ([{'name': 'Grace', 'age': 29}, {'name': 'Henry', 'age': 60}],),
-            "expected_output": [{'name': 'Grace', 'age': 29, 'category': 'young'}, {'name': 'Henry', 'age': 60, 'category': 'senior'}],
-            "description": "Should handle boundary cases for categories."
-        },
-        {
-            "input": ([{'name': 'Ian', 'age': 10}, {'name': 'Jane', 'age': 16}],),
-            "expected_output": [],
-            "description": "Should return empty list when all are minors."
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        title = data.get("title", "<untitled>")
+        try:
+            _validate(data)
+            details = ScenarioDetails.from_dict(data)
+        except ValueError as e:
+            raise ValueError(f"Invalid scenario '{title}': {e}") from e
+        return cls(data["title"], data["difficulty"], data.get("tags", ()), data.get("version"), details=details)
+
+    @property
+    def details(self):
+        if self._details is None:
+            with _load_lock:
+                if self._details is None:
+                    try:
+                        data = self._loader()
+                        if data.get("title") != self.title:
+                            raise ValueError(f"title does not match the manifest entry '{self.title}'")
+                        _validate(data)
+                        details = ScenarioDetails.from_dict(data)
+                    except ValueError as e:
+                        raise ValueError(f"Invalid scenario '{self.title}': {e}") from e
+                    object.__setattr__(self, "_details", details)
+        return self._details
+
+    @property
+    def is_loaded(self):
+        return self._details is not None
+
+    description = _details_property("description")
+    initial_code = _details_property("initial_code")
+    function_name = _details_property("function_name")
+    test_cases = _details_property("test_cases")
+    test_setup_code = _details_property("test_setup_code")
+    optional_code_goal = _details_property("optional_code_goal")
+    performance_goal = _details_property("performance_goal")
+    memory_goal = _details_property("memory_goal")
+    property_tests = _details_property("property_tests")
+    comparison = _details_property("comparison")
+    setup_code_object = _details_property("setup_code_object")
+
+    def __reduce__(self):
+        # Scenarios cross process boundaries by id; the receiving process resolves
+        # them from its own registry instead of unpickling the whole content.
+        return get_scenario, (self.id,)
+
+    def __repr__(self):
+        return f"Scenario({self.title!r})"
+
+
+_load_lock = threading.RLock()
+
+
+class ScenarioRegistry:
+    """Validated, immutable catalog of scenarios with precomputed lookup indexes."""
+
+    def __init__(self, scenarios):
+        ordered = sorted(scenarios, key=lambda scenario: scenario.difficulty)
+        self.scenarios = tuple(ordered)
+        self.by_id = {}
+        self.by_title = {}
+        self.by_difficulty = {difficulty: [] for difficulty in DIFFICULTIES}
+        self.by_tag = {}
+        for scenario in self.scenarios:
+            if scenario.id in self.by_id:
+                raise ValueError(f"Duplicate scenario id '{scenario.id}' for '{scenario.title}'")
+            self.by_id[scenario.id] = scenario
+            self.by_title[scenario.title] = scenario
+            self.by_difficulty[scenario.difficulty].append(scenario)
+            for tag in scenario.tags:
+                self.by_tag.setdefault(tag, []).append(scenario)
+        self.by_difficulty = {difficulty: tuple(items) for difficulty, items in self.by_difficulty.items()}
+        self.by_tag = {tag: tuple(items) for tag, items in self.by_tag.items()}
+        # Position of every scenario in the unfiltered list and in its difficulty's list.
+        self.positions = {
+            difficulty: {scenario.id: index for index, scenario in enumerate(items)}
+            for difficulty, items in ((None, self.scenarios), *self.by_difficulty.items())
         }
-    ]
-}
-]
+
+    @classmethod
+    def from_dicts(cls, data):
+        return cls(Scenario.from_dict(item) for item in data)
+
+    @classmethod
+    def from_manifest(cls, manifest, read):
+        """Build the registry from manifest entries; ``read(file)`` returns a scenario's data on first use."""
+        scenarios = []
+        for entry in manifest:
+            try:
+                missing = [name for name in (*SUMMARY_FIELDS, "file", "version") if name not in entry]
+                if missing:
+                    raise ValueError(f"missing fields {missing}")
+                if entry["difficulty"] not in DIFFICULTIES:
+                    raise ValueError(f"difficulty must be one of {DIFFICULTIES}")
+            except ValueError as e:
+                raise ValueError(f"Invalid manifest entry for '{entry.get('title', '<untitled>')}': {e}") from e
+            scenarios.append(Scenario(
+                entry["title"], entry["difficulty"], entry["tags"], entry["version"],
+                loader=lambda file=entry["file"]: read(file),
+            ))
+        return cls(scenarios)
+
+    @classmethod
+    def from_directory(cls, directory=SCENARIOS_DIR):
+        """Load the manifest eagerly; every scenario file is read on first use.
+
+        A file edited since the manifest was built fails to load: its grading cache
+        keys would still carry the old version and serve verdicts for old content.
+        """
+        with open(os.path.join(directory, MANIFEST_FILE), 'r') as f:
+            manifest = json.load(f)
+        versions = {entry.get("file"): entry.get("version") for entry in manifest}
+
+        def read(file):
+            path = os.path.join(directory, file)
+            data = read_scenario_file(path)
+            version = data.get("version") or file_version(path)
+            if str(version) != str(versions[file]):
+                raise ValueError(f"version {version} does not match the manifest's {versions[file]}; "
+                                 f"run `python -m utils.scenarios build`")
+            return data
+
+        return cls.from_manifest(manifest, read)
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        return cls.from_manifest(bundle.manifest, lambda file: bundle.load(f"scenarios/{file}"))
+
+    def __len__(self):
+        return len(self.scenarios)
+
+    def __iter__(self):
+        return iter(self.scenarios)
+
+    def get(self, scenario_id, default=None):
+        return self.by_id.get(scenario_id, default)
+
+    def get_by_title(self, title, default=None):
+        return self.by_title.get(title, default)
+
+    def position(self, scenario_id, difficulty=None):
+        """Return the index of a scenario in ``filter(difficulty)``, or None if it is not there."""
+        return self.positions.get(difficulty, {}).get(scenario_id)
+
+    def filter(self, difficulty=None, tag=None):
+        if difficulty is None and tag is None:
+            return self.scenarios
+        if tag is None:
+            return self.by_difficulty.get(difficulty, ())
+        tagged = self.by_tag.get(tag, ())
+        if difficulty is None:
+            return tagged
+        return tuple(scenario for scenario in tagged if scenario.difficulty == difficulty)
+
+
+def read_scenario_file(path):
+    # Scenario files hold a single Python literal so tuples and sets survive,
+    # which JSON could not represent. literal_eval never executes code.
+    with open(path, 'r') as f:
+        return ast.literal_eval(f.read())
+
+
+def file_version(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def build_manifest(directory=SCENARIOS_DIR):
+    """Regenerate the manifest from the scenario files, validating every one of them.
+
+    Existing entries keep their position so the catalog order stays stable; new
+    scenarios are appended in file name order.
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    order = []
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            order = [entry["file"] for entry in json.load(f)]
+    files = sorted(name for name in os.listdir(directory) if name.endswith(".py"))
+    files = [name for name in order if name in files] + [name for name in files if name not in order]
+    manifest = []
+    for name in files:
+        path = os.path.join(directory, name)
+        scenario = Scenario.from_dict(read_scenario_file(path))
+        if f"{scenario.id}.py" != name:
+            raise ValueError(f"Scenario file '{name}' should be named '{scenario.id}.py'")
+        manifest.append({
+            "title": scenario.title,
+            "difficulty": scenario.difficulty,
+            "tags": list(scenario.tags),
+            "file": name,
+            "version": scenario.version or file_version(path),
+        })
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def get_scenario(scenario_id):
+    scenario = registry.get(scenario_id)
+    if scenario is None:
+        raise KeyError(f"Unknown scenario '{scenario_id}'")
+    return scenario
+
+
+if __name__ == "__main__":
+    # The manifest may not exist yet when building it, so the registry is not loaded here.
+    if sys.argv[1:] != ["build"]:
+        sys.exit("usage: python -m utils.scenarios build")
+    print(f"Wrote {len(build_manifest())} scenarios to {os.path.join(SCENARIOS_DIR, MANIFEST_FILE)}")
+else:
+    _bundle = get_bundle()
+    registry = ScenarioRegistry.from_bundle(_bundle) if _bundle is not None else ScenarioRegistry.from_directory()
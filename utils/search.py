@@ -0,0 +1,195 @@
+import bisect
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+
+from utils.lectures import get_catalog
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9_]+")
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+    "on", "or", "that", "the", "this", "to", "with", "you", "your",
+})
+# Weight of a term occurrence depending on where in the document it was found.
+HEADING_WEIGHT = 3.0
+PROSE_WEIGHT = 1.0
+CODE_WEIGHT = 0.5
+# Saturation constant, as in BM25: repeated occurrences add less and less score.
+TF_SATURATION = 1.2
+MAX_PREFIX_EXPANSIONS = 20
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1 and token not in STOP_WORDS]
+
+
+@dataclass(frozen=True)
+class Document:
+    kind: str
+    ref: str
+    title: str
+    heading: str
+    anchor: str
+    text: str
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    document: Document
+    score: float
+    snippet: str
+
+
+class SearchIndex:
+    """Inverted index over weighted document fields, updated one source at a time.
+
+    A source is a lecture or the scenario catalog; replacing a source only touches
+    the postings of its own documents. The last query term also matches as a prefix
+    so results appear while typing.
+    """
+
+    def __init__(self):
+        self._documents = {}
+        self._terms = {}
+        self._postings = {}
+        self._sources = {}
+        self._next_id = 0
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def _add(self, document, fields):
+        weights = Counter()
+        for text, weight in fields:
+            for token in tokenize(text):
+                weights[token] += weight
+        doc_id = self._next_id
+        self._next_id += 1
+        self._documents[doc_id] = document
+        self._terms[doc_id] = tuple(weights)
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._vocabulary_dirty = True
+            postings[doc_id] = weight
+        return doc_id
+
+    def _remove(self, doc_id):
+        del self._documents[doc_id]
+        for token in self._terms.pop(doc_id):
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    def replace_source(self, source, entries):
+        """Replace every document of ``source`` with ``entries`` of (document, fields)."""
+        with self._lock:
+            for doc_id in self._sources.pop(source, ()):
+                self._remove(doc_id)
+            if entries:
+                self._sources[source] = [self._add(document, fields) for document, fields in entries]
+
+    def sources(self):
+        return set(self._sources)
+
+    def _expand(self, prefix):
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        matches = []
+        for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def search(self, query, limit=10):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            total = len(self._documents)
+            scores = Counter()
+            for position, token in enumerate(tokens):
+                is_last = position == len(tokens) - 1
+                terms = self._expand(token) if is_last and not query[-1:].isspace() else [token]
+                for term in terms:
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+                    idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                    # Prefix expansions score a bit lower than the exact term.
+                    boost = 1.0 if term == token else 0.7
+                    for doc_id, weight in postings.items():
+                        scores[doc_id] += boost * idf * weight / (weight + TF_SATURATION)
+            return [
+                SearchResult(self._documents[doc_id], score, _snippet(self._documents[doc_id].text, tokens))
+                for doc_id, score in scores.most_common(limit)
+            ]
+
+
+def _snippet(text, tokens, width=120):
+    lowered = text.lower()
+    for token in tokens:
+        position = lowered.find(token)
+        if position >= 0:
+            start = max(0, position - width // 3)
+            snippet = " ".join(text[start:start + width].split())
+            return ("…" if start else "") + snippet + ("…" if start + width < len(text) else "")
+    return " ".join(text[:width].split())
+
+
+def lecture_entries(lecture):
+    entries = []
+    for section in lecture.sections:
+        document = Document("lecture", lecture.id, lecture.name, section.heading, section.anchor, section.prose or section.code)
+        fields = ((section.heading, HEADING_WEIGHT), (section.prose, PROSE_WEIGHT), (section.code, CODE_WEIGHT))
+        entries.append((document, fields))
+    return entries
+
+
+def scenario_entries(scenarios):
+    entries = []
+    for scenario in scenarios:
+        title, description = scenario.title, scenario.description
+        document = Document("scenario", scenario.id, title, title, "", description)
+        entries.append((document, ((title, HEADING_WEIGHT), (description, PROSE_WEIGHT))))
+    return entries
+
+
+_index = None
+_indexed_catalog = None
+_indexed_lectures = {}
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """Return the process-wide index, re-indexing only lectures whose file changed."""
+    global _index, _indexed_catalog
+    catalog = get_catalog()
+    if catalog is _indexed_catalog:
+        return _index
+    with _index_lock:
+        if _index is None:
+            from utils.scenarios import registry
+            _index = SearchIndex()
+            _index.replace_source("scenarios", scenario_entries(registry))
+        current = {lecture.id: lecture for lecture in catalog}
+        for lecture_id in set(_indexed_lectures) - set(current):
+            _index.replace_source(("lecture", lecture_id), [])
+            del _indexed_lectures[lecture_id]
+        for lecture_id, lecture in current.items():
+            if _indexed_lectures.get(lecture_id) != lecture.mtime_ns:
+                _index.replace_source(("lecture", lecture_id), lecture_entries(lecture))
+                _indexed_lectures[lecture_id] = lecture.mtime_ns
+        _indexed_catalog = catalog
+        return _index
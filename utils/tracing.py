@@ -0,0 +1,267 @@
+"""Per-rerun tracing of named spans.
+
+Tracing is off unless ``FASTSKILLING_TRACE`` is set; :func:`span` then returns a
+shared no-op context manager, so instrumented code pays one global lookup.
+When enabled, each page run is one trace: :func:`begin_rerun` at the top of the
+page, :func:`end_rerun` at the bottom. Finished traces are appended as JSON lines
+to a rotating file (``FASTSKILLING_TRACE_FILE``, ``.traces/reruns.jsonl`` by
+default). A fragment rerun runs only the fragment function, so fragments wrap
+themselves in :func:`fragment_run`, which traces them on their own when no page
+trace is active. Grading workers collect their own spans with :func:`collect` and send
+them back with the result, where :func:`add_spans` merges them into the rerun.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import time
+import uuid
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACE_ENV = "FASTSKILLING_TRACE"
+TRACE_FILE_ENV = "FASTSKILLING_TRACE_FILE"
+DEFAULT_TRACE_FILE = os.path.join(ROOT_DIR, ".traces", "reruns.jsonl")
+MAX_TRACE_FILE_BYTES = 5 * 1024 * 1024
+TRACE_FILE_BACKUPS = 3
+
+ENABLED = os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+_current = contextvars.ContextVar("fastskilling_trace", default=None)
+_logger = None
+STATE_KEY = "_active_trace"
+SESSION_KEY = "_trace_session"
+
+
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.spans = []
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def to_dict(self, **extra):
+        return {
+            "page": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.elapsed_ms(), 3),
+            "spans": self.spans,
+            **extra,
+        }
+
+
+class _Span:
+    __slots__ = ("trace", "name", "attrs", "start_ms")
+
+    def __init__(self, trace, name, attrs):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.start_ms = 0.0
+
+    def __enter__(self):
+        self.start_ms = self.trace.elapsed_ms()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        span = {
+            "name": self.name,
+            "start_ms": round(self.start_ms, 3),
+            "duration_ms": round(self.trace.elapsed_ms() - self.start_ms, 3),
+        }
+        if self.attrs:
+            span["attrs"] = self.attrs
+        if exc_type is not None:
+            span["error"] = exc_type.__name__
+        self.trace.spans.append(span)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+    start_ms = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, **attrs):
+    if not ENABLED:
+        return _NULL_SPAN
+    trace = _current.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name, attrs)
+
+
+def event(name, **attrs):
+    """Record a point-in-time measurement, a span without duration, in the current trace.
+
+    Callers check :data:`ENABLED` before computing costly attributes.
+    """
+    trace = _current.get() if ENABLED else None
+    if trace is None:
+        return
+    trace.spans.append({"name": name, "start_ms": round(trace.elapsed_ms(), 3), "duration_ms": 0.0, "attrs": attrs})
+
+
+def add_spans(spans, offset_ms=0.0, prefix=""):
+    """Merge spans recorded elsewhere, e.g. in a grading worker, into the current trace."""
+    trace = _current.get() if ENABLED else None
+    if trace is None or not spans:
+        return
+    for recorded in spans:
+        trace.spans.append({
+            **recorded,
+            "name": prefix + recorded["name"],
+            "start_ms": round(recorded["start_ms"] + offset_ms, 3),
+        })
+
+
+def add_trace(collected, prefix=""):
+    """Merge a trace collected elsewhere, e.g. on a background thread, into the current
+    one at the time it actually started; returns whether there was a trace to merge into."""
+    current = _current.get() if ENABLED else None
+    if current is None or collected is None:
+        return False
+    add_spans(collected.spans, offset_ms=(collected.started - current.started) * 1000, prefix=prefix)
+    return True
+
+
+class collect:
+    """Context manager recording spans into a standalone trace; yields None when disabled."""
+
+    def __enter__(self):
+        if not ENABLED:
+            self.token = None
+            return None
+        self.trace = Trace("collect")
+        self.token = _current.set(self.trace)
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.token is not None:
+            _current.reset(self.token)
+        return False
+
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        # Imported here: logging.handlers is costly and only needed once tracing writes.
+        import logging
+        import logging.handlers
+
+        path = trace_file()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=MAX_TRACE_FILE_BYTES, backupCount=TRACE_FILE_BACKUPS)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("fastskilling.trace")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+def _write(trace, **extra):
+    _get_logger().info(json.dumps(trace.to_dict(**extra), default=str))
+
+
+def begin_rerun(page, state=None):
+    """Start the trace of one page run; ``state`` (the session state) carries an
+    unfinished trace over to the next run, which may execute on another thread."""
+    if not ENABLED:
+        return None
+    previous = state.pop(STATE_KEY, None) if state is not None else _current.get()
+    if previous is not None:
+        # st.rerun() and st.stop() end a run by raising, so the previous trace never
+        # reached end_rerun; it is written now, marked as interrupted.
+        _write(previous, interrupted=True)
+    trace = Trace(page)
+    _current.set(trace)
+    if state is not None:
+        state.setdefault(SESSION_KEY, uuid.uuid4().hex[:12])
+        state[STATE_KEY] = trace
+    return trace
+
+
+def end_rerun(trace, state=None):
+    """Finish and write the trace; given the session state, also record how much it retains."""
+    if trace is None:
+        return
+    extra = {}
+    if state is not None:
+        from utils.memory import retained_bytes
+
+        state.pop(STATE_KEY, None)
+        with span("session_memory"):
+            extra.update(session=state.get(SESSION_KEY), session_bytes=retained_bytes(dict(state.items())))
+    _current.set(None)
+    _write(trace, **extra)
+
+
+@contextlib.contextmanager
+def fragment_run(name, state=None):
+    """Trace a fragment rerun as a trace of its own named ``name``.
+
+    Within a full page run the page's trace is active and records the fragment's
+    spans itself. Also usable as a decorator, below ``@st.fragment``.
+    """
+    current = _current.get() if ENABLED else None
+    if not ENABLED or current is not None and (state is None or state.get(STATE_KEY) is current):
+        yield
+        return
+    trace = Trace(name)
+    token = _current.set(trace)
+    extra = {"fragment": True}
+    if state is not None:
+        extra["session"] = state.setdefault(SESSION_KEY, uuid.uuid4().hex[:12])
+    try:
+        yield
+    except BaseException:
+        # Like a page run, a fragment run may end with st.rerun() or st.stop().
+        _write(trace, interrupted=True, **extra)
+        raise
+    else:
+        _write(trace, **extra)
+    finally:
+        _current.reset(token)
+
+
+def percentile(samples, fraction):
+    """Return the sample at ``fraction`` (0 to 1) of the sorted samples, without interpolation."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))]
+
+
+def trace_file():
+    return os.environ.get(TRACE_FILE_ENV, DEFAULT_TRACE_FILE)
+
+
+def read_traces(limit=5000):
+    """Return up to ``limit`` most recent traces, reading the rotated files as well."""
+    path = trace_file()
+    traces = []
+    for index in range(TRACE_FILE_BACKUPS + 1):
+        file_path = path if index == 0 else f"{path}.{index}"
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, 'r') as f:
+            lines = f.readlines()
+        for line in reversed(lines):
+            try:
+                traces.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+            if len(traces) >= limit:
+                return traces
+    return traces